@@ -1,7 +1,51 @@
-from typing import Union, List
+import os
+import re
+import sys
+import io
+import asyncio
+import time
+import inspect
+import logging
+import itertools
+import contextvars
+import datetime
+import hashlib
+import json
+import posixpath
+import shutil
+import struct
+import tempfile
+import threading
+import warnings
+import weakref
+import zipfile
+from copy import copy, deepcopy
+from typing import Union, List, Iterable, Iterator, AsyncIterator
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from xml.etree import ElementTree
+from xml.sax.saxutils import unescape
+from functools import lru_cache, partial, wraps
+from decimal import Decimal
+import numpy as np
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ERROR_CODES, ILLEGAL_CHARACTERS_RE
 from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
+from openpyxl.styles.builtins import styles as builtin_styles
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+from openpyxl.writer.excel import ExcelWriter as OpenpyxlArchiveWriter
+
+try:
+    import resource
+except ImportError:
+    # Windows: peak memory is not reported by the instrumentation
+    resource = None
 
 
 def excel_utils_helpme():
@@ -9,18 +53,167 @@ def excel_utils_helpme():
     print('Fonctions de la librairies Excel_utils :')
     print('get_index')
     print('get_coord')
+    print('column_letter / column_index')
+    print('column_letters / column_indices')
+    print('parse_range')
+    print('last_used_row')
     print('apply_font_to_cells')
     print('apply_font_to_multiple_sheets')
     print('apply_font')
     print('save_as_date')
     print('clear_existing_style')
     print('save_df_on_excel')
+    print('stream_df_on_excel')
+    print('save_dfs_on_excel')
+    print('save_dfs_in_parallel')
+    print('SheetCache')
+    print('ExcelTemplate')
+    print('StylePlan')
+    print('StyleRegistry / style_registry')
+    print('column_widths')
+    print('apply_column_widths')
+    print('apply_table')
+    print('mask_ranges')
+    print('apply_style_by_mask')
+    print('add_hook / remove_hook / instrument / logging_hook')
+    print('save_df_on_excel_async / iter_excel_bytes_async')
+    print('main (python -m Excel_utils convert)')
 
     
 def helpme(function):
     print(f"{function.__name__} :\n{function.__doc__}")
 
     
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------------- Coordonnées Excel ---------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+EXCEL_MAX_COLUMNS = 16_384
+EXCEL_MAX_ROWS = 1_048_576
+
+_RANGE_PATTERN = re.compile(r'^\$?([A-Z]{1,3})?\$?(\d+)?(?::\$?([A-Z]{1,3})?\$?(\d+)?)?$')
+
+
+@lru_cache(maxsize=None)
+def _column_table() -> tuple:
+    """
+    Construit, une seule fois, la table des 16 384 colonnes Excel dans les deux sens.
+    
+    Returns
+    -------
+    tuple
+        (tableau NumPy des lettres, position i -> colonne i+1 ; pd.Index des lettres, pour la recherche inverse)
+    """
+    alphabet = [chr(char) for char in range(65, 91)]
+    one = alphabet
+    two = [first + second for first in alphabet for second in alphabet]
+    three = [first + second for first in alphabet for second in two]
+    letters = np.array((one + two + three)[:EXCEL_MAX_COLUMNS], dtype=object)
+    
+    return letters, pd.Index(letters)
+
+
+def column_letter(index: int) -> str:
+    """
+    Retourne la lettre de la colonne Excel à partir de son numéro (compté à partir de 1).
+    
+    Example
+    -------
+    >>> column_letter(1) -> 'A'
+    >>> column_letter(16_384) -> 'XFD'
+    """
+    if not 1 <= index <= EXCEL_MAX_COLUMNS:
+        raise ValueError("Column provided is out of Excel columns range. Excel columns ranges from A (1) to XFD (16_384)")
+    
+    return _column_table()[0][index - 1]
+
+
+def column_index(letter: str) -> int:
+    """
+    Retourne le numéro (compté à partir de 1) de la colonne Excel à partir de sa lettre.
+    
+    Example
+    -------
+    >>> column_index('A') -> 1
+    >>> column_index('XFD') -> 16_384
+    """
+    position = _column_table()[1].get_indexer([letter.upper()])[0]
+    if position < 0:
+        raise ValueError("Column provided is out of Excel columns range. Excel columns ranges from A (1) to XFD (16_384)")
+    
+    return int(position) + 1
+
+
+def column_letters(indices) -> np.ndarray:
+    """
+    Conversion vectorisée d'un tableau de numéros de colonnes (comptés à partir de 1) en lettres Excel.
+    
+    Example
+    -------
+    >>> column_letters([1, 28, 16_384]) -> array(['A', 'AB', 'XFD'], dtype=object)
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    if indices.size and (indices.min() < 1 or indices.max() > EXCEL_MAX_COLUMNS):
+        raise ValueError("Column provided is out of Excel columns range. Excel columns ranges from A (1) to XFD (16_384)")
+    
+    return _column_table()[0][indices - 1]
+
+
+def column_indices(letters) -> np.ndarray:
+    """
+    Conversion vectorisée d'un tableau de lettres de colonnes Excel en numéros (comptés à partir de 1).
+    
+    Example
+    -------
+    >>> column_indices(['A', 'AB', 'XFD']) -> array([1, 28, 16384])
+    """
+    positions = _column_table()[1].get_indexer(pd.Index(letters, dtype=object).str.upper())
+    if (positions < 0).any():
+        raise ValueError("Column provided is out of Excel columns range. Excel columns ranges from A (1) to XFD (16_384)")
+    
+    return positions + 1
+
+
+def parse_range(cell_range: str) -> tuple:
+    """
+    Découpe une plage au format A1 en bornes numériques (comptées à partir de 1).
+    Une colonne ou une ligne absente (plage 'A:C' ou '2:5') s'étend jusqu'à la limite de la feuille.
+    
+    Parameters
+    ----------
+    cell_range : str
+        Plage ('B2:XFD1048576'), cellule ('B2'), colonnes ('A:C') ou lignes ('2:5'), avec ou sans '$'
+    
+    Returns
+    -------
+    tuple
+        (min_col, min_row, max_col, max_row)
+    
+    Example
+    -------
+    >>> parse_range('B2:XFD1048576') -> (2, 2, 16384, 1048576)
+    >>> parse_range('A:C') -> (1, 1, 3, 1048576)
+    """
+    match = _RANGE_PATTERN.match(cell_range.upper())
+    if match is None or not any(match.groups()):
+        raise ValueError(f"{cell_range} is not a valid Excel range")
+    
+    min_letter, min_row, max_letter, max_row = match.groups()
+    # A single cell is a range of one cell
+    if ':' not in cell_range:
+        max_letter, max_row = min_letter, min_row
+    
+    min_col = column_index(min_letter) if min_letter else 1
+    max_col = column_index(max_letter) if max_letter else EXCEL_MAX_COLUMNS
+    min_row = int(min_row) if min_row else 1
+    max_row = int(max_row) if max_row else EXCEL_MAX_ROWS
+    
+    if not (1 <= min_row <= max_row <= EXCEL_MAX_ROWS and min_col <= max_col):
+        raise ValueError(f"{cell_range} is not a valid Excel range")
+    
+    return min_col, min_row, max_col, max_row
+
+
 def get_index(letter: str = "A", add_one: bool = False) -> int:
     """
     Retourne l'index associé à la colonne Excel
@@ -43,15 +236,7 @@ def get_index(letter: str = "A", add_one: bool = False) -> int:
     >>> get_index('E', True) -> 5
     """
 
-    index = 0
-    for char in letter:
-        index = index * 26 + (ord(char) - ord('A') + 1)
-    
-    if index > 16_384:
-        raise ValueError("Column provided is out of Excel columns range. Excel columns ranges from A (1) to XFD (16_384)")
-        
-    else:
-        return index + add_one
+    return column_index(letter) - 1 + add_one
     
 
 def index_from_letter(df: pd.DataFrame = None, col_name: str = "A") -> str:
@@ -75,25 +260,14 @@ def index_from_letter(df: pd.DataFrame = None, col_name: str = "A") -> str:
     >>> index_from_letter(df, 'Colonne_7') -> G
     """
     
-    # Création d'un dictionnaire des lettres de l'alphabet en clé et de la position respective (commençant par 1)
-    # 1:A, 2:B, ...  
-    alphabet_dict = {}
-    for idx, char in enumerate(range(65, 91), start=1):
-        alphabet_dict[idx] = chr(char)
-    
     if isinstance(col_name, str):
         col_index = df.columns.get_loc(col_name)
         
         # Check that column index is not greater than Excel max column index
-        if col_index + 1 > 16_384:
+        if col_index + 1 > EXCEL_MAX_COLUMNS:
             raise ValueError("Specified dataframe column will fall outside the bounds of an Excel file (column index > 16 384)")
     
-        letter_to_add = ''
-        if col_index > 25:
-            letter_to_add = alphabet_dict[col_index // 25]
-            col_index = col_index % 26
-
-        return f"{letter_to_add}{chr(65 + col_index)}"
+        return column_letter(col_index + 1)
     
 
 def get_column_character(df: pd.DataFrame, col_name: Union[str, list]) -> Union[str, list]:
@@ -120,12 +294,15 @@ def get_column_character(df: pd.DataFrame, col_name: Union[str, list]) -> Union[
     if isinstance(col_name, str):
         return index_from_letter(df, col_name)
     
-    # Multiple column provided
+    # Multiple column provided, converted in bulk
     elif isinstance(col_name, list):
-        return [index_from_letter(df, col) for col in col_name]
+        positions = df.columns.get_indexer(col_name)
+        if (positions < 0).any():
+            raise KeyError([col for col, position in zip(col_name, positions) if position < 0])
+        return column_letters(positions + 1).tolist()
         
     else:
-        print('Erreur : col_name doit être une str ou une liste')
+        _report('Erreur : col_name doit être une str ou une liste')
     
     
 def get_coord(letter: str = "A", row: int = 1, add_one: bool = False) -> tuple:
@@ -155,574 +332,4840 @@ def get_coord(letter: str = "A", row: int = 1, add_one: bool = False) -> tuple:
 
 
 #-----------------------------------------------------------------------------------------------------------------------------------#
-#----------------------------------------- Modification des caractéristiques de l'écriture -----------------------------------------#
+#----------------------------------------------------- Signalement des erreurs -----------------------------------------------------#
 #-----------------------------------------------------------------------------------------------------------------------------------#
 
-def apply_font_to_cells(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1',
-                        min_row: int = 1, max_row: int = 1, min_col: int = 1, max_col: int = 1,
-                        font_name: str = 'Arial', font_size: int = 11, bold: bool = False, color: str = '000000'):
+# Problems reported by the export running in the current context, collected by "_reported_problems"
+_PROBLEMS = contextvars.ContextVar('excel_utils_problems', default=None)
+
+
+def _report(message: str, error: bool = True):
     """
-    Applique une police (type, taille, gras et couleur) à une/des cellules d'une feuille uniquement.
-    Pour plus d'informations voir la fonction "apply_font".
-    Par défaut applique une police normal de taille 1 en noir.
+    Affiche une erreur d'un export (ou, avec error=False, une option ignorée) et la transmet à "_reported_problems".
     """
-    
-    # Set the working Excel file
-    workbook = writer.book
-    # Set the working sheet
-    worksheet = writer.sheets[sheet_name]
-    
-    # Define custom font style
-    custom_font = Font(name=font_name, size=font_size, bold=bold, color=color)
-    
-    # Apply custom font, by rows, to all cells encountered
-    for row in worksheet.iter_rows(min_row, max_row, min_col, max_col):
-        for cell in row:
-            cell.font = custom_font
-            
-            
-def apply_font_to_multiple_sheets(writer: pd.ExcelWriter, sheet_name: Union[str, list] = 'Feuil1',
-                                  min_row: int = 1, max_row: Union[int, str] = 1, min_col: int = 1, max_col: Union[int, str] = 1,
-                                  font_name: str = 'Arial', font_size: int = 11, bold: bool = False, color: str = '000000'):
+    print(message)
+    problems = _PROBLEMS.get()
+    if problems is not None:
+        problems.append((message, error))
+
+
+@contextmanager
+def _reported_problems():
     """
-    Fonction qui boucle sur des feuilles d'un fichier excel afin d'appliquer un style de police précis.
-    Pour plus d'informations voir la fonction "apply_font".
-    Par défaut applique une police normal de taille 1 en noir.
+    Collecte, dans la liste retournée, les problèmes [(message, erreur), ...] signalés par les exports du bloc with,
+    qui affichent leurs erreurs au lieu de les lever.
     """
-    
-    # Apply to only one specified sheet
-    if isinstance(sheet_name, str) and sheet_name.lower() != 'all':
-        
-        # Retrieves last row of the current worksheet
-        if max_row.lower() == 'last':
-            max_row = writer.sheets[sheet_name].max_row
-        
-        # Retrieves last col of the current worksheet
-        if max_col.lower() == 'last':
-            max_col = writer.sheets[sheet_name].max_column
-        
-        # Apply custom font
-        apply_font_to_cells(writer, sheet_name,
-                            min_row, max_row, min_col, max_col,
-                            font_name, font_size, bold, color)
-    
-    # Apply to all sheets listed
-    elif isinstance(sheet_name, list):
-        
-        # Applies up to last row and last column
-        if max_row.lower() == 'last' and max_col.lower() == 'last':
-            for sheets in sheet_name:
-                max_row = writer.sheets[sheets].max_row
-                max_col = writer.sheets[sheets].max_column
-                
-                apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-            return
-        
-        # Applies up to last row and specified column
-        elif max_row.lower() == 'last':
-            for sheets in sheet_name:
-                max_row = writer.sheets[sheets].max_row
-                
-                apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-            return
-        
-        # Applied up to specified row and last column
-        elif max_col.lower() == 'last':
-            for sheets in sheet_name:
-                max_col = writer.sheets[sheets].max_column
-                
-                apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-            return
-                
-        # Applies up to specified row and specified col
-        else:
-            apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-    
-    # Applies to all workbook sheets
-    elif sheet_name.lower() == 'all':
-        
-        # Applies up to last row and last column
-        if max_row.lower() == 'last' and max_col.lower() == 'last':
-            for sheets in writer.sheets:
-                max_row = writer.sheets[sheets].max_row
-                max_col = writer.sheets[sheets].max_column
-                
-                apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-            return
-        
-        # Applies up to last row and specified column
-        elif max_row.lower() == 'last':
-            for sheets in writer.sheets:
-                max_row = writer.sheets[sheets].max_row
-                
-                apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-            return
-        
-        # Applied up to specified row and last column
-        elif max_col.lower() == 'last':
-            for sheets in writer.sheets:
-                max_col = writer.sheets[sheets].max_column
-                
-                apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-            return
-                
-        # Applies up to specified row and specified col
-        else:
-            apply_font_to_cells(writer, sheets,
-                                min_row, max_row, min_col, max_col,
-                                font_name, font_size, bold, color)
-            
-    else:
-        print('Error in sheet_name')
+    problems = []
+    token = _PROBLEMS.set(problems)
+    try:
+        yield problems
+    finally:
+        _PROBLEMS.reset(token)
 
 
-def apply_font(file: str = None, writer: pd.ExcelWriter = None, mode: str = 'a', sheets: Union[str, list] = 'Feuil1',
-               min_row: int = 1, max_row: Union[int, str] = 1, min_col: int = 1, max_col: Union[int, str] = 1,
-               font_name: str = 'Arial', font_size: int = 11, bold: bool = False, color: str = '000000'):
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------------------ Instrumentation ------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Hooks called for every export (see "add_hook"), and hooks of the current context only (see "instrument")
+_HOOKS = []
+_CONTEXT_HOOKS = contextvars.ContextVar('excel_utils_hooks', default=())
+# Fields of the enclosing phases (file, sheet_name), inherited by the nested ones
+_PHASE_FIELDS = contextvars.ContextVar('excel_utils_phase_fields', default={})
+
+logger = logging.getLogger('Excel_utils')
+
+# Cancellation flag (threading.Event) of the export running in the current context, see "save_df_on_excel_async"
+_CANCELLATION = contextvars.ContextVar('excel_utils_cancellation', default=None)
+
+
+class ExportCancelled(Exception):
     """
-    Applique une police (type, taille, gras et couleur) à une/des cellules, d'une ou plusieurs lignes, et d'une ou plusieurs colonnes.
-    
-    Il est possible soit :
-    - De spécifier le fichier Excel que l'on souhaite modifier (file)
-    - De spécifier l'objet ExcelWriter
+    Levée dans un export annulé (voir "save_df_on_excel_async"), au début d'une phase ou d'un bloc de lignes.
+    """
+
+
+def _cancelled() -> bool:
+    cancellation = _CANCELLATION.get()
+    return cancellation is not None and cancellation.is_set()
+
+
+def _check_cancelled():
+    if _cancelled():
+        raise ExportCancelled("L'export a été annulé")
+
+
+def add_hook(hook):
+    """
+    Active un hook pour tous les exports, jusqu'à "remove_hook".
     
-    Parameters
-    ----------
-    file : str
-        Chemin du fichier Excel
-        
-    writer : ExcelWriter
-        ExcelWriter déjà configuré.
+    Un hook est une fonction appelée à la fin de chaque phase d'un export avec un dictionnaire décrivant la phase :
     
-    mode : {'w', 'a'}, default='a'
-        Mode d'écriture sur le fichier.
-        
-        - 'w' : Écriture, supprime tout ce qui était précédemment présent.
-        - 'a' : Append, ajoute à la suite de ce qui est déjà présent.
+    - phase : 'save_df_on_excel', 'save_dfs_on_excel' (export complet), 'open' (ouverture ou chargement du classeur),
+      'write' (écriture des valeurs), 'style' (application du plan de mise en forme : format date, en-têtes, polices, ...),
+      'table', 'auto_width', 'save' (compression et écriture du fichier)
+    - file, sheet_name : fichier et feuille concernés (None si sans objet)
+    - seconds : durée de la phase
+    - rows, cells : lignes écrites, cellules mises en forme (None si sans objet)
+    - peak_rss_delta : augmentation du pic de mémoire résidente du processus pendant la phase, en octets (None si indisponible)
+    - bytes : taille du fichier écrit, pour 'save' et l'export complet
+    - error : exception levée pendant la phase, None sinon
     
-    sheets : str or list, default='Feuil1'
-        - 'Feuil1' : Applique uniquement à la feuille spécifiée
-        - ['Feuil1', 'Feuil2'] : Applique aux feuilles spécifiées
-        - 'All' : Applique à toutes les feuilles
-        
-    min_row : int, default=1
-        Première ligne où appliquer
-        
-    max_row : int or str, default=1
-        - 3 : Applique jusqu'à la ligne 3
-        - 'last' : Applique jusqu'à la dernière ligne de la feuille
-        
-    min_col : int, default=1
-        Première colonne où appliquer
-        
-    max_col : int or str, default=1
-        - 3 : Applique jusqu'à la colonne 3
-        - 'last' : Applique jusqu'à la dernière colonne de la feuille
-        
-    font_name : str, default='Arial'
-        Nom de la police
-        
-    font_size : int, default=11
-        Taille de la police
-        
-    bold : bool, default=False
-        - True : En gras
-        - False : En normal
-        
-    color : str, default='000000'
-        Code hexadecimal de couleur
-        - 000000 : Noir
-        - FFFFFF : Blanc
+    Sans hook actif, l'instrumentation se limite à un test par phase.
+    Les exports exécutés dans d'autres processus ("save_dfs_in_parallel") ne sont pas instrumentés.
     
-    Returns
+    Example
     -------
-    None
+    >>> add_hook(logging_hook)
+    >>> add_hook(lambda event: metrics.timing(f"excel.{event['phase']}", event['seconds']))
+    """
+    if hook not in _HOOKS:
+        _HOOKS.append(hook)
+
+
+def remove_hook(hook):
+    """
+    Désactive un hook ajouté par "add_hook".
+    """
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+@contextmanager
+def instrument(hook=None):
+    """
+    Active un hook pour les exports du bloc with uniquement (et du thread ou de la tâche asyncio courante).
+    Sans hook, les évènements sont collectés dans la liste retournée.
+    Voir "add_hook" pour le contenu des évènements.
     
     Example
     -------
-    >>> apply_font()
-    """      
+    >>> with instrument() as events:
+    ...     save_df_on_excel(df, 'rapport.xlsx', date_format=True, date_cols=['A'])
+    >>> pd.DataFrame(events)[['phase', 'sheet_name', 'seconds', 'rows', 'cells', 'bytes']]
+    """
+    events = []
+    token = _CONTEXT_HOOKS.set(_CONTEXT_HOOKS.get() + (events.append if hook is None else hook,))
+    try:
+        yield events
+    finally:
+        _CONTEXT_HOOKS.reset(token)
+
+
+def logging_hook(event: dict):
+    """
+    Hook qui écrit chaque phase dans le logger 'Excel_utils' (niveau INFO, WARNING en cas d'erreur).
+    """
+    details = ', '.join(f'{key}={event[key]}' for key in ('rows', 'cells', 'bytes', 'peak_rss_delta') if event.get(key) is not None)
+    logger.log(logging.WARNING if event['error'] else logging.INFO, "%s %s %s : %.3f s%s%s", event['phase'], event['file'] or '',
+               event['sheet_name'] or '', event['seconds'], f' ({details})' if details else '', f" - {event['error']!r}" if event['error'] else '')
+
+
+def _peak_rss() -> int:
+    """
+    Pic de mémoire résidente du processus, en octets (None si indisponible).
+    """
+    if resource is None:
+        return None
+    # Kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _file_size(file) -> int:
+    if isinstance(file, io.BytesIO):
+        return file.getbuffer().nbytes
+    return os.path.getsize(file) if isinstance(file, (str, os.PathLike)) and os.path.exists(file) else None
+
+
+@contextmanager
+def _phase(name: str, **fields):
+    """
+    Mesure une phase d'un export et la transmet aux hooks actifs. Le dictionnaire retourné peut être complété pendant la phase
+    (rows, cells, bytes). Sans hook actif, rien n'est mesuré.
+    """
+    _check_cancelled()
+    hooks = _CONTEXT_HOOKS.get()
+    if not hooks and not _HOOKS:
+        yield {}
+        return
     
-    if file:
-        try:
-            with pd.ExcelWriter(path=file, mode=mode, engine='openpyxl', if_sheet_exists='overlay') as writer:
-                apply_font_to_multiple_sheets(writer, sheets,
-                                              min_row, max_row, min_col, max_col,
-                                              font_name, font_size, bold, color)
+    event = {'phase': name, 'file': None, 'sheet_name': None, 'seconds': None, 'rows': None, 'cells': None,
+             'peak_rss_delta': None, 'bytes': None, 'error': None}
+    event.update(_PHASE_FIELDS.get())
+    event.update({key: value for key, value in fields.items() if value is not None})
+    token = _PHASE_FIELDS.set({key: event[key] for key in ('file', 'sheet_name') if event[key] is not None})
+    rss = _peak_rss()
+    start = time.perf_counter()
+    try:
+        yield event
+    except BaseException as exception:
+        event['error'] = exception
+        raise
+    finally:
+        event['seconds'] = time.perf_counter() - start
+        if rss is not None:
+            event['peak_rss_delta'] = _peak_rss() - rss
+        _PHASE_FIELDS.reset(token)
+        for hook in hooks + tuple(_HOOKS):
+            try:
+                hook(event)
+            except Exception:
+                # A failing hook never fails the export, it is logged with its traceback
+                logger.warning("Erreur dans le hook %s", getattr(hook, '__name__', hook), exc_info=True)
 
-        except FileNotFoundError:
-            print("Le fichier spécifiée n'existe pas ou est introuvable")
+
+def _instrumented(function):
+    """
+    Décorateur : l'appel complet de function est une phase, nommée comme la fonction, avec la taille du fichier écrit.
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _CONTEXT_HOOKS.get() and not _HOOKS:
+            return function(*args, **kwargs)
+        
+        arguments = inspect.signature(function).bind_partial(*args, **kwargs).arguments
+        with _phase(function.__name__, file=arguments.get('file'), sheet_name=arguments.get('sheet_name')) as event:
+            result = function(*args, **kwargs)
+            event['bytes'] = _file_size(arguments.get('file'))
+        return result
     
-    elif writer:
-        apply_font_to_multiple_sheets(writer, sheets,
-                                      min_row, max_row, min_col, max_col,
-                                      font_name, font_size, bold, color)
-            
+    return wrapper
+
 
 #-----------------------------------------------------------------------------------------------------------------------------------#
-#------------------------------------------ Application de styles de cellule particuliers ------------------------------------------#
+#------------------------------------------------- Cibles d'écriture et compression ------------------------------------------------#
 #-----------------------------------------------------------------------------------------------------------------------------------#
-def apply_date_style(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1', date_cols: str = None,
-                     min_row: int = 2, max_row: int = 1000):
+
+def _zip_settings(compression: int = None) -> tuple:
     """
-    Fonction qui permet d'appliquer le format date Excel (DD/MM/YYYY) à une colonne.
-    
-    Parameters
-    ----------
-    writer : ExcelWriter
-        Objet qui permet d'écrire sur un fichier excel
-        
+    Méthode et niveau de compression zip : None (compression par défaut), 0 (ZIP_STORED, sans compression) ou niveau 1 à 9.
+    """
+    if compression is None:
+        return zipfile.ZIP_DEFLATED, None
+    if not 0 <= compression <= 9:
+        raise ValueError(f"compression must be None or a level between 0 and 9, not {compression}")
+    return (zipfile.ZIP_STORED, None) if compression == 0 else (zipfile.ZIP_DEFLATED, compression)
+
+
+def _is_path(file) -> bool:
+    return isinstance(file, (str, os.PathLike))
+
+
+def _xlsx_target(file):
+    """
+    Cible d'écriture : un chemin (complété par l'extension '.xlsx' s'il n'en a pas) ou un objet fichier binaire, retourné tel quel.
+    """
+    if not _is_path(file):
+        return file
+    
+    file = os.fspath(file)
+    if not file.endswith(('.xlsx', '.xlsm')):
+        print(f"The filename {file} does not provide extension, by default the extension '.xlsx' is used")
+        file += '.xlsx'
+    return file
+
+
+def _target_exists(file) -> bool:
+    """
+    Si la cible contient déjà un classeur : fichier existant, ou objet fichier non vide (un flux non positionnable est vide).
+    """
+    if _is_path(file):
+        return os.path.exists(file)
+    try:
+        position = file.tell()
+        size = file.seek(0, os.SEEK_END)
+        file.seek(position)
+        return size > 0
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _bytes_target(function):
+    """
+    Décorateur : avec file=None, le classeur est écrit en mémoire et function retourne son contenu (bytes).
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        bound = inspect.signature(function).bind(*args, **kwargs)
+        if bound.arguments.get('file', '') is not None:
+            return function(*args, **kwargs)
+        
+        buffer = io.BytesIO()
+        bound.arguments['file'] = buffer
+        function(*bound.args, **bound.kwargs)
+        return buffer.getvalue()
+    
+    return wrapper
+
+
+def _save_openpyxl_workbook(workbook, handle, compression: int = None):
+    """
+    Équivalent de workbook.save(handle), avec le niveau de compression choisi (voir "_zip_settings").
+    """
+    method, level = _zip_settings(compression)
+    if workbook.write_only and not workbook.worksheets:
+        workbook.create_sheet()
+    workbook.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+    OpenpyxlArchiveWriter(workbook, zipfile.ZipFile(handle, 'w', method, allowZip64=True, compresslevel=level)).save()
+
+
+def _read_target(file) -> bytes:
+    """
+    Contenu du classeur existant : le fichier, ou l'objet fichier lu depuis le début.
+    """
+    if _is_path(file):
+        with open(file, 'rb') as handle:
+            return handle.read()
+    file.seek(0)
+    return file.read()
+
+
+def _write_target(file, content, append: bool = False):
+    """
+    Écrit content dans file : un chemin est remplacé, un objet fichier ouvert pour ajouter est réécrit depuis le début et tronqué.
+    """
+    if _is_path(file):
+        with open(file, 'wb') as handle:
+            handle.write(content)
+        return
+    if append:
+        file.seek(0)
+    file.write(content)
+    if append:
+        file.truncate()
+
+
+@contextmanager
+def _open_writer(file, compression: int = None, **kwargs):
+    """
+    pd.ExcelWriter dont l'ouverture (chargement du classeur en mode='a') et la sauvegarde sont des phases instrumentées,
+    sauvegardé avec le niveau de compression choisi (moteur openpyxl).
+    
+    Le classeur est construit en mémoire et n'est écrit dans file qu'à la sauvegarde : un export annulé laisse file intact.
+    """
+    append = kwargs.get('mode', 'w') == 'a'
+    with _phase('open', file=file):
+        buffer = io.BytesIO(_read_target(file) if append else b'')
+        writer = pd.ExcelWriter(buffer, **kwargs)
+    if compression is not None and _is_xlsxwriter(writer):
+        _report("Le niveau de compression n'est pas réglable avec le moteur xlsxwriter, la compression par défaut est utilisée", error=False)
+    
+    try:
+        yield writer
+        # Last check before the compression, often the longest phase
+        _check_cancelled()
+    except ExportCancelled:
+        # A cancelled export is not saved, nothing has been written to file yet
+        raise
+    except BaseException:
+        # Saved even after an error, as pd.ExcelWriter.__exit__ does
+        _save_writer(writer, buffer, file, compression, append)
+        raise
+    _save_writer(writer, buffer, file, compression, append)
+
+
+def _save_writer(writer: pd.ExcelWriter, buffer: io.BytesIO, file, compression: int = None, append: bool = False):
+    with _phase('save', file=file) as event:
+        if compression is None or _is_xlsxwriter(writer):
+            writer.close()
+            _write_target(file, buffer.getbuffer(), append)
+        elif _is_path(file):
+            # The workbook is compressed straight into the file, the writer's own copy is never saved
+            _save_openpyxl_workbook(writer.book, file, compression)
+        else:
+            if append:
+                file.seek(0)
+            _save_openpyxl_workbook(writer.book, file, compression)
+            if append:
+                file.truncate()
+        event['bytes'] = _file_size(file)
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------------- Registre des styles -------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# workbook -> StyleRegistry, released with the workbook
+_REGISTRIES = weakref.WeakKeyDictionary()
+
+
+class StyleRegistry:
+    """
+    Registre des styles d'un classeur (openpyxl ou XlsxWriter).
+    
+    Chaque style est identifié par l'ensemble de ses paramètres (dictionnaire header_params, police, format de nombre, ...).
+    Il est construit et enregistré dans le classeur une seule fois, puis retrouvé en O(1) pour toutes les feuilles et tous les appels suivants.
+    Un NamedStyle d'en-tête qui existe déjà dans le classeur est remplacé à sa place, sans décaler les autres styles nommés.
+    
+    Le registre d'un classeur est obtenu avec "style_registry".
+    
+    Attributes
+    ----------
+    hits : int
+        Nombre de styles retrouvés dans le registre
+        
+    misses : int
+        Nombre de styles construits
+    
+    Example
+    -------
+    >>> with pd.ExcelWriter('rapport.xlsx', engine='openpyxl') as writer:
+    ...     for sheet_name, df in dfs.items():
+    ...         _write_df_on_sheet(writer, df, sheet_name, header_format=True, headers_list=headers_list)
+    ...     print(style_registry(writer).stats)
+    {'styles': 6, 'hits': 38, 'misses': 6}
+    """
+    
+    def __init__(self, workbook):
+        self._workbook = weakref.ref(workbook)
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @property
+    def stats(self) -> dict:
+        return {'styles': len(self), 'hits': self.hits, 'misses': self.misses}
+    
+    def lookup(self, key: tuple, build):
+        """
+        Retourne le style enregistré sous key, construit par build() au premier appel.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self._entries[key] = build()
+            return value
+        self.hits += 1
+        return value
+    
+    def font(self, font_name: str, font_size: int, bold: bool, color: str) -> Font:
+        return self.lookup(('font', font_name, font_size, bold, color), lambda: Font(name=font_name, size=font_size, bold=bold, color=color))
+    
+    def font_id(self, font_name: str, font_size: int, bold: bool, color: str) -> int:
+        """
+        Identifiant (fontId) de la police dans un classeur openpyxl.
+        """
+        return self.lookup(('font_id', font_name, font_size, bold, color),
+                           lambda: self._workbook()._fonts.add(self.font(font_name, font_size, bold, color)))
+    
+    def date_style(self, number_format: str = 'DD/MM/YYYY') -> NamedStyle:
+        """
+        NamedStyle 'date_style'. S'il existe déjà dans le classeur, c'est ce style qui est utilisé.
+        """
+        return self._named_style(('date_style', number_format), lambda: NamedStyle(name='date_style', number_format=number_format), replace=False)
+    
+    def header_style(self, header_params: dict) -> NamedStyle:
+        """
+        NamedStyle d'en-tête décrit par header_params (voir "apply_style_to_headers").
+        Un style de même nom mais de paramètres différents est remplacé.
+        """
+        return self._named_style(('header_style',) + tuple(sorted(header_params.items())),
+                                 lambda: NamedStyle(name=header_params['name'], font=_header_font(header_params),
+                                                    fill=_header_fill(header_params), alignment=_header_alignment(header_params)),
+                                 replace=True)
+    
+    def style_array(self, style: NamedStyle) -> StyleArray:
+        """
+        Tableau de style (à copier dans cell._style) des cellules qui utilisent le NamedStyle style, déjà enregistré.
+        """
+        return self.lookup(('style_array', id(style)), lambda: copy(style.as_tuple()))
+    
+    def _named_style(self, key: tuple, build, replace: bool) -> NamedStyle:
+        def register():
+            style = build()
+            workbook = self._workbook()
+            # XlsxWriter has no named styles, StylePlan converts the description into a Format
+            if hasattr(workbook, 'add_format'):
+                return style
+            
+            names = workbook.named_styles
+            if style.name not in names:
+                workbook.add_named_style(style)
+            elif replace:
+                # Cells refer to named styles by position, the new style takes the place of the old one
+                position = names.index(style.name)
+                style._style.xfId = position
+                list.__setitem__(workbook._named_styles, position, style)
+                style.bind(workbook)
+            else:
+                style = workbook._named_styles[style.name]
+            return style
+        
+        return self.lookup(key, register)
+
+
+def style_registry(writer) -> StyleRegistry:
+    """
+    Retourne le registre des styles (voir "StyleRegistry") du classeur d'un pd.ExcelWriter, ou d'un classeur openpyxl / XlsxWriter.
+    
+    Example
+    -------
+    >>> style_registry(writer).stats
+    {'styles': 3, 'hits': 12, 'misses': 3}
+    """
+    workbook = getattr(writer, 'book', writer)
+    registry = _REGISTRIES.get(workbook)
+    if registry is None:
+        registry = _REGISTRIES[workbook] = StyleRegistry(workbook)
+    return registry
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------- Plan de mise en forme différé ---------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Style attribute -> (workbook collection, StyleArray field)
+_STYLE_COLLECTIONS = {'font': ('_fonts', 'fontId'),
+                      'fill': ('_fills', 'fillId'),
+                      'alignment': ('_alignments', 'alignmentId')}
+
+
+def _existing_coordinates(cells: dict, min_row: int, max_row: int, min_col: int, max_col: int) -> Iterator[tuple]:
+    """
+    Retourne les coordonnées (ligne, colonne) des cellules existantes comprises dans la plage, sans créer de cellule.
+    Parcourt la plage ou les cellules existantes, selon ce qui est le plus petit.
+    """
+    if (max_row - min_row + 1) * (max_col - min_col + 1) <= len(cells):
+        return ((row, col) for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1) if (row, col) in cells)
+    
+    return (coord for coord in list(cells) if min_row <= coord[0] <= max_row and min_col <= coord[1] <= max_col)
+
+
+def _iter_existing_cells(worksheet, min_row: int, max_row: int, min_col: int, max_col: int) -> Iterator:
+    """
+    Parcourt les cellules déjà existantes d'une plage, contrairement à worksheet.iter_rows qui crée toutes les cellules de la plage.
+    """
+    cells = worksheet._cells
+    return (cells[coord] for coord in _existing_coordinates(cells, min_row, max_row, min_col, max_col))
+
+
+def _named_style(workbook, style: Union[str, NamedStyle]) -> NamedStyle:
+    """
+    Retourne le NamedStyle du classeur correspondant à style, en l'ajoutant au classeur si nécessaire (comme cell.style = style).
+    """
+    if isinstance(style, NamedStyle):
+        if style not in workbook._named_styles:
+            workbook.add_named_style(style)
+        return style
+    
+    if style not in workbook.named_styles:
+        # Builtin styles ('Normal', ...) are added on first use
+        workbook.add_named_style(builtin_styles[style])
+    
+    return workbook._named_styles[style]
+
+
+def _number_format_id(workbook, number_format: str) -> int:
+    if number_format in BUILTIN_FORMATS_REVERSE:
+        return BUILTIN_FORMATS_REVERSE[number_format]
+    return workbook._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+
+
+def _patched_style_array(workbook, base: StyleArray, patch: tuple) -> StyleArray:
+    """
+    Calcule le tableau de style final d'une cellule : son style actuel (base) auquel on applique les opérations du plan (patch).
+    """
+    array = StyleArray(base) if base is not None else StyleArray()
+    
+    for attribute, value in patch:
+        if attribute == 'style':
+            array = StyleArray(_named_style(workbook, value).as_tuple())
+        elif attribute == 'number_format':
+            array.numFmtId = _number_format_id(workbook, value)
+        else:
+            collection, key = _STYLE_COLLECTIONS[attribute]
+            setattr(array, key, getattr(workbook, collection).add(value))
+    
+    return array
+
+
+def _is_xlsxwriter(writer) -> bool:
+    return getattr(writer, 'engine', None) == 'xlsxwriter'
+
+
+def _xlsxwriter_color(color) -> str:
+    # openpyxl colors are 'AARRGGBB' strings, XlsxWriter expects '#RRGGBB'
+    rgb = getattr(color, 'rgb', color)
+    return f"#{rgb[-6:]}" if isinstance(rgb, str) else None
+
+
+def _xlsxwriter_properties(attribute: str, value) -> dict:
+    """
+    Traduit un attribut de style openpyxl (Font, PatternFill, Alignment, format de nombre) en propriétés de Format XlsxWriter.
+    """
+    if attribute == 'font':
+        properties = {'font_name': value.name, 'font_size': value.sz, 'bold': bool(value.b), 'italic': bool(value.i),
+                      'font_color': _xlsxwriter_color(value.color)}
+    elif attribute == 'fill':
+        properties = {'pattern': 1 if value.fill_type == 'solid' else 0, 'bg_color': _xlsxwriter_color(value.fgColor) if value.fill_type else None}
+    elif attribute == 'alignment':
+        properties = {'align': value.horizontal, 'valign': _XLSXWRITER_VALIGN.get(value.vertical, value.vertical), 'text_wrap': bool(value.wrap_text)}
+    elif attribute == 'number_format':
+        properties = {'num_format': value}
+    else:
+        raise ValueError(f"Unknown style attribute {attribute}")
+    
+    return {key: prop for key, prop in properties.items() if prop is not None}
+
+
+def _xlsxwriter_format(workbook, base, patch: tuple):
+    """
+    Crée le Format XlsxWriter final d'une cellule : une copie de son Format actuel (base) à laquelle on applique le patch du plan.
+    """
+    cell_format = workbook.add_format()
+    if base is not None:
+        for key, value in vars(base).items():
+            # Indices are computed by XlsxWriter for each new format
+            if key not in ('xf_index', 'dxf_index', '_format_key'):
+                setattr(cell_format, key, value)
+    
+    for attribute, value in patch:
+        if attribute == 'style':
+            # A named style replaces the whole format, 'Normal' being the default format itself
+            cell_format = workbook.add_format()
+            properties = {}
+            if value != 'Normal':
+                style = value if isinstance(value, NamedStyle) else builtin_styles[value]
+                for style_attribute in ('font', 'fill', 'alignment', 'number_format'):
+                    properties.update(_xlsxwriter_properties(style_attribute, getattr(style, style_attribute)))
+        else:
+            properties = _xlsxwriter_properties(attribute, value)
+        
+        for key, prop in properties.items():
+            getattr(cell_format, f"set_{key}")(prop)
+    
+    return cell_format
+
+
+class StylePlan:
+    """
+    Plan de mise en forme différé.
+    
+    Les opérations (police, format de nombre, remplissage, alignement, style nommé) sont enregistrées par plage de cellules,
+    sans toucher à la feuille. Lors de "apply", les plages qui se chevauchent sont fusionnées en un style final par cellule,
+    chaque combinaison de styles distincte n'est calculée qu'une fois, puis chaque cellule reçoit une seule affectation.
+    
+    Les fonctions apply_font, save_as_date, clear_existing_style, apply_style_to_headers et save_df_on_excel
+    acceptent un paramètre plan : au lieu d'appliquer directement le style, elles l'ajoutent au plan.
+    
+    Example
+    -------
+    >>> plan = StylePlan()
+    >>> plan.font('Feuil1', 1, 100, 1, 5, Font(name='Arial', size=9))
+    >>> plan.number_format('Feuil1', 2, 100, 3, 3, 'DD/MM/YYYY')
+    >>> apply_font(writer=writer, sheets='Feuil2', max_row='last', max_col='last', plan=plan)
+    >>> plan.apply(writer)
+    """
+    
+    def __init__(self):
+        # sheet_name -> list of (min_row, max_row, min_col, max_col, attribute, value, sparse), in recording order
+        self._operations = {}
+        
+    def _record(self, sheet_name: str, min_row: int, max_row: int, min_col: int, max_col: int, attribute: str, value, sparse: bool = False):
+        self._operations.setdefault(sheet_name, []).append((min_row, max_row, min_col, max_col, attribute, value, sparse))
+        return self
+    
+    # With sparse=True, an operation only reaches the cells that already exist when the plan is applied
+    
+    def font(self, sheet_name: str, min_row: int, max_row: int, min_col: int, max_col: int, font: Font, sparse: bool = False):
+        return self._record(sheet_name, min_row, max_row, min_col, max_col, 'font', font, sparse)
+    
+    def fill(self, sheet_name: str, min_row: int, max_row: int, min_col: int, max_col: int, fill: PatternFill, sparse: bool = False):
+        return self._record(sheet_name, min_row, max_row, min_col, max_col, 'fill', fill, sparse)
+    
+    def alignment(self, sheet_name: str, min_row: int, max_row: int, min_col: int, max_col: int, alignment: Alignment, sparse: bool = False):
+        return self._record(sheet_name, min_row, max_row, min_col, max_col, 'alignment', alignment, sparse)
+    
+    def number_format(self, sheet_name: str, min_row: int, max_row: int, min_col: int, max_col: int, number_format: str, sparse: bool = False):
+        return self._record(sheet_name, min_row, max_row, min_col, max_col, 'number_format', number_format, sparse)
+    
+    def style(self, sheet_name: str, min_row: int, max_row: int, min_col: int, max_col: int, style: Union[str, NamedStyle], sparse: bool = False):
+        """Applique un style nommé, qui remplace toutes les opérations enregistrées auparavant sur ces cellules."""
+        return self._record(sheet_name, min_row, max_row, min_col, max_col, 'style', style, sparse)
+    
+    def clear(self, sheet_name: str, min_row: int, max_row: int, min_col: int, max_col: int, sparse: bool = False):
+        """Remet les cellules au style 'Normal' (voir clear_existing_style)."""
+        return self.style(sheet_name, min_row, max_row, min_col, max_col, 'Normal', sparse)
+    
+    @property
+    def sheets(self) -> list:
+        return list(self._operations)
+    
+    def resolve(self, sheet_name: str, existing: dict = None) -> dict:
+        """
+        Fusionne les opérations d'une feuille en un dictionnaire {(ligne, colonne): ((attribut, valeur), ...)}.
+        Pour un même attribut, la dernière opération enregistrée l'emporte.
+        existing est le dictionnaire des cellules existantes de la feuille, utilisé par les opérations sparse.
+        """
+        operations = self._operations.get(sheet_name, [])
+        return {coord: self._patch_values(operations, patch) for coord, patch in self._resolve(sheet_name, existing).items()}
+    
+    @staticmethod
+    def _patch_values(operations: list, patch: tuple) -> tuple:
+        return tuple((attribute, operations[position][5]) for attribute, position in patch)
+    
+    def _resolve(self, sheet_name: str, existing: dict = None) -> dict:
+        # Patches reference operations by position: cheap to hash, unlike openpyxl style objects
+        cells = {}
+        for position, (min_row, max_row, min_col, max_col, attribute, value, sparse) in enumerate(self._operations.get(sheet_name, [])):
+            if sparse and existing is not None:
+                coordinates = _existing_coordinates(existing, min_row, max_row, min_col, max_col)
+            else:
+                coordinates = ((row, col) for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1))
+            
+            for coord in coordinates:
+                patch = cells.get(coord)
+                if patch is None:
+                    patch = cells[coord] = {}
+                # A named style resets every attribute previously planned on the cell
+                elif attribute == 'style':
+                    patch.clear()
+                patch[attribute] = position
+        
+        return {coord: tuple(patch.items()) for coord, patch in cells.items()}
+    
+    def apply(self, writer: pd.ExcelWriter, sheet_name: Union[str, list] = None):
+        """
+        Applique le plan, en une seule passe par feuille, puis vide les opérations appliquées.
+        
+        Parameters
+        ----------
+        writer : pd.ExcelWriter
+            Objet qui permet d'écrire dans un fichier Excel.
+            
+        sheet_name : str or list, default=None
+            Feuille(s) à mettre en forme, toutes les feuilles du plan par défaut
+        """
+        sheet_names = self.sheets if sheet_name is None else [sheet_name] if isinstance(sheet_name, str) else sheet_name
+        
+        for name in sheet_names:
+            with _phase('style', sheet_name=name) as event:
+                if _is_xlsxwriter(writer):
+                    event['cells'] = self._apply_xlsxwriter(writer.book, writer.sheets[name], name)
+                else:
+                    event['cells'] = self._apply_openpyxl(writer.book, writer.sheets[name], name)
+            
+            self._operations.pop(name, None)
+    
+    def _apply_openpyxl(self, workbook, worksheet, sheet_name: str) -> int:
+        # (current style, patch) -> final style array, computed once per distinct combination
+        arrays = {}
+        registry = style_registry(workbook)
+
+        # Named styles are added to the workbook in recording order, as immediate styling would do
+        for *_, attribute, value, _sparse in self._operations.get(sheet_name, []):
+            if attribute == 'style':
+                _named_style(workbook, value)
+        
+        operations = self._operations.get(sheet_name, [])
+        resolved = self._resolve(sheet_name, worksheet._cells)
+        for (row, col), patch in resolved.items():
+            cell = worksheet.cell(row=row, column=col)
+            base = tuple(cell._style) if cell._style is not None else None
+            array = arrays.get((base, patch))
+            if array is None:
+                # The registry keeps the combination for the other sheets and plans of the workbook
+                values = self._patch_values(operations, patch)
+                array = arrays[(base, patch)] = registry.lookup(('style_array', base, values),
+                                                                lambda: _patched_style_array(workbook, cell._style, values))
+            cell._style = copy(array)
+        
+        return len(resolved)
+    
+    def _apply_xlsxwriter(self, workbook, worksheet, sheet_name: str) -> int:
+        # XlsxWriter keeps the written cells in worksheet.table ({row: {col: cell}}, 0-based) until the file is closed,
+        # the final Format of each cell is swapped in there and serialized at write time
+        table = worksheet.table
+        existing = None
+        if any(operation[-1] for operation in self._operations.get(sheet_name, [])):
+            existing = {(row + 1, col + 1) for row, cols in table.items() for col in cols}
+        
+        # (current format, patch) -> final format, created once per distinct combination
+        formats = {}
+        registry = style_registry(workbook)
+        
+        operations = self._operations.get(sheet_name, [])
+        resolved = self._resolve(sheet_name, existing)
+        for (row, col), patch in resolved.items():
+            cell = table[row - 1].get(col - 1) if row - 1 in table else None
+            base = cell.format if cell is not None else None
+            cell_format = formats.get((base, patch))
+            if cell_format is None:
+                values = self._patch_values(operations, patch)
+                cell_format = formats[(base, patch)] = registry.lookup(('xlsxwriter_format', base, values),
+                                                                       lambda: _xlsxwriter_format(workbook, base, values))
+            
+            if cell is None:
+                worksheet.write_blank(row - 1, col - 1, None, cell_format)
+            else:
+                table[row - 1][col - 1] = cell._replace(format=cell_format)
+        
+        return len(resolved)
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#----------------------------------------- Modification des caractéristiques de l'écriture -----------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+def _style_dimensions(writer: pd.ExcelWriter, sheet_name: str, dimension: str, min_row: int, max_row: int, min_col: int, max_col: int, **styles):
+    """
+    Applique des attributs de style (font, number_format, ...) aux colonnes (dimension='column') ou lignes (dimension='row') entières.
+    """
+    worksheet = writer.sheets[sheet_name]
+    
+    # XlsxWriter: one Format for the whole column or row, keeping any width or height already set
+    if _is_xlsxwriter(writer):
+        patch = tuple(styles.items())
+        cell_format = style_registry(writer).lookup(('xlsxwriter_format', None, patch), lambda: _xlsxwriter_format(writer.book, None, patch))
+        if dimension == 'column':
+            for col in range(min_col - 1, max_col):
+                worksheet.set_column(col, col, worksheet.col_info.get(col, [None])[0], cell_format)
+        elif dimension == 'row':
+            for row in range(min_row - 1, max_row):
+                worksheet.set_row(row, worksheet.set_rows.get(row, [None])[0], cell_format)
+        else:
+            raise ValueError(f"dimension must be 'column' or 'row', not {dimension}")
+        return
+    
+    if dimension == 'column':
+        dimensions = [worksheet.column_dimensions[column_letter(col)] for col in range(min_col, max_col + 1)]
+    elif dimension == 'row':
+        dimensions = [worksheet.row_dimensions[row] for row in range(min_row, max_row + 1)]
+    else:
+        raise ValueError(f"dimension must be 'column' or 'row', not {dimension}")
+    
+    for dim in dimensions:
+        for attribute, value in styles.items():
+            setattr(dim, attribute, value)
+
+
+def apply_font_to_cells(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1',
+                        min_row: int = 1, max_row: int = 1, min_col: int = 1, max_col: int = 1,
+                        font_name: str = 'Arial', font_size: int = 11, bold: bool = False, color: str = '000000', plan: StylePlan = None,
+                        sparse: bool = False, dimension: str = None):
+    """
+    Applique une police (type, taille, gras et couleur) à une/des cellules d'une feuille uniquement.
+    Pour plus d'informations voir la fonction "apply_font".
+    Par défaut applique une police normal de taille 1 en noir.
+    """
+    
+    # Custom font style, built once per workbook
+    registry = style_registry(writer)
+    custom_font = registry.font(font_name, font_size, bold, color)
+    
+    # Whole columns or rows get the font once, at dimension level. Excel still renders
+    # an existing cell with its own style, so only existing cells are overridden below
+    if dimension is not None:
+        _style_dimensions(writer, sheet_name, dimension, min_row, max_row, min_col, max_col, font=custom_font)
+        sparse = True
+    
+    # Deferred: the font is only recorded in the style plan (XlsxWriter always styles through a plan)
+    if plan is not None or _is_xlsxwriter(writer):
+        target = StylePlan() if plan is None else plan
+        target.font(sheet_name, min_row, max_row, min_col, max_col, custom_font, sparse=sparse)
+        if plan is None:
+            target.apply(writer, sheet_name)
+        return
+    
+    # Set the working sheet
+    worksheet = writer.sheets[sheet_name]
+    
+    # Apply custom font only to the cells already written, or by rows to all cells encountered
+    if sparse:
+        cells = _iter_existing_cells(worksheet, min_row, max_row, min_col, max_col)
+    else:
+        cells = (cell for row in worksheet.iter_rows(min_row, max_row, min_col, max_col) for cell in row)
+    
+    # The font id is looked up once, instead of hashing the Font for every cell (cell.font = custom_font)
+    font_id = registry.font_id(font_name, font_size, bold, color)
+    for cell in cells:
+        array = cell._style if cell._style is not None else StyleArray()
+        array.fontId = font_id
+        cell._style = array
+            
+            
+def _last_bounds(worksheet, max_row: Union[int, str], max_col: Union[int, str]) -> tuple:
+    """
+    Remplace max_row et/ou max_col valant 'last' par la dernière ligne et/ou colonne de la feuille.
+    """
+    # XlsxWriter tracks the used range 0-based, None while the sheet is empty
+    if hasattr(worksheet, 'dim_rowmax'):
+        last_row = (worksheet.dim_rowmax or 0) + 1
+        last_col = (worksheet.dim_colmax or 0) + 1
+    else:
+        last_row, last_col = worksheet.max_row, worksheet.max_column
+    
+    if isinstance(max_row, str) and max_row.lower() == 'last':
+        max_row = last_row
+    if isinstance(max_col, str) and max_col.lower() == 'last':
+        max_col = last_col
+    
+    return max_row, max_col
+
+
+def apply_font_to_multiple_sheets(writer: pd.ExcelWriter, sheet_name: Union[str, list] = 'Feuil1',
+                                  min_row: int = 1, max_row: Union[int, str] = 1, min_col: int = 1, max_col: Union[int, str] = 1,
+                                  font_name: str = 'Arial', font_size: int = 11, bold: bool = False, color: str = '000000',
+                                  plan: StylePlan = None, sparse: bool = False, dimension: str = None):
+    """
+    Fonction qui boucle sur des feuilles d'un fichier excel afin d'appliquer un style de police précis.
+    Pour plus d'informations voir la fonction "apply_font".
+    Par défaut applique une police normal de taille 1 en noir.
+    """
+    
+    # Apply to only one specified sheet
+    if isinstance(sheet_name, str) and sheet_name.lower() != 'all':
+        sheet_names = [sheet_name]
+    
+    # Apply to all sheets listed
+    elif isinstance(sheet_name, list):
+        sheet_names = sheet_name
+    
+    # Applies to all workbook sheets
+    elif isinstance(sheet_name, str) and sheet_name.lower() == 'all':
+        sheet_names = list(writer.sheets)
+        
+    else:
+        _report('Error in sheet_name')
+        return
+    
+    for sheets in sheet_names:
+        # Retrieves last row and/or last col of the current worksheet
+        sheet_max_row, sheet_max_col = _last_bounds(writer.sheets[sheets], max_row, max_col)
+        
+        # Apply custom font
+        apply_font_to_cells(writer, sheets,
+                            min_row, sheet_max_row, min_col, sheet_max_col,
+                            font_name, font_size, bold, color, plan, sparse, dimension)
+
+
+def apply_font(file: str = None, writer: pd.ExcelWriter = None, mode: str = 'a', sheets: Union[str, list] = 'Feuil1',
+               min_row: int = 1, max_row: Union[int, str] = 1, min_col: int = 1, max_col: Union[int, str] = 1,
+               font_name: str = 'Arial', font_size: int = 11, bold: bool = False, color: str = '000000', plan: StylePlan = None,
+               sparse: bool = False, dimension: str = None):
+    """
+    Applique une police (type, taille, gras et couleur) à une/des cellules, d'une ou plusieurs lignes, et d'une ou plusieurs colonnes.
+    
+    Il est possible soit :
+    - De spécifier le fichier Excel que l'on souhaite modifier (file)
+    - De spécifier l'objet ExcelWriter
+    
+    Parameters
+    ----------
+    file : str
+        Chemin du fichier Excel
+        
+    writer : ExcelWriter
+        ExcelWriter déjà configuré.
+    
+    mode : {'w', 'a'}, default='a'
+        Mode d'écriture sur le fichier.
+        
+        - 'w' : Écriture, supprime tout ce qui était précédemment présent.
+        - 'a' : Append, ajoute à la suite de ce qui est déjà présent.
+    
+    sheets : str or list, default='Feuil1'
+        - 'Feuil1' : Applique uniquement à la feuille spécifiée
+        - ['Feuil1', 'Feuil2'] : Applique aux feuilles spécifiées
+        - 'All' : Applique à toutes les feuilles
+        
+    min_row : int, default=1
+        Première ligne où appliquer
+        
+    max_row : int or str, default=1
+        - 3 : Applique jusqu'à la ligne 3
+        - 'last' : Applique jusqu'à la dernière ligne de la feuille
+        
+    min_col : int, default=1
+        Première colonne où appliquer
+        
+    max_col : int or str, default=1
+        - 3 : Applique jusqu'à la colonne 3
+        - 'last' : Applique jusqu'à la dernière colonne de la feuille
+        
+    font_name : str, default='Arial'
+        Nom de la police
+        
+    font_size : int, default=11
+        Taille de la police
+        
+    bold : bool, default=False
+        - True : En gras
+        - False : En normal
+        
+    color : str, default='000000'
+        Code hexadecimal de couleur
+        - 000000 : Noir
+        - FFFFFF : Blanc
+        
+    plan : StylePlan, default=None
+        Plan de mise en forme dans lequel enregistrer la police au lieu de l'appliquer.
+        
+        - Avec file : le plan complet est appliqué avant la sauvegarde du fichier
+        - Avec writer : le plan sera appliqué par l'appelant (plan.apply(writer))
+        
+    sparse : bool, default=False
+        N'applique la police qu'aux cellules déjà existantes (écrites) de la plage, sans créer les cellules vides.
+        Le coût dépend alors du nombre de cellules écrites et non de la taille de la plage.
+        
+    dimension : {None, 'column', 'row'}, default=None
+        Applique la police à des colonnes ou des lignes entières, une seule fois par colonne (ou ligne), quel que soit le nombre de lignes.
+        
+        - 'column' : colonnes min_col à max_col entières
+        - 'row' : lignes min_row à max_row entières
+        
+        Seules les cellules déjà écrites de la plage reçoivent en plus la police, une cellule existante gardant son propre style dans Excel.
+    
+    Returns
+    -------
+    None
+    
+    Example
+    -------
+    >>> apply_font()
+    """      
+    
+    if file:
+        try:
+            with pd.ExcelWriter(path=file, mode=mode, engine='openpyxl', if_sheet_exists='overlay') as writer:
+                apply_font_to_multiple_sheets(writer, sheets,
+                                              min_row, max_row, min_col, max_col,
+                                              font_name, font_size, bold, color, plan, sparse, dimension)
+                
+                if plan is not None:
+                    plan.apply(writer)
+
+        except FileNotFoundError:
+            _report("Le fichier spécifiée n'existe pas ou est introuvable")
+    
+    elif writer:
+        apply_font_to_multiple_sheets(writer, sheets,
+                                      min_row, max_row, min_col, max_col,
+                                      font_name, font_size, bold, color, plan, sparse, dimension)
+            
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Application de styles de cellule particuliers ------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+def apply_date_style(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1', date_cols: str = None,
+                     min_row: int = 2, max_row: int = 1000, plan: StylePlan = None, sparse: bool = False, dimension: str = None):
+    """
+    Fonction qui permet d'appliquer le format date Excel (DD/MM/YYYY) à une colonne.
+    
+    Parameters
+    ----------
+    writer : ExcelWriter
+        Objet qui permet d'écrire sur un fichier excel
+        
+    sheet_name : str, default='Feuil1'
+        Nom de la feuille concernée
+        
+    date_cols : str
+         Colonne sur laquelle appliquer le format date.
+        
+    min_row : default=2
+        Ligne à partir de laquelle on applique la mise en forme.
+        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 1 = ligne 1)
+        
+    max_row : default=1000
+        Ligne jusqu'à laquelle on applique la mise en forme
+        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 100 = ligne 100)
+        
+    plan : StylePlan, default=None
+        Plan de mise en forme dans lequel enregistrer le format date au lieu de l'appliquer
+        
+    sparse : bool, default=False
+        N'applique le format qu'aux cellules déjà existantes (écrites), sans créer les cellules vides jusqu'à max_row
+        
+    dimension : {None, 'column', 'row'}, default=None
+        Applique le format à des colonnes ou des lignes entières, une seule fois par colonne (ou ligne), quel que soit le nombre de lignes.
+        
+        - 'column' : la colonne date_cols entière
+        - 'row' : lignes min_row à max_row entières
+        
+        Seules les cellules déjà écrites de la colonne, entre min_row et max_row, reçoivent en plus le format.
+        
+    Returns
+    -------
+    None
+    
+    Example
+    -------
+    >>> apply_date_style(writer, "Feuille1", "D", min_row=2, max_row=25)
+    """
+    registry = style_registry(writer)
+    date_style = registry.date_style('DD/MM/YYYY')
+    
+    col_index = get_index(date_cols, add_one=True)
+    
+    # The whole column (or rows) gets the date style once, existing cells are overridden below
+    if dimension is not None:
+        _style_dimensions(writer, sheet_name, dimension, min_row, max_row, col_index, col_index, number_format=date_style.number_format)
+        sparse = True
+    
+    # Deferred: the date style is only recorded in the style plan (XlsxWriter always styles through a plan)
+    if plan is not None or _is_xlsxwriter(writer):
+        target = StylePlan() if plan is None else plan
+        target.style(sheet_name, min_row, max_row, col_index, col_index, date_style, sparse=sparse)
+        if plan is None:
+            target.apply(writer, sheet_name)
+        return
+                    
+    worksheet = writer.sheets[sheet_name]
+    
+    if sparse:
+        cells = _iter_existing_cells(worksheet, min_row, max_row, col_index, col_index)
+    else:
+        cells = (cell for row in worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=col_index, max_col=col_index) for cell in row)
+
+    # applique le format Date aux cellules excel d'une colonne (avec openpyxl impossible de faire la colonne entière sans selectionner toutes les cellules non vides)
+    array = registry.style_array(date_style)
+    for cell in cells:
+        cell._style = copy(array)
+
+
+def save_as_date(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1', date_cols: Union[str, tuple, list] = None, min_row: int=2, max_row: int=1000,
+                 plan: StylePlan = None, sparse: bool = False, dimension: str = None):
+    """
+    Fonction qui permet d'appliquer le format date Excel (DD/MM/YYYY) à une colonne.
+    
+    Parameters
+    ----------
+    writer : pd.ExcelWriter
+        Objet qui permet d'écrire sur un fichier excel
+        
+    sheet_name : str, default='Feuil1'
+        Nom de la feuille concernée
+        
+    date_cols : str, tuple or list
+         Colonne ou collection de nom de colonnes (A, B, C, ...)
+        
+    min_row : int, default=2
+        Ligne à partir de laquelle on applique la mise en forme.
+        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 1 = ligne 1)
+        
+    max_row : int, default=1000
+        Ligne jusqu'à laquelle on applique la mise en forme
+        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 100 = ligne 100)
+        
+    plan : StylePlan, default=None
+        Plan de mise en forme dans lequel enregistrer le format date au lieu de l'appliquer
+        
+    sparse : bool, default=False
+        N'applique le format qu'aux cellules déjà existantes (écrites), sans créer les cellules vides jusqu'à max_row
+        
+    dimension : {None, 'column', 'row'}, default=None
+        Applique le format aux colonnes entières ('column') ou aux lignes min_row à max_row entières ('row'),
+        puis uniquement aux cellules déjà écrites des colonnes entre min_row et max_row (voir "apply_date_style").
+        
+    Returns
+    -------
+    None
+    
+    Example
+    -------
+    >>> save_as_date(writer, 'Feuil1', "D", min_row=2, max_row=25)
+    >>> save_as_date(writer, 'Feuil1', ('B', 'E'), min_row=2, max_row=50)
+    >>> save_as_date(writer, 'Feuil1', ['A', 'C'], min_row=2, max_row=42)
+    """
+    
+    if isinstance(date_cols, str):
+        apply_date_style(writer, sheet_name, date_cols, min_row, max_row, plan, sparse, dimension)
+
+    elif isinstance(date_cols, (tuple, list)):
+        for col in date_cols:
+            apply_date_style(writer, sheet_name, col, min_row, max_row, plan, sparse, dimension)
+        
+
+def clear_existing_style(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1',
+                         min_row: int = 1, max_row: int = 1000, min_col: int = 1, max_col: int = 1000, plan: StylePlan = None,
+                         sparse: bool = False):
+    """
+    Fonction qui supprime un potentiel style de cellule préalablement existant sur des cellules spécifiées.
+    
+    Parameters
+    ----------
+    writer : pd.ExcelWrtier
+        Objet qui permet d'écrire dans un fichier Excel.
+        
+    sheet_name : str, default='Feuil1'
+        nom de la feuille que l'on veut modifier
+        
+    min_row : int, default=1
+        ligne de début de modification
+        
+    max_row : int, default=1000
+        ligne de fin de modification
+        
+    min_col : int, default=1
+        colonne de début de modfication
+        
+    min_col : int, default=1000
+        colonne de fin de modfication
+        
+    plan : StylePlan, default=None
+        Plan de mise en forme dans lequel enregistrer la suppression du style au lieu de l'appliquer
+        
+    sparse : bool, default=False
+        Ne parcourt que les cellules déjà existantes : une cellule jamais écrite n'a pas de style à supprimer.
+        Évite de créer jusqu'à 1000 x 1000 cellules vides avec les valeurs par défaut.
+        
+    Returns
+    -------
+    None
+    
+    Example
+    -------
+    clear_existing_style(writer, "Feuille1", 1, 100, 1, 10)
+    """
+    
+    # Deferred: the reset to 'Normal' is only recorded in the style plan (XlsxWriter always styles through a plan)
+    if plan is not None or _is_xlsxwriter(writer):
+        target = StylePlan() if plan is None else plan
+        target.clear(sheet_name, min_row, max_row, min_col, max_col, sparse=sparse)
+        if plan is None:
+            target.apply(writer, sheet_name)
+        return
+    
+    worksheet = writer.sheets[sheet_name]
+    
+    if sparse:
+        for cell in _iter_existing_cells(worksheet, min_row, max_row, min_col, max_col):
+            cell.style = 'Normal'
+        return
+    
+    for row in worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+        for cell in row:
+            cell.style = 'Normal'
+            
+            
+def apply_style_to_headers(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1',
+                           list_of_headers: List[list[list, dict]] = None, df: pd.DataFrame = None, plan: StylePlan = None,
+                           startcol: int = 0, startrow: int = 1):
+    """
+    Fonction qui permet d'appliquer un style personnalisé a la premiere cellule de chaque colonne, pour personnaliser l'en-tête.
+    
+    Parameters
+    ----------
+    writer : pd.ExcelWriter
+        Objet qui permet d'écrire dans un fichier Excel.
+        
+    sheet_name : str, default='Feuil1'
+        nom de la feuille que l'on veut modifier
+        
+    list_of_headers: list or tuple
+        Liste (ou tuple) de liste du style : [[colonnes, header_style]]
+        colonnes : Liste des colonnes contenant les headers à modifier.
+        header_style : Dictionnaire contenant les paramètres du style de headers à appliquer.
+        
+    df : pd.DataFrame
+        DataFrame contenant les colonnes, dont le nom sera le headers avec le style spécifié.
+        
+    plan : StylePlan, default=None
+        Plan de mise en forme dans lequel enregistrer le style des en-têtes au lieu de l'appliquer
+        
+    startcol : int, default=0
+        Nombre de colonnes Excel à gauche de la première colonne de df (point d'écriture et colonnes d'index)
+        
+    startrow : int, default=1
+        Ligne Excel des en-têtes (il ne s'agit pas d'un index -> 1 = ligne 1)
+        
+    Returns
+    -------
+    None
+    
+    Example
+    -------
+    >>> apply_style_to_headers(writer, 'Feuil1', [liste_colonne, header_params], df)
+    
+    **Multiple headers styles**
+    
+    >>> df = pd.DataFrame({'Type': ['Voiture', 'Voiture'],
+    ...                    'Marque': ['Peugeot', 'Audi'],
+    ...                    'Modèle': ['208', 'A3'],
+    ...                    'Motorisation': ['Essence', 'Essence']})
+    >>> df
+       Type      Marque  Modèle  Motorisation
+    0  Voiture  Peugeot     208       Essence
+    1  Voiture     Audi      A3       Essence
+    >>> first_style_columns = ['Type', 'Marque']
+    >>> second_style_columns = ['Modèle', 'Motorisation']
+    >>> header_params = {'name': 'existing', 'font_name':'Arial', 'font_size':9,
+    ...                  'bold': True, 'font_color': 'FFFFFF', 'h_align':'center',
+    ...                  'v_align':'center', 'wrap':True, 'start_color': '0b64a0',
+    ...                  'end_color': '0b64a0', 'fill_type':'solid', 'column_height': 34.7}
+    >>> apply_style_to_headers(writer, 'Feuil1',
+    ...                        [[first_style_columns, header_params],
+    ...                         [second_style_columns, header_params]],
+    ...                        df)
+    """
+
+    worksheet = writer.sheets[sheet_name]
+    registry = style_registry(writer)
+    
+    # XlsxWriter has no named styles nor cell objects, headers are styled through a plan
+    if _is_xlsxwriter(writer):
+        target = StylePlan() if plan is None else plan
+        for list_cols, header_params in list_of_headers:
+            header_style = registry.header_style(header_params)
+            worksheet.set_row(startrow - 1, header_params['column_height'])
+            for col in list_cols:
+                if col not in df.columns:
+                    continue
+                col_index = startcol + df.columns.get_loc(col) + 1
+                target.style(sheet_name, startrow, startrow, col_index, col_index, header_style)
+        if plan is None:
+            target.apply(writer, sheet_name)
+        return
+    
+    # Iterates on the list containing: the list of columns + the dictionary of header parameters
+    for list_cols_params in list_of_headers:
+        # Columns list
+        list_cols = list_cols_params[0]
+        # Parameters of the headers associated with this list of columns, style dictionary parameter:value
+        header_params = list_cols_params[1]
+        
+        # Header style of these parameters, registered once per workbook (an older style with the same name is replaced in place)
+        header_style = registry.header_style(header_params)
+        header_array = registry.style_array(header_style)
+
+        # Applies the header to specified cells
+        for col in list_cols:
+            # Columns left out of the sheet (columns parameter) have no header
+            if col not in df.columns:
+                continue
+            # Finds the column index and adds 1 because Excel starts counting at 1 and not 0
+            col_index = startcol + df.columns.get_loc(col) + 1 
+
+            # Defines the height of the header row
+            worksheet.row_dimensions[startrow].height = header_params['column_height']
+            
+            # Deferred: the header style is only recorded in the style plan
+            if plan is not None:
+                plan.style(sheet_name, startrow, startrow, col_index, col_index, header_style)
+                worksheet.column_dimensions[column_letter(col_index)].bestFit = True
+                continue
+
+            # Applied header style to the header cell of the column
+            worksheet.cell(row=startrow, column=col_index)._style = copy(header_array)
+            worksheet.column_dimensions[column_letter(col_index)].bestFit = True
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------- Largeur automatique des colonnes ------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Rows measured at most to size the columns of a large frame
+AUTO_WIDTH_SAMPLE = 100_000
+# Excel General format displays at most 11 characters of a number
+_GENERAL_NUMBER_LENGTH = 11
+
+
+def _text_lengths(column: pd.Series, na_rep: str, float_format: str, date: bool) -> np.ndarray:
+    """
+    Longueur, en caractères, de l'affichage dans Excel de chaque valeur d'une colonne.
+    """
+    dtype = column.dtype
+    missing = column.isna().to_numpy()
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        # Every date has the length of its number format
+        lengths = np.full(len(column), len(DATE_FORMAT if date else DATETIME_FORMAT))
+    elif pd.api.types.is_bool_dtype(dtype):
+        lengths = np.where(column.to_numpy(dtype=bool, na_value=False), len('TRUE'), len('FALSE'))
+    elif pd.api.types.is_float_dtype(dtype):
+        lengths = _round_floats(column.to_frame(), float_format).iloc[:, 0].astype(str).str.len().to_numpy()
+        lengths = np.minimum(lengths, _GENERAL_NUMBER_LENGTH)
+    else:
+        # Each distinct value is formatted only once, then spread with the codes
+        codes, uniques = pd.factorize(column, use_na_sentinel=True)
+        lengths = pd.Series(uniques, dtype=object).astype(str).str.len().to_numpy()[codes]
+
+    return np.where(missing, len(na_rep), lengths)
+
+
+def column_widths(df: pd.DataFrame, columns: Union[str, list] = None, header: bool = True, index: bool = True, point: tuple = ('A', 1),
+                  na_rep: str = 'NaN', float_format: str = '%.2f', date_format: bool = False, date_cols: list = None,
+                  header_format: bool = False, headers_list: list = None, sample: int = AUTO_WIDTH_SAMPLE, quantile: float = None) -> dict:
+    """
+    Calcule la largeur d'affichage de chaque colonne écrite par "save_df_on_excel", directement à partir du DataFrame.
+    
+    La longueur des valeurs formatées (float_format, format date, na_rep) est mesurée colonne par colonne avec str.len,
+    celle des en-têtes tient compte de la taille et de la graisse de leur police (headers_list).
+    Au-delà de sample lignes, seul un échantillon des lignes est mesuré.
+    
+    Parameters
+    ----------
+    sample : int, default=AUTO_WIDTH_SAMPLE
+        Nombre maximal de lignes mesurées
+        
+    quantile : float, default=None
+        Quantile des longueurs retenu pour chaque colonne (par exemple 0.99 pour ignorer quelques valeurs très longues).
+        Par défaut, la longueur maximale.
+        
+    Les autres paramètres sont identiques à ceux de "save_df_on_excel".
+    
+    Returns
+    -------
+    dict
+        {lettre de colonne: largeur}
+    
+    Example
+    -------
+    >>> column_widths(pd.DataFrame({'Ville': ['Paris', 'Marseille'], 'Prix': [1.5, 12.25]}), index=False)
+    {'A': 11.0, 'B': 7.0}
+    """
+    
+    startcol, _ = get_coord(point[0], point[1])
+    if columns is not None:
+        df = df[[columns] if isinstance(columns, str) else columns]
+    labels = list(df.columns)
+    if index:
+        labels = list(df.index.names) + labels
+        df = df.reset_index(allow_duplicates=True)
+    if len(df) > sample:
+        df = df.sample(n=sample, random_state=0)
+    
+    date_positions = {get_index(letter) - startcol for letter in (date_cols or [])} if date_format else set()
+    lengths = np.zeros((len(df), len(labels)))
+    for position in range(len(labels)):
+        lengths[:, position] = _text_lengths(df.iloc[:, position], na_rep, float_format, position in date_positions)
+    
+    widths = np.zeros(len(labels)) if len(df) == 0 else lengths.max(axis=0) if quantile is None else np.quantile(lengths, quantile, axis=0)
+    
+    if header:
+        # Header labels are measured in characters of their own font, relative to the default 11 points
+        params_by_column = _headers_params_by_column(headers_list) if header_format else {}
+        scales = np.array([params_by_column[label]['font_size'] / 11 * (1.1 if params_by_column[label]['bold'] else 1)
+                           if label in params_by_column else 1 for label in labels])
+        label_lengths = np.array([len(str(label)) if label is not None else 0 for label in labels])
+        widths = np.maximum(widths, label_lengths * scales)
+    
+    # Two characters of padding, as Excel does when fitting a column
+    return dict(zip(column_letters(np.arange(startcol + 1, startcol + len(labels) + 1)).tolist(), (np.ceil(widths) + 2).tolist()))
+
+
+def apply_column_widths(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1', widths: dict = None):
+    """
+    Applique les largeurs de colonnes {lettre: largeur} (voir "column_widths") à une feuille, sans parcourir ses cellules.
+    
+    Example
+    -------
+    >>> apply_column_widths(writer, 'Feuil1', column_widths(df))
+    """
+    
+    worksheet = writer.sheets[sheet_name]
+    
+    if _is_xlsxwriter(writer):
+        for letter, width in widths.items():
+            col = column_index(letter) - 1
+            # The format already set on the column is kept
+            info = worksheet.col_info.get(col)
+            worksheet.set_column(col, col, width, info[1] if info else None)
+        return
+    
+    dimensions = worksheet.column_dimensions
+    for letter, width in widths.items():
+        dimensions[letter].width = width
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------------------ Tableaux Excel -------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+TABLE_STYLE = 'TableStyleMedium2'
+
+
+def _table_options(table: Union[bool, str, dict] = True) -> dict:
+    """
+    Options d'un tableau Excel : True (style par défaut), nom d'un style de tableau, ou dictionnaire d'options (voir "apply_table").
+    """
+    options = {'name': None, 'style': TABLE_STYLE, 'autofilter': True, 'banded_rows': True, 'banded_columns': False,
+               'first_column': False, 'last_column': False}
+    if isinstance(table, str):
+        options['style'] = table
+    elif isinstance(table, dict):
+        options.update(table)
+    return options
+
+
+def _table_column_names(labels: list) -> list:
+    """
+    Noms des colonnes d'un tableau : des chaînes non vides et uniques (sans tenir compte de la casse), comme l'exige Excel.
+    """
+    names, taken = [], set()
+    for position, label in enumerate(labels):
+        name = str(label) if label is not None and str(label) != '' else f'Column{position + 1}'
+        candidate, suffix = name, 2
+        while candidate.lower() in taken:
+            candidate, suffix = f'{name}{suffix}', suffix + 1
+        taken.add(candidate.lower())
+        names.append(candidate)
+    return names
+
+
+def _table_name(sheet_name: str, taken: set) -> str:
+    """
+    Nom de tableau dérivé du nom de la feuille ('Table_Ventes', 'Table_Ventes_2', ...), absent de taken (noms en minuscules).
+    """
+    name = 'Table_' + re.sub(r'[^\w.]', '_', sheet_name)
+    candidate, suffix = name, 2
+    while candidate.lower() in taken:
+        candidate, suffix = f'{name}_{suffix}', suffix + 1
+    return candidate
+
+
+def _openpyxl_table(name: str, ref: str, names: list, header: bool, options: dict) -> Table:
+    return Table(displayName=name, ref=ref, headerRowCount=1 if header else 0,
+                 autoFilter=AutoFilter(ref=ref) if options['autofilter'] and header else None,
+                 tableColumns=[TableColumn(id=position, name=column) for position, column in enumerate(names, 1)],
+                 tableStyleInfo=TableStyleInfo(name=options['style'], showFirstColumn=options['first_column'], showLastColumn=options['last_column'],
+                                               showRowStripes=options['banded_rows'], showColumnStripes=options['banded_columns']))
+
+
+def apply_table(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1', cell_range: str = None, columns: list = None, header: bool = True,
+                table: Union[bool, str, dict] = True) -> str:
+    """
+    Transforme une plage de cellules en tableau Excel (ListObject), mis en forme par son style plutôt que cellule par cellule.
+    
+    Excel dessine lui-même l'en-tête, les lignes à bandes et les filtres du tableau : seules quelques lignes de description
+    sont écrites dans le fichier, quel que soit le nombre de lignes.
+    
+    Parameters
+    ----------
+    writer : pd.ExcelWriter
+        Objet qui permet d'écrire dans un fichier Excel.
+        
+    sheet_name : str, default='Feuil1'
+        Nom de la feuille
+        
+    cell_range : str
+        Plage du tableau, en-tête compris (ex : 'A1:D100')
+        
+    columns : list
+        Libellés des colonnes de la plage. Ils sont rendus uniques et non vides, et remplacent les cellules d'en-tête.
+        
+    header : bool, default=True
+        Si la première ligne de la plage est la ligne d'en-tête
+        
+    table : bool, str or dict, default=True
+        True pour le style par défaut (TABLE_STYLE), le nom d'un style de tableau (prédéfini, ex : 'TableStyleLight9', ou défini
+        dans le classeur), ou un dictionnaire d'options :
+        
+        - name : nom du tableau, dérivé du nom de la feuille par défaut
+        - style : nom du style de tableau, None pour aucun
+        - autofilter : boutons de filtre dans l'en-tête, default=True
+        - banded_rows / banded_columns : lignes / colonnes à bandes, default=True / False
+        - first_column / last_column : mise en évidence de la première / dernière colonne, default=False
+    
+    Returns
+    -------
+    str
+        Nom du tableau
+    
+    Example
+    -------
+    >>> apply_table(writer, 'Ventes', 'A1:D1001', list(df.columns), table={'style': 'TableStyleLight9', 'banded_columns': True})
+    'Table_Ventes'
+    """
+    
+    options = _table_options(table)
+    min_col, min_row, max_col, max_row = parse_range(cell_range)
+    # A table has at least one data row
+    max_row = max(max_row, min_row + 1 if header else min_row)
+    names = _table_column_names(columns)
+    worksheet = writer.sheets[sheet_name]
+    
+    if _is_xlsxwriter(writer):
+        taken = {existing['name'].lower() for sheet in writer.book.worksheets() for existing in sheet.tables}
+        name = options['name'] or _table_name(sheet_name, taken)
+        # XlsxWriter writes the header cells itself, with the format they already have
+        header_formats = [getattr(worksheet.table.get(min_row - 1, {}).get(col - 1), 'format', None) for col in range(min_col, max_col + 1)]
+        worksheet.add_table(min_row - 1, min_col - 1, max_row - 1, max_col - 1, {
+            'name': name, 'style': options['style'], 'autofilter': options['autofilter'] and header, 'header_row': header,
+            'banded_rows': options['banded_rows'], 'banded_columns': options['banded_columns'],
+            'first_column': options['first_column'], 'last_column': options['last_column'],
+            'columns': [{'header': column, 'header_format': cell_format} for column, cell_format in zip(names, header_formats)]})
+        return name
+    
+    taken = {existing.lower() for sheet in writer.book.worksheets for existing in sheet.tables}
+    name = options['name'] or _table_name(sheet_name, taken)
+    ref = f'{column_letter(min_col)}{min_row}:{column_letter(max_col)}{max_row}'
+    
+    # Tables of the sheet overlapping the new one are dropped (overlay on a sheet already holding a table)
+    for existing_name, existing in list(worksheet.tables.items()):
+        bounds = parse_range(existing.ref)
+        if bounds[0] <= max_col and min_col <= bounds[2] and bounds[1] <= max_row and min_row <= bounds[3]:
+            del worksheet.tables[existing_name]
+    
+    if header:
+        for col, column in zip(range(min_col, max_col + 1), names):
+            cell = worksheet.cell(row=min_row, column=col)
+            if cell.value != column:
+                cell.value = column
+    
+    worksheet.add_table(_openpyxl_table(name, ref, names, header, options))
+    return name
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------ Mise en forme par masque booléen -------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+def mask_ranges(mask) -> np.ndarray:
+    """
+    Regroupe les cellules vraies d'un masque booléen (2 dimensions, ou 1 dimension pour une seule colonne) en rectangles.
+    
+    Les suites de cellules vraies sont détectées colonne par colonne avec NumPy, puis les suites couvrant les mêmes lignes
+    dans des colonnes voisines sont fusionnées : un masque d'un million de lignes se réduit à quelques plages.
+    
+    Returns
+    -------
+    np.ndarray
+        Tableau (n, 4) : première ligne, dernière ligne, première colonne, dernière colonne (positions comptées à partir de 0, incluses)
+    
+    Example
+    -------
+    >>> mask_ranges(np.array([[1, 1], [1, 1], [0, 1]], dtype=bool)) -> array([[0, 1, 0, 0], [0, 2, 1, 1]])
+    """
+    values = np.asarray(mask, dtype=bool)
+    if values.ndim == 1:
+        values = values[:, None]
+    
+    # A run starts where the padded column goes from 0 to 1, and ends where it goes back to 0
+    padded = np.zeros((values.shape[1], values.shape[0] + 2), dtype=np.int8)
+    padded[:, 1:-1] = values.T
+    steps = np.diff(padded, axis=1)
+    cols, starts = np.nonzero(steps == 1)
+    ends = np.nonzero(steps == -1)[1] - 1
+    if not len(cols):
+        return np.empty((0, 4), dtype=np.int64)
+    
+    # Runs over the same rows in adjacent columns form one rectangle
+    order = np.lexsort((cols, ends, starts))
+    cols, starts, ends = cols[order], starts[order], ends[order]
+    new = np.ones(len(cols), dtype=bool)
+    new[1:] = (starts[1:] != starts[:-1]) | (ends[1:] != ends[:-1]) | (cols[1:] != cols[:-1] + 1)
+    first = np.flatnonzero(new)
+    last = np.append(first[1:], len(cols)) - 1
+    
+    return np.column_stack([starts[first], ends[first], cols[first], cols[last]]).astype(np.int64)
+
+
+def _range_references(ranges: np.ndarray) -> list:
+    """
+    Plages au format A1 ('B2:D10', ou 'C5' pour une seule cellule) à partir de bornes comptées à partir de 1.
+    """
+    min_letters, max_letters = column_letters(ranges[:, 2]), column_letters(ranges[:, 3])
+    return [f'{min_letter}{min_row}' if (min_row, min_col) == (max_row, max_col) else f'{min_letter}{min_row}:{max_letter}{max_row}'
+            for (min_row, max_row, min_col, max_col), min_letter, max_letter in zip(ranges.tolist(), min_letters, max_letters)]
+
+
+def apply_style_by_mask(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1', df: pd.DataFrame = None, mask=None,
+                        font: Font = None, fill: PatternFill = None, number_format: str = None, point: tuple = ('A', 1),
+                        header: bool = True, index: bool = True, plan: StylePlan = None) -> list:
+    """
+    Met en forme les cellules d'un DataFrame déjà écrit qui vérifient une condition (soldes négatifs, dates dépassées, ...).
+    
+    Le masque est réduit à des plages rectangulaires (voir "mask_ranges") : le style est appliqué plage par plage,
+    au lieu d'un appel à apply_font_to_cells par cellule.
+    
+    Les plages sont mises en forme directement (pas de règle de mise en forme conditionnelle Excel) : le style correspond
+    aux valeurs écrites et n'est pas recalculé si les cellules sont modifiées dans Excel.
+    
+    Parameters
+    ----------
+    writer : pd.ExcelWriter
+        Objet qui permet d'écrire dans un fichier Excel.
+        
     sheet_name : str, default='Feuil1'
-        Nom de la feuille concernée
+        Nom de la feuille
+        
+    df : pd.DataFrame
+        DataFrame tel qu'il a été écrit sur la feuille
+        
+    mask : str, pd.Series, pd.DataFrame or np.ndarray
+        Condition à mettre en évidence :
+        
+        - une expression évaluée sur df (df.eval), ex : 'solde < 0'
+        - un masque de lignes (pd.Series ou tableau à 1 dimension) : toute la ligne est mise en forme, index compris
+        - un masque de cellules (pd.DataFrame ou tableau à 2 dimensions), aligné sur les colonnes de df
+        
+        Les valeurs manquantes du masque valent False.
+        
+    font : Font, default=None
+        Police des cellules
+        
+    fill : PatternFill, default=None
+        Remplissage des cellules
+        
+    number_format : str, default=None
+        Format de nombre des cellules
+        
+    point : tuple, default=('A', 1)
+        Cellule où df a été écrit
+        
+    header : bool, default=True
+        Si df a été écrit avec son en-tête
+        
+    index : bool, default=True
+        Si df a été écrit avec son index
+        
+    plan : StylePlan, default=None
+        Si renseigné, les styles sont ajoutés au plan au lieu d'être appliqués (voir StylePlan)
+    
+    Returns
+    -------
+    list
+        Plages mises en forme, au format A1
+    
+    Example
+    -------
+    >>> apply_style_by_mask(writer, 'Comptes', df, 'solde < 0', fill=PatternFill('solid', fgColor='FFC7CE'), index=False)
+    ['A3:D3', 'A8:D9']
+    >>> apply_style_by_mask(writer, 'Comptes', df, df[['solde']] < 0, font=Font(color='9C0006'), index=False)
+    ['C3', 'C8:C9']
+    """
+    
+    if isinstance(mask, str):
+        mask = df.eval(mask)
+    if isinstance(mask, np.ndarray) and mask.ndim == 2:
+        mask = pd.DataFrame(mask, index=df.index, columns=df.columns)
+    
+    index_width = df.index.nlevels if index else 0
+    if isinstance(mask, pd.DataFrame):
+        if not (mask.index.equals(df.index) and mask.columns.equals(df.columns)):
+            mask = mask.reindex(index=df.index, columns=df.columns)
+        ranges = mask_ranges(mask.astype('boolean').fillna(False).to_numpy(dtype=bool))
+        ranges[:, 2:] += index_width
+    else:
+        mask = mask.reindex(df.index) if isinstance(mask, pd.Series) and not mask.index.equals(df.index) else pd.Series(mask, index=df.index)
+        # A row mask covers the whole written row
+        ranges = mask_ranges(mask.astype('boolean').fillna(False).to_numpy(dtype=bool))
+        ranges[:, 3] = index_width + df.shape[1] - 1
+    
+    if not len(ranges):
+        return []
+    
+    # Positions in the frame -> sheet coordinates (counted from 1)
+    col, row = get_coord(point[0], point[1])
+    ranges[:, :2] += row + (df.columns.nlevels if header else 0) + 1
+    ranges[:, 2:] += col + 1
+    references = _range_references(ranges)
+    
+    target = StylePlan() if plan is None else plan
+    for min_row, max_row, min_col, max_col in ranges.tolist():
+        if font is not None:
+            target.font(sheet_name, min_row, max_row, min_col, max_col, font)
+        if fill is not None:
+            target.fill(sheet_name, min_row, max_row, min_col, max_col, fill)
+        if number_format is not None:
+            target.number_format(sheet_name, min_row, max_row, min_col, max_col, number_format)
+    if plan is None:
+        target.apply(writer, sheet_name)
+    
+    return references
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------------ Entrées Arrow et Polars ----------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+def _as_frame(df):
+    """
+    DataFrame pandas à partir d'une table Arrow (pyarrow.Table, RecordBatch), d'un DataFrame Polars ou de tout objet exposant
+    l'interface Arrow C (__arrow_c_stream__, __arrow_c_array__) ou le protocole d'échange de DataFrames (__dataframe__).
+    Un pyarrow.RecordBatchReader devient un itérateur de DataFrames, écrit lot par lot. Les autres objets sont retournés tels quels.
+    """
+    if isinstance(df, pd.DataFrame) or not any(hasattr(df, attribute) for attribute in ('__arrow_c_stream__', '__arrow_c_array__', '__dataframe__')):
+        return df
+    
+    try:
+        import pyarrow as pa
+    except ImportError:
+        # Without pyarrow, only the interchange protocol can be read, strings become Python objects
+        if hasattr(df, '__dataframe__'):
+            return pd.api.interchange.from_dataframe(df)
+        raise ImportError("La lecture des tables Arrow nécessite pyarrow") from None
+    
+    if isinstance(df, pa.RecordBatchReader):
+        return (_arrow_to_pandas(pa.Table.from_batches([batch])) for batch in df)
+    if hasattr(df, '__arrow_c_stream__') or hasattr(df, '__arrow_c_array__'):
+        return _arrow_to_pandas(pa.table(df))
+    return _arrow_to_pandas(pa.interchange.from_dataframe(df))
+
+
+def _arrow_to_pandas(table) -> pd.DataFrame:
+    """
+    Convertit une table Arrow en DataFrame en évitant les copies : les colonnes numériques sans valeur manquante sont des vues
+    des tampons Arrow, les colonnes dictionnaire deviennent des Categorical (codes et valeurs distinctes, écrites une fois dans la table
+    des chaînes partagées) et les chaînes restent dans leur tampon Arrow (pd.StringDtype('pyarrow')), sans objet Python par ligne.
+    """
+    import pyarrow as pa
+
+    # pandas does not read string views (Polars), they are cast to large strings
+    def readable(data_type):
+        if pa.types.is_string_view(data_type):
+            return pa.large_string()
+        if pa.types.is_dictionary(data_type) and pa.types.is_string_view(data_type.value_type):
+            return pa.dictionary(data_type.index_type, pa.large_string(), data_type.ordered)
+        return data_type
+
+    schema = pa.schema([field.with_type(readable(field.type)) for field in table.schema], metadata=table.schema.metadata)
+    if schema != table.schema:
+        table = table.cast(schema)
+
+    string_dtype = pd.StringDtype('pyarrow')
+    return table.to_pandas(split_blocks=True, date_as_object=False,
+                           types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype, pa.bool_(): pd.BooleanDtype()}.get)
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------- Écriture en flux (streaming) ----------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+DATE_FORMAT = 'DD/MM/YYYY'
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+# Rows of a DataFrame converted at a time when streaming, bounds the copy of the values as Python objects
+STREAM_CHUNKSIZE = 10_000
+
+
+def _iter_chunks(df: Union[pd.DataFrame, Iterable[pd.DataFrame]], chunksize: int = None) -> Iterator[pd.DataFrame]:
+    """
+    Retourne un itérateur de DataFrames à partir d'un DataFrame (découpé par blocs de chunksize lignes) ou d'un itérable de DataFrames.
+    """
+    # A cancelled export stops between two blocks
+    if isinstance(df, pd.DataFrame):
+        if not chunksize or len(df) <= chunksize:
+            _check_cancelled()
+            yield df
+        else:
+            for start in range(0, len(df), chunksize):
+                _check_cancelled()
+                yield df.iloc[start:start + chunksize]
+    else:
+        for chunk in df:
+            _check_cancelled()
+            yield _as_frame(chunk)
+
+
+def _round_floats(df: pd.DataFrame, float_format: str = None) -> pd.DataFrame:
+    """
+    Applique float_format aux colonnes de type float, comme le fait df.to_excel (float(float_format % valeur)).
+    """
+    float_cols = df.select_dtypes('float').columns
+    if not float_format or len(float_cols) == 0:
+        return df
+
+    df = df.copy()
+    precision = re.fullmatch(r'%\.(\d+)f', float_format)
+    # '%.2f' is a plain rounding, which NumPy does in bulk
+    if precision:
+        df[float_cols] = df[float_cols].round(int(precision.group(1)))
+    else:
+        df[float_cols] = df[float_cols].map(lambda value: float(float_format % value))
+
+    return df
+
+
+def _header_font(header_params: dict) -> Font:
+    return Font(name=header_params['font_name'], size=header_params['font_size'], bold=header_params['bold'], color=header_params['font_color'])
+
+
+def _header_fill(header_params: dict) -> PatternFill:
+    return PatternFill(start_color=header_params['start_color'], end_color=header_params['end_color'], fill_type=header_params['fill_type'])
+
+
+def _header_alignment(header_params: dict) -> Alignment:
+    return Alignment(horizontal=header_params['h_align'], vertical=header_params['v_align'], wrap_text=header_params['wrap'])
+
+
+def _headers_params_by_column(headers_list: list = None) -> dict:
+    """
+    Transforme headers_list ([[colonnes, header_params], ...]) en dictionnaire {colonne: header_params}.
+    """
+    params_by_column = {}
+    for list_cols, header_params in headers_list or []:
+        for col in list_cols:
+            params_by_column[col] = header_params
+
+    return params_by_column
+
+
+class _OpenpyxlRowSink:
+    """
+    Écrit des lignes, une à une, dans une feuille openpyxl en mode write-only (aucune cellule n'est conservée en mémoire).
+    """
+
+    def __init__(self, file, sheet_name: str, compression: int = None):
+        self.file = file
+        self.compression = compression
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet(sheet_name)
+        self._styled_cells = {}
+
+    def add_sheet(self, sheet_name: str):
+        # The rows of the previous sheets stay in their temporary files until the workbook is saved
+        self.worksheet = self.workbook.create_sheet(sheet_name)
+
+    def header_style(self, header_params: dict):
+        cell = WriteOnlyCell(self.worksheet)
+        cell.font = _header_font(header_params)
+        cell.fill = _header_fill(header_params)
+        cell.alignment = _header_alignment(header_params)
+        return cell
+
+    def number_format(self, number_format: str):
+        cell = WriteOnlyCell(self.worksheet)
+        cell.number_format = number_format
+        return cell
+
+    def set_row_height(self, row: int, height: float):
+        self.worksheet.row_dimensions[row + 1].height = height
+
+    def set_column_widths(self, widths: dict):
+        # Written with the sheet header, before the first row
+        for letter, width in widths.items():
+            self.worksheet.column_dimensions[letter].width = width
+
+    def write_row(self, row: int, startcol: int, values: list, styles: dict):
+        # Row index is implicit in write-only mode, rows are emitted in order
+        cells = [None] * startcol + list(values)
+        for position, template in styles.items():
+            cell = WriteOnlyCell(self.worksheet, value=values[position])
+            # Copies the already interned style array instead of re-assigning each style attribute
+            cell._style = copy(template._style)
+            cells[startcol + position] = cell
+        self.worksheet.append(cells)
+
+    def skip_rows(self, count: int):
+        for _ in range(count):
+            self.worksheet.append([])
+
+    def add_table(self, cell_range: str, labels: list, header: bool, sheet_name: str, table: Union[bool, str, dict]):
+        options = _table_options(table)
+        min_col, min_row, max_col, max_row = parse_range(cell_range)
+        ref = f'{column_letter(min_col)}{min_row}:{column_letter(max_col)}{max(max_row, min_row + 1 if header else min_row)}'
+        with warnings.catch_warnings():
+            # Write-only sheets warn that table columns must be given, they are
+            warnings.simplefilter('ignore')
+            self.worksheet.add_table(_openpyxl_table(options['name'] or _table_name(sheet_name, set()), ref, _table_column_names(labels), header, options))
+
+    def close(self):
+        _save_openpyxl_workbook(self.workbook, self.file, self.compression)
+
+    def abort(self):
+        # The rows are kept in a temporary file per sheet until the workbook is saved
+        for worksheet in self.workbook.worksheets:
+            if not worksheet.closed:
+                worksheet.close()
+            worksheet._writer.cleanup()
+
+
+class _XlsxWriterRowSink:
+    """
+    Écrit des lignes, une à une, dans une feuille XlsxWriter en mode constant_memory (chaque ligne est écrite sur disque dès la suivante).
+    """
+
+    def __init__(self, file, sheet_name: str):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(file, {'constant_memory': True})
+        self.worksheet = self.workbook.add_worksheet(sheet_name)
+
+    def add_sheet(self, sheet_name: str):
+        self.worksheet = self.workbook.add_worksheet(sheet_name)
+
+    def header_style(self, header_params: dict):
+        return self.workbook.add_format({'font_name': header_params['font_name'], 'font_size': header_params['font_size'],
+                                         'bold': header_params['bold'], 'font_color': f"#{header_params['font_color'][-6:]}",
+                                         'align': header_params['h_align'], 'valign': _XLSXWRITER_VALIGN.get(header_params['v_align'], header_params['v_align']),
+                                         'text_wrap': header_params['wrap'], 'pattern': 1 if header_params['fill_type'] == 'solid' else 0,
+                                         'bg_color': f"#{header_params['start_color'][-6:]}"})
+
+    def number_format(self, number_format: str):
+        return self.workbook.add_format({'num_format': number_format})
+
+    def set_row_height(self, row: int, height: float):
+        self.worksheet.set_row(row, height)
+
+    def set_column_widths(self, widths: dict):
+        for letter, width in widths.items():
+            self.worksheet.set_column(column_index(letter) - 1, column_index(letter) - 1, width)
+
+    def write_row(self, row: int, startcol: int, values: list, styles: dict):
+        for position, value in enumerate(values):
+            self.worksheet.write(row, startcol + position, value, styles.get(position))
+
+    def skip_rows(self, count: int):
+        pass
+
+    def add_table(self, cell_range: str, labels: list, header: bool, sheet_name: str, table: Union[bool, str, dict]):
+        _report("Le tableau Excel n'est pas disponible avec XlsxWriter en mode streaming (constant_memory), il est ignoré", error=False)
+
+    def close(self):
+        self.workbook.close()
+
+    def abort(self):
+        # Nothing is written to the file before close
+        pass
+
+
+# XlsxWriter uses 'vcenter' where openpyxl uses 'center'
+_XLSXWRITER_VALIGN = {'center': 'vcenter'}
+
+
+@_bytes_target
+@_instrumented
+def stream_df_on_excel(df: Union[pd.DataFrame, Iterable[pd.DataFrame]], file: Union[str, io.IOBase], sheet_name: str = 'Feuil1', na_rep: str = 'NaN',
+                       columns: Union[str, list] = None, header: bool = True, index: bool = True, point: tuple = ('A', 1),
+                       engine: str = 'openpyxl', float_format: str = '%.2f', chunksize: int = None, date_format: bool = False,
+                       date_cols: list = None, header_format: bool = False, headers_list: list = None, auto_width: bool = False,
+                       table: Union[bool, str, dict] = None, compression: int = None):
+    """
+    Écrit un DataFrame, ou un itérateur de DataFrames (blocs de lignes), dans un nouveau fichier Excel sans jamais charger la feuille en mémoire.
+
+    Les lignes sont écrites au fil de l'eau via une feuille openpyxl en mode write-only ou XlsxWriter en mode constant_memory.
+    Le format date et le style des en-têtes sont appliqués au moment où chaque ligne est écrite, il n'y a pas de seconde passe.
+    La mémoire utilisée dépend donc de la taille d'un bloc et non de la taille de la feuille.
+
+    Parameters
+    ----------
+    df : pd.DataFrame or iterable of pd.DataFrame
+        DataFrame, ou itérateur de DataFrames ayant les mêmes colonnes (par exemple pd.read_csv(..., chunksize=100_000))
+
+    file : str, path, file-like object or None
+        Le fichier Excel à créer (un fichier existant est écrasé), ou un objet fichier binaire.
+        None : le classeur est écrit en mémoire et la fonction retourne son contenu (bytes).
+
+    chunksize : int, default=None
+        Si df est un DataFrame, nombre de lignes converties à la fois, STREAM_CHUNKSIZE par défaut
+
+    engine : {'openpyxl', 'xlsxwriter'}, default='openpyxl'
+        Moteur d'écriture
+
+    Les autres paramètres sont identiques à ceux de "save_df_on_excel".
+
+    Returns
+    -------
+    None
+
+    Example
+    -------
+    >>> stream_df_on_excel(pd.read_csv('data.csv', chunksize=100_000), 'data.xlsx', date_format=True, date_cols=['C'])
+    """
+
+    df = _as_frame(df)
+    if engine == 'openpyxl':
+        sink = _OpenpyxlRowSink(file, sheet_name, compression)
+    elif engine == 'xlsxwriter':
+        if compression is not None:
+            _report("Le niveau de compression n'est pas réglable avec le moteur xlsxwriter, la compression par défaut est utilisée", error=False)
+        sink = _XlsxWriterRowSink(file, sheet_name)
+    else:
+        _report(f"Erreur dans le moteur spécifié : {engine} n'existe pas")
+        return
+
+    try:
+        _stream_sheet(sink, df, sheet_name, na_rep, columns, header, index, point, float_format, chunksize, date_format, date_cols,
+                      header_format, headers_list, auto_width, table)
+    except BaseException:
+        # Nothing is saved (error or cancelled export), the rows already written are discarded
+        sink.abort()
+        raise
+
+    with _phase('save', file=file) as event:
+        sink.close()
+        event['bytes'] = _file_size(file)
+
+
+def _stream_sheet(sink, df: Union[pd.DataFrame, Iterable[pd.DataFrame]], sheet_name: str, na_rep: str, columns: Union[str, list], header: bool,
+                  index: bool, point: tuple, float_format: str, chunksize: int, date_format: bool, date_cols: list, header_format: bool,
+                  headers_list: list, auto_width: bool, table: Union[bool, str, dict]):
+    """
+    Écrit les lignes de df dans la feuille courante de sink (voir "stream_df_on_excel").
+    """
+    startcol, startrow = get_coord(point[0], point[1])
+
+    params_by_column = _headers_params_by_column(headers_list) if header_format else {}
+    # Date columns are given as Excel letters, converted to positions relative to the first written column
+    date_positions = {get_index(letter) - startcol for letter in (date_cols or [])} if date_format else set()
+    date_style = sink.number_format(DATE_FORMAT)
+    datetime_style = sink.number_format(DATETIME_FORMAT)
+
+    row = startrow
+    data_styles = None
+
+    with _phase('write', sheet_name=sheet_name) as event:
+        for chunk in _iter_chunks(df, chunksize or STREAM_CHUNKSIZE):
+            # Column widths are known before the first row is written, from the DataFrame or from the first chunk
+            if data_styles is None:
+                if auto_width:
+                    sink.set_column_widths(column_widths(df if isinstance(df, pd.DataFrame) else chunk, columns, header, index, point, na_rep,
+                                                         float_format, date_format, date_cols, header_format, headers_list))
+                sink.skip_rows(startrow)
+
+            if columns is not None:
+                chunk = chunk[[columns] if isinstance(columns, str) else columns]
+            labels = list(chunk.columns)
+            if index:
+                # Unnamed index levels get an empty header cell, as with df.to_excel
+                labels = list(chunk.index.names) + labels
+                chunk = chunk.reset_index(allow_duplicates=True)
+
+            # Header and per-column styles are resolved once, from the first chunk
+            if data_styles is None:
+
+                data_styles = {}
+                for position, dtype in enumerate(chunk.dtypes):
+                    if position in date_positions:
+                        data_styles[position] = date_style
+                    elif pd.api.types.is_datetime64_any_dtype(dtype):
+                        data_styles[position] = datetime_style
+
+                if header:
+                    header_styles = {}
+                    for position, label in enumerate(labels):
+                        if label in params_by_column:
+                            header_styles[position] = sink.header_style(params_by_column[label])
+                            sink.set_row_height(row, params_by_column[label]['column_height'])
+                    # The header cells of a table hold its column names
+                    sink.write_row(row, startcol, _table_column_names(labels) if table else labels, header_styles)
+                    row += 1
+
+            chunk = _round_floats(chunk, float_format)
+            chunk = chunk.astype(object).where(chunk.notna(), na_rep)
+            for values in chunk.itertuples(index=False, name=None):
+                sink.write_row(row, startcol, values, data_styles)
+                row += 1
+
+        # The table range is known once every row is written
+        if table and data_styles is not None:
+            sink.add_table(f'{column_letter(startcol + 1)}{startrow + 1}:{column_letter(startcol + len(labels))}{row}', labels, header, sheet_name, table)
+
+        event['rows'] = row - startrow - (1 if header and data_styles is not None else 0)
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#---------------------------------------------------- Moteur natif (XML direct) ----------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+_SPREADSHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_OFFICE_RELS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PACKAGE_RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_CONTENT_TYPES = {
+    'workbook': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml',
+    'workbook_macro': 'application/vnd.ms-excel.sheet.macroEnabled.main+xml',
+    'worksheet': 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml',
+    'styles': 'application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml',
+    'sharedStrings': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml',
+    'table': 'application/vnd.openxmlformats-officedocument.spreadsheetml.table+xml',
+}
+
+# Day 0 of the 1900 date system (Excel counts the fictitious 29/02/1900, hence the 30th)
+_EXCEL_EPOCH = np.datetime64('1899-12-30T00:00:00', 'ns')
+_NS_PER_DAY = 86_400 * 10**9
+
+TIMEDELTA_FORMAT = '[h]:mm:ss'
+
+# Number of rows turned into XML at once, bounds the memory used by the native engine
+NATIVE_BLOCK_ROWS = 50_000
+
+# Characters forbidden in XML 1.0, escaped the way Excel does (_xHHHH_)
+_ILLEGAL_XML = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xml_text(value: str) -> str:
+    value = value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return _ILLEGAL_XML.sub(lambda match: f'_x{ord(match.group()):04X}_', value)
+
+
+def _xml_attribute(value: str) -> str:
+    return _xml_text(value).replace('"', '&quot;')
+
+
+def _xml_string(value: str) -> str:
+    # Leading or trailing spaces are dropped by Excel unless xml:space="preserve" is set
+    if value != value.strip():
+        return f'<t xml:space="preserve">{_xml_text(value)}</t>'
+    return f'<t>{_xml_text(value)}</t>'
+
+
+def _argb(color: str) -> str:
+    # Same convention as openpyxl: a 6 digits RGB color gets a '00' alpha channel
+    return f'00{color}'.upper() if len(color) == 6 else color.upper()
+
+
+class _SharedStrings:
+    """
+    Table des chaînes partagées (xl/sharedStrings.xml) : chaque chaîne distincte n'est écrite qu'une fois dans le fichier.
+
+    Les index commencent à base, ce qui permet de compléter la table d'un fichier existant.
+    """
+
+    def __init__(self, base: int = 0):
+        self.base = base
+        self.count = 0
+        self._ids = {}
+        self._strings = []
+
+    def __len__(self):
+        return len(self._strings)
+
+    def add(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = self.base + len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def cell_content(self, value: str) -> str:
+        # Type and value of a string cell, after its style attribute
+        return f' t="s"><v>{self.add(value)}</v>'
+
+    def elements(self) -> str:
+        return ''.join(f'<si>{_xml_string(value)}</si>' for value in self._strings)
+
+    def to_xml(self) -> bytes:
+        return (f'{_XML_DECLARATION}<sst xmlns="{_SPREADSHEET_NS}" count="{self.count}" uniqueCount="{len(self)}">'
+                f'{self.elements()}</sst>').encode('utf-8')
+
+
+class _InlineStrings:
+    """
+    Remplace la table des chaînes partagées quand une feuille est générée indépendamment du classeur (dans un autre processus) :
+    les chaînes sont écrites dans les cellules (t="inlineStr"), comme XlsxWriter en mode constant_memory.
+    Chaque chaîne distincte d'une colonne n'est toujours échappée qu'une fois.
+    """
+
+    count = 0
+
+    def cell_content(self, value: str) -> str:
+        return f' t="inlineStr"><is>{_xml_string(value)}</is>'
+
+
+class _NativeStyles:
+    """
+    Table des styles de cellule (xl/styles.xml) : chaque combinaison (format de nombre, police, remplissage, alignement)
+    n'est déclarée qu'une fois, quel que soit le nombre de cellules qui l'utilisent.
+
+    Les identifiants commencent après les éléments par défaut d'un nouveau classeur (xf 0, police 0, remplissages 0 et 1, formats 0 à 163).
+    Les bases peuvent être décalées pour compléter les styles d'un fichier existant.
+    """
+
+    def __init__(self, xf_base: int = 1, font_base: int = 1, fill_base: int = 2, number_format_base: int = 164):
+        self.xf_base = xf_base
+        self.font_base = font_base
+        self.fill_base = fill_base
+        self.number_format_base = number_format_base
+        self._xfs = {}
+
+    def add(self, number_format: str = None, font: tuple = None, fill: tuple = None, alignment: tuple = None) -> int:
+        """
+        Retourne l'identifiant (attribut s des cellules) du style, 0 pour le style par défaut.
+        font = (nom, taille, gras, couleur), fill = (type, couleur de début, couleur de fin), alignment = (horizontal, vertical, retour à la ligne)
+        """
+        spec = (number_format, font, fill, alignment)
+        if spec == (None, None, None, None):
+            return 0
+        xf = self._xfs.get(spec)
+        if xf is None:
+            xf = self._xfs[spec] = self.xf_base + len(self._xfs)
+        return xf
+
+    def header(self, header_params: dict) -> int:
+        return self.add(font=(header_params['font_name'], header_params['font_size'], header_params['bold'], header_params['font_color']),
+                        fill=(header_params['fill_type'], header_params['start_color'], header_params['end_color']),
+                        alignment=(header_params['h_align'], header_params['v_align'], header_params['wrap']))
+
+    def elements(self) -> dict:
+        """
+        Retourne les éléments XML propres à cette table, par collection : {'numFmts': [...], 'fonts': [...], 'fills': [...], 'cellXfs': [...]}
+        """
+        number_formats, fonts, fills = {}, {}, {}
+        parts = {'numFmts': [], 'fonts': [], 'fills': [], 'cellXfs': []}
+
+        for number_format, font, fill, alignment in self._xfs:
+            attributes = ''
+
+            number_format_id = 0
+            if number_format is not None:
+                number_format_id = BUILTIN_FORMATS_REVERSE.get(number_format)
+                if number_format_id is None:
+                    if number_format not in number_formats:
+                        number_formats[number_format] = self.number_format_base + len(number_formats)
+                        parts['numFmts'].append(f'<numFmt numFmtId="{number_formats[number_format]}" formatCode="{_xml_attribute(number_format)}"/>')
+                    number_format_id = number_formats[number_format]
+                attributes += ' applyNumberFormat="1"'
+
+            font_id = 0
+            if font is not None:
+                if font not in fonts:
+                    fonts[font] = self.font_base + len(fonts)
+                    name, size, bold, color = font
+                    parts['fonts'].append(f'<font>{"<b/>" if bold else ""}<sz val="{size}"/><color rgb="{_argb(color)}"/>'
+                                          f'<name val="{_xml_attribute(name)}"/></font>')
+                font_id = fonts[font]
+                attributes += ' applyFont="1"'
+
+            fill_id = 0
+            if fill is not None:
+                if fill not in fills:
+                    fills[fill] = self.fill_base + len(fills)
+                    fill_type, start_color, end_color = fill
+                    parts['fills'].append(f'<fill><patternFill patternType="{fill_type}"><fgColor rgb="{_argb(start_color)}"/>'
+                                          f'<bgColor rgb="{_argb(end_color)}"/></patternFill></fill>')
+                fill_id = fills[fill]
+                attributes += ' applyFill="1"'
+
+            alignment_xml = ''
+            if alignment is not None:
+                horizontal, vertical, wrap = alignment
+                alignment_attributes = ''.join(f' {name}="{value}"' for name, value in
+                                               (('horizontal', horizontal), ('vertical', vertical), ('wrapText', 1 if wrap else None)) if value)
+                alignment_xml = f'<alignment{alignment_attributes}/>'
+                attributes += ' applyAlignment="1"'
+
+            parts['cellXfs'].append(f'<xf numFmtId="{number_format_id}" fontId="{font_id}" fillId="{fill_id}" borderId="0" xfId="0"{attributes}>'
+                                    f'{alignment_xml}</xf>' if alignment_xml else
+                                    f'<xf numFmtId="{number_format_id}" fontId="{font_id}" fillId="{fill_id}" borderId="0" xfId="0"{attributes}/>')
+
+        return parts
+
+    def to_xml(self) -> bytes:
+        parts = self.elements()
+        number_formats = f'<numFmts count="{len(parts["numFmts"])}">{"".join(parts["numFmts"])}</numFmts>' if parts['numFmts'] else ''
+        return (f'{_XML_DECLARATION}<styleSheet xmlns="{_SPREADSHEET_NS}">{number_formats}'
+                f'<fonts count="{1 + len(parts["fonts"])}"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font>{"".join(parts["fonts"])}</fonts>'
+                f'<fills count="{2 + len(parts["fills"])}"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>'
+                f'{"".join(parts["fills"])}</fills>'
+                '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+                '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+                f'<cellXfs count="{1 + len(parts["cellXfs"])}"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>{"".join(parts["cellXfs"])}</cellXfs>'
+                '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+                '</styleSheet>').encode('utf-8')
+
+
+def _style_attribute(style: int) -> str:
+    return f' s="{style}"' if style else ''
+
+
+def _native_serials(values: np.ndarray) -> np.ndarray:
+    """
+    Numéros de série Excel de dates datetime64[ns]. Comme openpyxl, les dates avant le 01/03/1900 ne comptent pas le 29/02/1900 fictif.
+    """
+    serials = (values - _EXCEL_EPOCH).astype(np.int64) / _NS_PER_DAY
+    return np.where((serials >= 1) & (serials < 61), serials - 1, serials)
+
+
+def _native_value_tail(value, strings: Union[_SharedStrings, _InlineStrings], style: int, date_style: int, datetime_style: int) -> str:
+    """
+    Fin du XML d'une cellule (tout ce qui suit la référence r="A1") pour une valeur Python isolée.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return f'"{_style_attribute(style)} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, np.number)) and np.isfinite(value):
+        # NumPy scalars are converted first, their repr is not a plain number
+        number = repr(float(value)) if isinstance(value, (float, np.floating)) else int(value)
+        return f'"{_style_attribute(style)}><v>{number}</v></c>'
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        # Dates without time get the date format, timestamps the datetime format, unless the column has its own style
+        style = style or (datetime_style if isinstance(value, datetime.datetime) else date_style)
+        serial = float(_native_serials(pd.Timestamp(value).tz_localize(None).to_datetime64().astype('datetime64[ns]')))
+        return f'"{_style_attribute(style)}><v>{serial!r}</v></c>'
+
+    return f'"{_style_attribute(style)}{strings.cell_content(value if isinstance(value, str) else str(value))}</c>'
+
+
+def _native_tails(column: pd.Series, strings: Union[_SharedStrings, _InlineStrings], style: int, date_style: int, datetime_style: int) -> tuple:
+    """
+    Convertit une colonne entière en fins de cellules XML, par opérations vectorisées selon son type.
+
+    Returns
+    -------
+    tuple
+        (tails, missing) : tableau (objet) des fins de cellules et masque des valeurs manquantes
+    """
+    dtype = column.dtype
+    missing = column.isna().to_numpy()
+    style_attribute = _style_attribute(style)
+
+    if pd.api.types.is_bool_dtype(dtype):
+        values = column.to_numpy(dtype=bool, na_value=False)
+        tails = np.where(values, f'"{style_attribute} t="b"><v>1</v></c>', f'"{style_attribute} t="b"><v>0</v></c>').astype(object)
+
+    elif pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+        values = column.to_numpy(dtype=getattr(dtype, 'numpy_dtype', dtype), na_value=0) if isinstance(dtype, pd.api.extensions.ExtensionDtype) else column.to_numpy()
+        # NumPy formats the whole column at once, with the shortest repr of each float
+        tails = f'"{style_attribute}><v>' + values.astype(str).astype(object) + '</v></c>'
+        if values.dtype.kind == 'f':
+            infinite = np.isinf(values)
+            if infinite.any():
+                # Written as text, like df.to_excel (inf_rep='inf')
+                tails[infinite] = np.where(values[infinite] > 0, _native_value_tail('inf', strings, style, 0, 0), _native_value_tail('-inf', strings, style, 0, 0))
+
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        if getattr(dtype, 'tz', None) is not None:
+            column = column.dt.tz_localize(None)
+        values = column.to_numpy(dtype='datetime64[ns]')
+        serials = _native_serials(values)
+        tails = f'"{_style_attribute(style or datetime_style)}><v>' + serials.astype(str).astype(object) + '</v></c>'
+
+    elif pd.api.types.is_timedelta64_dtype(dtype):
+        days = column.to_numpy(dtype='timedelta64[ns]').astype(np.int64) / _NS_PER_DAY
+        tails = f'"{style_attribute}><v>' + days.astype(str).astype(object) + '</v></c>'
+
+    else:
+        # Strings and mixed columns: each distinct value is converted only once, then spread with the codes
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes, uniques = column.cat.codes.to_numpy(), column.cat.categories
+        else:
+            codes, uniques = pd.factorize(column, use_na_sentinel=True)
+        table = np.array([_native_value_tail(value, strings, style, date_style, datetime_style) for value in uniques] + [''], dtype=object)
+        tails = table[codes]
+        is_string = np.array([' t="s">' in tail for tail in table], dtype=bool)
+        strings.count += int(np.count_nonzero(is_string[codes]))
+
+    return tails, missing
+
+
+def _register_native_styles(styles: _NativeStyles, header_format: bool = False, headers_list: list = None) -> tuple:
+    """
+    Déclare, toujours dans le même ordre, tous les styles qu'une feuille peut utiliser.
+    Une copie de styles ainsi complétée donne donc les mêmes identifiants dans un autre processus.
+
+    Returns
+    -------
+    tuple
+        (style date, style date et heure, style durée)
+    """
+    formats = tuple(styles.add(number_format=number_format) for number_format in (DATE_FORMAT, DATETIME_FORMAT, TIMEDELTA_FORMAT))
+    if header_format:
+        for _, header_params in headers_list or []:
+            styles.header(header_params)
+    return formats
+
+
+def _native_sheet(df: Union[pd.DataFrame, Iterable[pd.DataFrame]], strings: Union[_SharedStrings, _InlineStrings], styles: _NativeStyles, na_rep: str = 'NaN',
+                  columns: Union[str, list] = None, header: bool = True, index: bool = True, point: tuple = ('A', 1), float_format: str = '%.2f',
+                  date_format: bool = False, date_cols: list = None, header_format: bool = False, headers_list: list = None,
+                  auto_width: bool = False, table: Union[bool, str, dict] = None, tables: list = None) -> Iterator[bytes]:
+    """
+    Génère, bloc par bloc, le XML d'une feuille (xl/worksheets/sheetN.xml) à partir d'un DataFrame ou d'un itérateur de DataFrames.
+
+    Chaque colonne est convertie en une fois (nombres et dates en bloc, chaînes dédoublonnées par pd.factorize),
+    puis les cellules d'un bloc de lignes sont assemblées par une seule jointure.
+    Les chaînes sont ajoutées à strings et les styles à styles, qui sont écrits une fois toutes les feuilles générées.
+    Le tableau Excel demandé par table est ajouté à tables (plage, noms des colonnes, en-tête, options), que le classeur écrit ensuite.
+    """
+    startcol, startrow = get_coord(point[0], point[1])
+
+    params_by_column = _headers_params_by_column(headers_list) if header_format else {}
+    date_positions = {get_index(letter) - startcol for letter in (date_cols or [])} if date_format else set()
+    date_style, datetime_style, timedelta_style = _register_native_styles(styles, header_format, headers_list)
+    na_tail = _native_value_tail(na_rep, strings, 0, 0, 0) if na_rep != '' else None
+
+    # The dimension (used range) is known upfront only for a DataFrame
+    dimension = ''
+    if isinstance(df, pd.DataFrame):
+        width = (len(df.columns) if columns is None else len([columns] if isinstance(columns, str) else columns)) + (df.index.nlevels if index else 0)
+        height = len(df) + (1 if header else 0)
+        if width and height:
+            dimension = f'<dimension ref="{column_letter(startcol + 1)}{startrow + 1}:{column_letter(startcol + width)}{startrow + height}"/>'
+
+    chunks = _iter_chunks(df, NATIVE_BLOCK_ROWS)
+    cols = ''
+    if auto_width:
+        # The <cols> element precedes the rows: an iterator is measured on its first chunk, put back in front
+        measured = df
+        if not isinstance(df, pd.DataFrame):
+            measured = next(chunks, None)
+            chunks = itertools.chain([] if measured is None else [measured], chunks)
+        if measured is not None:
+            widths = column_widths(measured, columns, header, index, point, na_rep, float_format, date_format, date_cols, header_format, headers_list)
+            cols = '<cols>' + ''.join(f'<col min="{column_index(letter)}" max="{column_index(letter)}" width="{width}" customWidth="1"/>'
+                                      for letter, width in widths.items()) + '</cols>'
+
+    yield (f'{_XML_DECLARATION}<worksheet xmlns="{_SPREADSHEET_NS}" xmlns:r="{_OFFICE_RELS_NS}">{dimension}'
+           f'<sheetViews><sheetView workbookViewId="0"/></sheetViews><sheetFormatPr defaultRowHeight="15"/>{cols}<sheetData>').encode('utf-8')
+
+    row = startrow
+    column_styles = None
+
+    for chunk in chunks:
+        if columns is not None:
+            chunk = chunk[[columns] if isinstance(columns, str) else columns]
+        labels = list(chunk.columns)
+        if index:
+            labels = list(chunk.index.names) + labels
+            chunk = chunk.reset_index(allow_duplicates=True)
+
+        letters = [f'<c r="{column_letter(startcol + position + 1)}' for position in range(len(labels))]
+
+        # Header and per-column styles are resolved once, from the first chunk
+        if column_styles is None:
+            table_labels = labels
+            column_styles = []
+            for position, dtype in enumerate(chunk.dtypes):
+                if position in date_positions:
+                    column_styles.append(date_style)
+                elif pd.api.types.is_timedelta64_dtype(dtype):
+                    column_styles.append(timedelta_style)
+                else:
+                    column_styles.append(0)
+
+            if header:
+                cells, height = [], None
+                # The header cells of a table hold its column names
+                for position, label in enumerate(_table_column_names(labels) if table and tables is not None else labels):
+                    if label is None:
+                        continue
+                    style = 0
+                    if labels[position] in params_by_column:
+                        style = styles.header(params_by_column[labels[position]])
+                        height = params_by_column[labels[position]]['column_height']
+                    cells.append(letters[position] + str(row + 1) + _native_value_tail(label, strings, style, date_style, datetime_style))
+                    strings.count += isinstance(label, str)
+                row_attributes = f' ht="{height}" customHeight="1"' if height is not None else ''
+                yield f'<row r="{row + 1}"{row_attributes}>{"".join(cells)}</row>'.encode('utf-8')
+                row += 1
+
+        if chunk.empty:
+            continue
+
+        chunk = _round_floats(chunk, float_format)
+        rows_text = np.arange(row + 1, row + len(chunk) + 1).astype(str).astype(object)
+
+        grid = np.empty((len(chunk), len(labels) + 2), dtype=object)
+        grid[:, 0] = '<row r="' + rows_text + '">'
+        grid[:, -1] = '</row>'
+        for position in range(len(labels)):
+            tails, missing = _native_tails(chunk.iloc[:, position], strings, column_styles[position], date_style, datetime_style)
+            cells = letters[position] + rows_text + tails
+            if missing.any():
+                # Missing values are left out of the sheet when na_rep is empty, as with df.to_excel
+                if na_tail is None:
+                    cells[missing] = ''
+                else:
+                    cells[missing] = letters[position] + rows_text[missing] + na_tail
+                    strings.count += int(missing.sum())
+            grid[:, position + 1] = cells
+
+        yield ''.join(grid.ravel().tolist()).encode('utf-8')
+        row += len(chunk)
+
+    table_parts = ''
+    if table and tables is not None and column_styles is not None:
+        # A table has at least one data row, its part is the only relationship of the sheet
+        ref = f'{column_letter(startcol + 1)}{startrow + 1}:{column_letter(startcol + len(table_labels))}{max(row, startrow + 2 if header else startrow + 1)}'
+        tables.append((ref, _table_column_names(table_labels), header, _table_options(table)))
+        table_parts = '<tableParts count="1"><tablePart r:id="rId1"/></tableParts>'
+
+    yield f'</sheetData>{table_parts}</worksheet>'.encode('utf-8')
+
+
+def _native_table_xml(table_id: int, name: str, ref: str, names: list, header: bool, options: dict) -> bytes:
+    """
+    XML d'un tableau Excel (xl/tables/tableN.xml).
+    """
+    autofilter = f'<autoFilter ref="{ref}"/>' if options['autofilter'] and header else ''
+    style = ''
+    if options['style'] is not None:
+        style = (f'<tableStyleInfo name="{_xml_attribute(options["style"])}" showFirstColumn="{int(options["first_column"])}" '
+                 f'showLastColumn="{int(options["last_column"])}" showRowStripes="{int(options["banded_rows"])}" '
+                 f'showColumnStripes="{int(options["banded_columns"])}"/>')
+    header_count = '' if header else ' headerRowCount="0"'
+    return (f'{_XML_DECLARATION}<table xmlns="{_SPREADSHEET_NS}" id="{table_id}" name="{_xml_attribute(name)}" displayName="{_xml_attribute(name)}" '
+            f'ref="{ref}"{header_count}>{autofilter}<tableColumns count="{len(names)}">'
+            + ''.join(f'<tableColumn id="{position}" name="{_xml_attribute(column)}"/>' for position, column in enumerate(names, 1))
+            + f'</tableColumns>{style}</table>').encode('utf-8')
+
+
+# Raw copies rebuild the local header with zipfile internals, checked on Python 3.8 to 3.13 (see tests/test_native_package.py)
+_RAW_ZIP_COPY = (3, 8) <= sys.version_info < (3, 14) and hasattr(zipfile, '_FH_FILENAME_LENGTH') and hasattr(zipfile, '_FH_EXTRA_FIELD_LENGTH')
+
+
+def _copy_zip_member(source: zipfile.ZipFile, destination: zipfile.ZipFile, info: zipfile.ZipInfo, name: str = None):
+    """
+    Recopie un membre d'une archive zip dans une autre (sous le nom name s'il est donné), octet pour octet, sans le décompresser ni le recompresser.
+    
+    zipfile n'a pas d'API publique pour une copie brute : elle n'est faite que sur les versions de Python vérifiées (_RAW_ZIP_COPY),
+    sinon le membre est décompressé et recompressé avec ZipFile.open.
+    """
+    target = copy(info)
+    if name is not None:
+        target.filename = target.orig_filename = name
+    
+    if not _RAW_ZIP_COPY:
+        target.extra = b''
+        with source.open(info) as reader, destination.open(target, 'w') as writer:
+            shutil.copyfileobj(reader, writer, 1 << 20)
+        return
+    
+    # The local header is rebuilt from the central directory entry
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, source.fp.read(zipfile.sizeFileHeader))
+    source.fp.seek(header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+    
+    # Sizes and CRC are known, so neither a trailing data descriptor nor the original extra fields are needed
+    target.flag_bits &= ~0x08
+    target.extra = b''
+    target.header_offset = destination.fp.tell()
+    destination.fp.write(target.FileHeader())
+    
+    remaining = info.compress_size
+    while remaining:
+        block = source.fp.read(min(remaining, 1 << 20))
+        destination.fp.write(block)
+        remaining -= len(block)
+    
+    destination.filelist.append(target)
+    destination.NameToInfo[target.filename] = target
+    destination.start_dir = destination.fp.tell()
+    destination._didModify = True
+
+
+def _xml_prefix(xml: str, tag: str) -> str:
+    """
+    Retourne le préfixe d'espace de noms ('x:' ou '') utilisé par la balise tag dans xml.
+    """
+    match = re.search(rf'<(\w+:)?{tag}\b', xml)
+    return match.group(1) or '' if match else ''
+
+
+def _prefixed(xml: str, prefix: str) -> str:
+    # Our fragments are written in the default namespace, a prefixed part needs the same prefix on every tag
+    return re.sub(r'<(/?)(?=[A-Za-z])', rf'<\1{prefix}', xml) if prefix else xml
+
+
+def _splice_collection(xml: str, tag: str, elements: list, count: int, after: str = None) -> str:
+    """
+    Ajoute elements à la fin de la collection tag (cellXfs, fonts, ...) de xml et met à jour son attribut count.
+    Si la collection n'existe pas, elle est créée juste après la balise ouvrante after.
+    """
+    if not elements:
+        return xml
+
+    prefix = _xml_prefix(xml, after or tag)
+    content = _prefixed(''.join(elements), prefix)
+    opening = re.search(rf'<{prefix}{tag}\b([^>]*?)(/?)>', xml)
+
+    if opening is None:
+        parent = re.search(rf'<{prefix}{after}\b[^>]*>', xml)
+        return f'{xml[:parent.end()]}<{prefix}{tag} count="{count}">{content}</{prefix}{tag}>{xml[parent.end():]}'
+
+    attributes = re.sub(r'\scount="\d+"', '', opening.group(1))
+    if opening.group(2):
+        return f'{xml[:opening.start()]}<{prefix}{tag}{attributes} count="{count}">{content}</{prefix}{tag}>{xml[opening.end():]}'
+
+    closing = xml.index(f'</{prefix}{tag}>', opening.end())
+    return f'{xml[:opening.start()]}<{prefix}{tag}{attributes} count="{count}">{xml[opening.end():closing]}{content}{xml[closing:]}'
+
+
+def _insert_before_closing(xml: str, tag: str, element: str) -> str:
+    prefix = _xml_prefix(xml, tag)
+    closing = xml.rindex(f'</{prefix}{tag}>')
+    return xml[:closing] + _prefixed(element, prefix) + xml[closing:]
+
+
+def _part_path(base: str, target: str) -> str:
+    # Relationship targets are relative to the folder of the source part, unless they start with '/'
+    return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(posixpath.dirname(base), target))
+
+
+def _rels_path(part: str) -> str:
+    return posixpath.join(posixpath.dirname(part), '_rels', f'{posixpath.basename(part)}.rels')
+
+
+def _read_workbook_part(source: zipfile.ZipFile) -> dict:
+    """
+    Lit la partie classeur d'une archive et ses relations, trouvées par les relations du paquet comme le fait Excel.
+    
+    Returns
+    -------
+    dict
+        - workbook_path, workbook_rels_path : chemins de xl/workbook.xml et de ses relations dans l'archive
+        - workbook_xml, workbook_rels : leur contenu
+        - relationships : {Id: attributs de la relation}
+        - rels_prefix : préfixe de l'espace de noms des relations dans workbook_xml
+        - sheets : {nom_feuille: (chemin du XML de la feuille, sheetId)}
+    """
+    package_rels = source.read('_rels/.rels').decode('utf-8')
+    target = re.search(r'<(?:\w+:)?Relationship\b[^>]*?Type="[^"]*/officeDocument"[^>]*>', package_rels).group()
+    workbook_path = _part_path('', re.search(r'\bTarget="([^"]*)"', target).group(1))
+    workbook_rels_path = _rels_path(workbook_path)
+    workbook_xml = source.read(workbook_path).decode('utf-8')
+    workbook_rels = source.read(workbook_rels_path).decode('utf-8')
+    
+    relationships = {}
+    for relationship in re.finditer(r'<(?:\w+:)?Relationship\b[^>]*>', workbook_rels):
+        attributes = dict(re.findall(r'(\w+)="([^"]*)"', relationship.group()))
+        relationships[attributes['Id']] = attributes
+    
+    rels_prefix = re.search(rf'xmlns:(\w+)="{_OFFICE_RELS_NS}"', workbook_xml).group(1)
+    sheets = {}
+    for sheet in re.finditer(r'<(?:\w+:)?sheet\b[^>]*>', workbook_xml):
+        attributes = dict(re.findall(r'([\w:]+)="([^"]*)"', sheet.group()))
+        name = unescape(attributes['name'], {'&quot;': '"', '&apos;': "'"})
+        sheets[name] = (_part_path(workbook_path, relationships[attributes[f'{rels_prefix}:id']]['Target']), int(attributes['sheetId']))
+    
+    return {'workbook_path': workbook_path, 'workbook_rels_path': workbook_rels_path, 'workbook_xml': workbook_xml,
+            'workbook_rels': workbook_rels, 'relationships': relationships, 'rels_prefix': rels_prefix, 'sheets': sheets}
+
+
+_ROW_PATTERN = re.compile(r'<(?:\w+:)?row\b([^>]*?)(?:/>|>(.*?)</(?:\w+:)?row>)', re.S)
+_CELL_PATTERN = re.compile(r'<(?:\w+:)?c\b[^>]*?\br="([A-Z]+)\d+"[^>]*?(?:/>|>.*?</(?:\w+:)?c>)', re.S)
+_ROW_NUMBER_PATTERN = re.compile(r'\br="(\d+)"')
+_SHEET_DATA_PATTERN = re.compile(r'<(\w+:)?sheetData\b[^>]*?(?:/>|>(.*?)</(?:\w+:)?sheetData>)', re.S)
+_SHEET_DATA_OPENING_PATTERN = re.compile(r'<(\w+:)?sheetData\b[^>]*?(/?)>')
+_DIMENSION_PATTERN = re.compile(r'(<(?:\w+:)?dimension\b[^>]*?\bref=")([^"]*)(")')
+
+
+def _overlay_sheet(existing: str, new: str) -> str:
+    """
+    Superpose les lignes du XML de feuille new à celles de la feuille existing, comme if_sheet_exists='overlay' :
+    les cellules écrites remplacent celles qui existent, les autres cellules de la feuille sont conservées telles quelles.
+    """
+    # The sheet data is delimited by its tags, a lazy match over a large sheet is slow
+    opening = _SHEET_DATA_OPENING_PATTERN.search(existing)
+    prefix = opening.group(1) or ''
+    closing = opening.end() if opening.group(2) else existing.rindex(f'</{prefix}sheetData>')
+    new_data = _SHEET_DATA_PATTERN.search(new)
+    new_rows = {int(_ROW_NUMBER_PATTERN.search(match.group(1)).group(1)): match
+                for match in _ROW_PATTERN.finditer(_prefixed(new_data.group(2) or '', prefix))}
+    pending = sorted(new_rows)
+
+    # Rows written below the existing ones follow them, the existing rows are then not parsed
+    data = existing[opening.end():closing]
+    start = data.rfind(f'<{prefix}row')
+    last = _ROW_PATTERN.match(data, start) if start >= 0 else None
+    last_number = _ROW_NUMBER_PATTERN.search(last.group(1)) if last else None
+    below = start < 0 or (last_number is not None and (not pending or pending[0] > int(last_number.group(1))))
+
+    pieces, position = ([data] if below else []), 0
+    for match in _ROW_PATTERN.finditer('' if below else data):
+        number = int(_ROW_NUMBER_PATTERN.search(match.group(1)).group(1))
+        while position < len(pending) and pending[position] < number:
+            pieces.append(new_rows[pending[position]].group())
+            position += 1
+
+        if position < len(pending) and pending[position] == number:
+            # Cells are merged by column, the written ones win
+            cells = {column_index(cell.group(1)): cell.group() for cell in _CELL_PATTERN.finditer(match.group(2) or '')}
+            replacement = new_rows[number]
+            cells.update({column_index(cell.group(1)): cell.group() for cell in _CELL_PATTERN.finditer(replacement.group(2) or '')})
+            attributes = replacement.group(1) if 'customHeight' in replacement.group(1) else match.group(1)
+            # The spans hint would no longer match the cells of the row
+            attributes = re.sub(r'\sspans="[^"]*"', '', attributes)
+            pieces.append(f'<{prefix}row{attributes}>{"".join(cells[col] for col in sorted(cells))}</{prefix}row>')
+            position += 1
+        else:
+            pieces.append(match.group())
+
+    pieces.extend(new_rows[number].group() for number in pending[position:])
+    end = closing if opening.group(2) else closing + len(f'</{prefix}sheetData>')
+    merged = f'{existing[:opening.start()]}<{prefix}sheetData>{"".join(pieces)}</{prefix}sheetData>{existing[end:]}'
+
+    # The used range becomes the union of both ranges
+    old_range = _DIMENSION_PATTERN.search(existing)
+    new_range = _DIMENSION_PATTERN.search(new)
+    if old_range and new_range:
+        old_bounds, new_bounds = parse_range(old_range.group(2)), parse_range(new_range.group(2))
+        min_col, min_row = min(old_bounds[0], new_bounds[0]), min(old_bounds[1], new_bounds[1])
+        max_col, max_row = max(old_bounds[2], new_bounds[2]), max(old_bounds[3], new_bounds[3])
+        merged = _DIMENSION_PATTERN.sub(lambda match: f'{match.group(1)}{column_letter(min_col)}{min_row}:{column_letter(max_col)}{max_row}{match.group(3)}',
+                                        merged, count=1)
+
+    return merged
+
+
+class _NativePackage:
+    """
+    Partie commune aux classeurs écrits par le moteur natif : ajout des feuilles, à partir des blocs XML générés par "_native_sheet"
+    ou d'un membre d'une autre archive zip (feuille générée dans un autre processus).
+
+    Les sous-classes définissent _sheet_part(sheet_name, if_sheet_exists), qui retourne le chemin de la feuille dans l'archive
+    et le XML de la feuille existante si elle doit être superposée (None sinon), _add_table_part(part), ainsi que close et _abort.
+    Elles initialisent tables (tableaux en attente, ajoutés par "_native_sheet"), table_names et table_ids (déjà utilisés dans le classeur).
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None and not _cancelled():
+            with _phase('save', file=self.file) as event:
+                self.close()
+                event['bytes'] = _file_size(self.file)
+        else:
+            self._abort()
+            _check_cancelled()
+
+    def write_sheet(self, sheet_name: str, blocks: Iterable[bytes], if_sheet_exists: str = 'error'):
+        """
+        Écrit une feuille à partir des blocs XML générés par "_native_sheet".
+
+        if_sheet_exists : {'error', 'new', 'replace', 'overlay'}, comportement si la feuille existe déjà (voir "save_df_on_excel")
+        """
+        part, existing = self._sheet_part(sheet_name, if_sheet_exists)
+        if existing is not None:
+            blocks = [_overlay_sheet(existing, b''.join(blocks).decode('utf-8')).encode('utf-8')]
+            if self.tables:
+                # Only the rows are merged into the existing sheet
+                _report(f"Le tableau Excel n'est pas ajouté à la feuille superposée {sheet_name}", error=False)
+                self.tables.clear()
+
+        with self.archive.open(part, 'w', force_zip64=True) as stream:
+            for block in blocks:
+                stream.write(block)
+
+        if self.tables:
+            self._write_tables(part, sheet_name)
+
+    def _write_tables(self, part: str, sheet_name: str):
+        """
+        Écrit les tableaux de la feuille part (xl/tables/tableN.xml) et les relations de la feuille vers eux.
+        """
+        relationships = []
+        for position, (ref, names, header, options) in enumerate(self.tables, 1):
+            table_id = max(self.table_ids, default=0) + 1
+            self.table_ids.add(table_id)
+            name = options['name'] or _table_name(sheet_name, self.table_names)
+            self.table_names.add(name.lower())
+
+            table_part = f'xl/tables/table{table_id}.xml'
+            self.archive.writestr(table_part, _native_table_xml(table_id, name, ref, names, header, options))
+            self._add_table_part(table_part)
+            relationships.append(f'<Relationship Id="rId{position}" Type="{_OFFICE_RELS_NS}/table" '
+                                 f'Target="{posixpath.relpath(table_part, posixpath.dirname(part))}"/>')
+
+        self.archive.writestr(_rels_path(part), f'{_XML_DECLARATION}<Relationships xmlns="{_PACKAGE_RELS_NS}">{"".join(relationships)}</Relationships>')
+        self.tables.clear()
+
+    def write_sheet_member(self, sheet_name: str, source: zipfile.ZipFile, info: zipfile.ZipInfo, if_sheet_exists: str = 'error'):
+        """
+        Écrit une feuille déjà compressée dans l'archive source, sans la décompresser (sauf pour la superposer à une feuille existante).
+        """
+        part, existing = self._sheet_part(sheet_name, if_sheet_exists)
+        if existing is None:
+            _copy_zip_member(source, self.archive, info, part)
+        else:
+            self.archive.writestr(part, _overlay_sheet(existing, source.read(info).decode('utf-8')).encode('utf-8'))
+            if self.tables:
+                _report(f"Le tableau Excel n'est pas ajouté à la feuille superposée {sheet_name}", error=False)
+                self.tables.clear()
+
+        if self.tables:
+            self._write_tables(part, sheet_name)
+
+
+class _NativeWorkbookWriter(_NativePackage):
+    """
+    Écrit un classeur Excel directement dans l'archive zip, sans passer par openpyxl ni XlsxWriter.
+
+    Les feuilles sont compressées au fil de l'eau, la table des chaînes partagées et la table des styles sont écrites à la fermeture.
+    """
+
+    def __init__(self, file, compression: int = None):
+        self.file = file
+        self.compression = compression
+        method, level = _zip_settings(compression)
+        self.archive = zipfile.ZipFile(file, 'w', method, compresslevel=level)
+        self.strings = _SharedStrings()
+        self.styles = _NativeStyles()
+        self.sheet_names = []
+        self.tables, self.table_names, self.table_ids = [], set(), set()
+
+    def _abort(self):
+        self.archive.close()
+        # Without its workbook part the archive is not a valid file, it is not left behind
+        if _is_path(self.file):
+            os.remove(self.file)
+
+    def _sheet_part(self, sheet_name: str, if_sheet_exists: str) -> tuple:
+        # A new workbook has no sheet to overlay or replace, a second sheet with the same name is an error
+        if sheet_name in self.sheet_names:
+            raise ValueError(f"La feuille {sheet_name} existe déjà dans le classeur")
+        self.sheet_names.append(sheet_name)
+        return f'xl/worksheets/sheet{len(self.sheet_names)}.xml', None
+
+    def _add_table_part(self, part: str):
+        # Declared in [Content_Types].xml at closing
+        pass
+
+    def close(self):
+        sheets = range(1, len(self.sheet_names) + 1)
+        workbook_type = _CONTENT_TYPES['workbook_macro' if str(self.file).endswith('.xlsm') else 'workbook']
+
+        self.archive.writestr('[Content_Types].xml', (
+            f'{_XML_DECLARATION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{workbook_type}"/>'
+            + ''.join(f'<Override PartName="/xl/worksheets/sheet{sheet}.xml" ContentType="{_CONTENT_TYPES["worksheet"]}"/>' for sheet in sheets)
+            + ''.join(f'<Override PartName="/xl/tables/table{table_id}.xml" ContentType="{_CONTENT_TYPES["table"]}"/>' for table_id in sorted(self.table_ids))
+            + f'<Override PartName="/xl/styles.xml" ContentType="{_CONTENT_TYPES["styles"]}"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" ContentType="{_CONTENT_TYPES["sharedStrings"]}"/></Types>'))
+
+        self.archive.writestr('_rels/.rels', (
+            f'{_XML_DECLARATION}<Relationships xmlns="{_PACKAGE_RELS_NS}">'
+            f'<Relationship Id="rId1" Type="{_OFFICE_RELS_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'))
+
+        self.archive.writestr('xl/workbook.xml', (
+            f'{_XML_DECLARATION}<workbook xmlns="{_SPREADSHEET_NS}" xmlns:r="{_OFFICE_RELS_NS}">'
+            '<bookViews><workbookView/></bookViews><sheets>'
+            + ''.join(f'<sheet name="{_xml_attribute(name)}" sheetId="{sheet}" r:id="rId{sheet}"/>' for sheet, name in zip(sheets, self.sheet_names))
+            + '</sheets></workbook>'))
+
+        self.archive.writestr('xl/_rels/workbook.xml.rels', (
+            f'{_XML_DECLARATION}<Relationships xmlns="{_PACKAGE_RELS_NS}">'
+            + ''.join(f'<Relationship Id="rId{sheet}" Type="{_OFFICE_RELS_NS}/worksheet" Target="worksheets/sheet{sheet}.xml"/>' for sheet in sheets)
+            + f'<Relationship Id="rId{len(sheets) + 1}" Type="{_OFFICE_RELS_NS}/styles" Target="styles.xml"/>'
+            f'<Relationship Id="rId{len(sheets) + 2}" Type="{_OFFICE_RELS_NS}/sharedStrings" Target="sharedStrings.xml"/></Relationships>'))
+
+        self.archive.writestr('xl/styles.xml', self.styles.to_xml())
+        self.archive.writestr('xl/sharedStrings.xml', self.strings.to_xml())
+        self.archive.close()
+
+
+class _NativeWorkbookAppender(_NativePackage):
+    """
+    Ajoute ou remplace des feuilles d'un classeur Excel existant sans charger le classeur.
+
+    Seuls le XML des feuilles écrites, la table des chaînes partagées, la table des styles, le classeur et ses relations sont réécrits.
+    Les autres membres de l'archive (autres feuilles, images, graphiques, ...) sont recopiés octet pour octet, sans être analysés.
+    Le fichier est écrit à côté de l'original puis le remplace à la fermeture. Un objet fichier est réécrit à la fermeture
+    à partir d'un fichier temporaire.
+    """
+
+    def __init__(self, file, compression: int = None, template: 'ExcelTemplate' = None):
+        self.file = file
+        self.compression = compression
+        # The parts of a template were read once, only its zip directory is read again and the parsed parts are copied
+        self.source = zipfile.ZipFile(file if template is None else io.BytesIO(template.content))
+        if template is None:
+            self._read_package()
+        else:
+            self.__dict__.update(deepcopy(template.package))
+        if _is_path(file):
+            self.temporary = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(file)), suffix='.xlsx', delete=False)
+        else:
+            self.temporary = tempfile.TemporaryFile()
+        method, level = _zip_settings(compression)
+        self.archive = zipfile.ZipFile(self.temporary, 'w', method, compresslevel=level)
+        self.rewritten = set()
+        self.new_sheets = []
+
+    @classmethod
+    def _read_template(cls, content: bytes) -> dict:
+        """
+        Parties lues dans le classeur content (voir "_read_package"), réutilisées par chaque classeur écrit à partir du modèle.
+        """
+        reader = cls.__new__(cls)
+        reader.source = zipfile.ZipFile(io.BytesIO(content))
+        reader._read_package()
+        reader.source.close()
+        return {name: value for name, value in vars(reader).items() if name != 'source'}
+
+    def _read_package(self):
+        """
+        Lit le classeur, ses relations, les types de contenu, les styles, les chaînes partagées et les tableaux du fichier source.
+        """
+        # workbook_path, workbook_xml, relationships, sheets, ... (see "_read_workbook_part")
+        vars(self).update(_read_workbook_part(self.source))
+        self.content_types = self._read('[Content_Types].xml')
+
+        # Both tables continue the numbering of the existing file
+        self.styles_path = self._related_part('/styles')
+        self.styles_xml = self._read(self.styles_path)
+        counts = {tag: len(re.findall(rf'<(?:\w+:)?{element}\b', self._collection(tag)))
+                  for tag, element in (('cellXfs', 'xf'), ('fonts', 'font'), ('fills', 'fill'))}
+        number_format_ids = [int(number) for number in re.findall(r'numFmtId="(\d+)"', self._collection('numFmts'))]
+        self.number_format_count = len(number_format_ids)
+        self.styles = _NativeStyles(counts['cellXfs'], counts['fonts'], counts['fills'], max(number_format_ids + [163]) + 1)
+
+        self.strings_path = self._related_part('/sharedStrings')
+        self.strings_xml = self._read(self.strings_path) if self.strings_path else None
+        unique_count, self.strings_count = 0, 0
+        if self.strings_xml is not None:
+            head = re.search(r'<(?:\w+:)?sst\b[^>]*>', self.strings_xml).group()
+            unique = re.search(r'\buniqueCount="(\d+)"', head)
+            unique_count = int(unique.group(1)) if unique else len(re.findall(r'<(?:\w+:)?si\b', self.strings_xml))
+            total = re.search(r'\bcount="(\d+)"', head)
+            self.strings_count = int(total.group(1)) if total else unique_count
+        self.strings = _SharedStrings(base=unique_count)
+
+        # Table names and ids are unique in the whole workbook, table parts are small
+        self.tables, self.table_names, self.table_ids = [], set(), set()
+        for name in self.source.namelist():
+            if re.fullmatch(r'xl/tables/table\d+\.xml', name):
+                self.table_ids.add(int(re.search(r'(\d+)\.xml$', name).group(1)))
+                head = re.search(r'<(?:\w+:)?table\b[^>]*>', self._read(name))
+                if head:
+                    self.table_ids.update(int(number) for number in re.findall(r'\bid="(\d+)"', head.group()))
+                    self.table_names.update(unescape(found).lower() for found in re.findall(r'\b(?:name|displayName)="([^"]*)"', head.group()))
+
+    def _abort(self):
+        self.archive.close()
+        self.source.close()
+        self.temporary.close()
+        if _is_path(self.file):
+            os.remove(self.temporary.name)
+
+    def _read(self, name: str) -> str:
+        return self.source.read(name).decode('utf-8')
+
+    def _related_part(self, type_suffix: str) -> str:
+        for relationship in self.relationships.values():
+            if relationship['Type'].endswith(type_suffix):
+                return _part_path(self.workbook_path, relationship['Target'])
+        return None
+
+    def _collection(self, tag: str) -> str:
+        match = re.search(rf'<(?:\w+:)?{tag}\b[^>]*?(?:/>|>(.*?)</(?:\w+:)?{tag}>)', self.styles_xml, re.S)
+        return (match.group(1) or '') if match else ''
+
+    def _add_relationship(self, type_name: str, target: str) -> str:
+        numbers = [int(number) for number in re.findall(r'rId(\d+)', ' '.join(self.relationships))]
+        relationship_id = f'rId{max(numbers + [0]) + 1}'
+        self.relationships[relationship_id] = {'Id': relationship_id, 'Type': f'{_OFFICE_RELS_NS}/{type_name}', 'Target': target}
+        self.workbook_rels = _insert_before_closing(self.workbook_rels, 'Relationships',
+                                                    f'<Relationship Id="{relationship_id}" Type="{_OFFICE_RELS_NS}/{type_name}" Target="{target}"/>')
+        return relationship_id
+
+    def _add_content_type(self, part: str, content_type: str):
+        self.content_types = _insert_before_closing(self.content_types, 'Types', f'<Override PartName="/{part}" ContentType="{content_type}"/>')
+
+    def _remove_content_type(self, part: str):
+        self.content_types = re.sub(rf'<(?:\w+:)?Override\b[^>]*?PartName="/{re.escape(part)}"[^>]*>', '', self.content_types)
+
+    def _related_targets(self, part: str) -> set:
+        """
+        Parties de l'archive source reliées à part par ses relations (les cibles externes, liens hypertexte, ..., sont ignorées).
+        """
+        rels = _rels_path(part)
+        if rels not in self.source.NameToInfo:
+            return set()
+        targets = set()
+        for relationship in re.finditer(r'<(?:\w+:)?Relationship\b[^>]*>', self._read(rels)):
+            attributes = dict(re.findall(r'(\w+)="([^"]*)"', relationship.group()))
+            if attributes.get('TargetMode') != 'External' and 'Target' in attributes:
+                targets.add(_part_path(part, attributes['Target']))
+        return targets & set(self.source.NameToInfo)
+
+    def _remove_related_parts(self, part: str):
+        """
+        Retire les parties reliées, directement ou non, à la feuille part (tableaux, dessins, graphiques, commentaires, ...),
+        leurs relations et leurs types de contenu. Une partie encore reliée à une partie conservée (image partagée, ...) est gardée.
+        """
+        removed, pending = set(), [part]
+        while pending:
+            for target in self._related_targets(pending.pop()):
+                if target not in removed and target != part:
+                    removed.add(target)
+                    pending.append(target)
+
+        # Parts also reached from the rest of the package are kept, with everything they relate to
+        kept_sources = [name for name in self.source.namelist()
+                        if not name.endswith('.rels') and name != part and name not in removed and _rels_path(name) in self.source.NameToInfo]
+        pending = [target for name in kept_sources for target in self._related_targets(name) if target in removed]
+        while pending:
+            target = pending.pop()
+            if target in removed:
+                removed.discard(target)
+                pending.extend(self._related_targets(target) & removed)
+
+        for name in removed:
+            self.rewritten.update((name, _rels_path(name)))
+            self._remove_content_type(name)
+            if re.fullmatch(r'xl/tables/table\d+\.xml', name):
+                # The name of a removed table can be given to the table of the new sheet
+                head = re.search(r'<(?:\w+:)?table\b[^>]*>', self._read(name))
+                if head:
+                    self.table_names.difference_update(unescape(found).lower() for found in re.findall(r'\b(?:name|displayName)="([^"]*)"', head.group()))
+        self.rewritten.add(_rels_path(part))
+
+    def _add_table_part(self, part: str):
+        self.rewritten.add(part)
+        self._add_content_type(part, _CONTENT_TYPES['table'])
+
+    def _sheet_part(self, sheet_name: str, if_sheet_exists: str) -> tuple:
+        if sheet_name in self.sheets:
+            if if_sheet_exists == 'error':
+                raise ValueError(f"Sheet '{sheet_name}' already exists and if_sheet_exists is set to 'error'.")
+            if if_sheet_exists == 'new':
+                # Same naming as openpyxl: the first free 'name1', 'name2', ...
+                suffix = 1
+                while f'{sheet_name}{suffix}' in self.sheets:
+                    suffix += 1
+                sheet_name = f'{sheet_name}{suffix}'
+
+        existing = None
+        if sheet_name in self.sheets:
+            part = self.sheets[sheet_name][0]
+            if part in self.rewritten:
+                raise ValueError(f"La feuille {sheet_name} a déjà été écrite")
+            if if_sheet_exists == 'overlay':
+                existing = self._read(part)
+            else:
+                # Drawings, tables, comments, ... of the replaced sheet are removed with it
+                self._remove_related_parts(part)
+        else:
+            taken = set(self.source.namelist()) | {path for path, _ in self.sheets.values()}
+            number = len(self.sheets) + 1
+            while f'xl/worksheets/sheet{number}.xml' in taken:
+                number += 1
+            part = f'xl/worksheets/sheet{number}.xml'
+            sheet_id = max([sheet_id for _, sheet_id in self.sheets.values()] + [0]) + 1
+            relationship_id = self._add_relationship('worksheet', posixpath.relpath(part, posixpath.dirname(self.workbook_path)))
+            self.workbook_xml = _insert_before_closing(self.workbook_xml, 'sheets',
+                                                       f'<sheet name="{_xml_attribute(sheet_name)}" sheetId="{sheet_id}" {self.rels_prefix}:id="{relationship_id}"/>')
+            self._add_content_type(part, _CONTENT_TYPES['worksheet'])
+            self.sheets[sheet_name] = (part, sheet_id)
+
+        self.rewritten.add(part)
+        return part, existing
+
+    def close(self):
+        # The calculation chain lists formula cells, it would be stale once a sheet is rewritten (Excel rebuilds it)
+        calc_chain = self._related_part('/calcChain')
+        if calc_chain is not None:
+            self.rewritten.add(calc_chain)
+            self.workbook_rels = re.sub(r'<(?:\w+:)?Relationship\b[^>]*?Type="[^"]*/calcChain"[^>]*>', '', self.workbook_rels)
+            self._remove_content_type(calc_chain)
+
+        parts = self.styles.elements()
+        styles_xml = self.styles_xml
+        for tag, base, after in (('numFmts', None, 'styleSheet'), ('fonts', self.styles.font_base, None),
+                                 ('fills', self.styles.fill_base, None), ('cellXfs', self.styles.xf_base, None)):
+            count = (self.number_format_count if base is None else base) + len(parts[tag])
+            styles_xml = _splice_collection(styles_xml, tag, parts[tag], count, after)
+
+        if self.strings_xml is None:
+            self.strings_path = posixpath.join(posixpath.dirname(self.workbook_path), 'sharedStrings.xml')
+            self._add_relationship('sharedStrings', 'sharedStrings.xml')
+            self._add_content_type(self.strings_path, _CONTENT_TYPES['sharedStrings'])
+            strings_xml = self.strings.to_xml().decode('utf-8')
+        else:
+            strings_xml = self.strings_xml
+            if len(self.strings):
+                head = re.search(r'<(\w+:)?sst\b[^>]*?(/?)>', strings_xml)
+                prefix = head.group(1) or ''
+                attributes = re.sub(r'\s(?:count|uniqueCount)="\d+"', '', head.group()[len(prefix) + 4:-2 if head.group(2) else -1])
+                opening = f'<{prefix}sst{attributes} count="{self.strings_count + self.strings.count}" uniqueCount="{self.strings.base + len(self.strings)}">'
+                body = '' if head.group(2) else strings_xml[head.end():strings_xml.rindex(f'</{prefix}sst>')]
+                strings_xml = f'{strings_xml[:head.start()]}{opening}{body}{_prefixed(self.strings.elements(), prefix)}</{prefix}sst>'
+
+        rewritten_parts = {self.workbook_path: self.workbook_xml, self.workbook_rels_path: self.workbook_rels, '[Content_Types].xml': self.content_types,
+                           self.styles_path: styles_xml, self.strings_path: strings_xml}
+        for info in self.source.infolist():
+            if info.filename not in self.rewritten and info.filename not in rewritten_parts:
+                _copy_zip_member(self.source, self.archive, info)
+        for name, xml in rewritten_parts.items():
+            self.archive.writestr(name, xml.encode('utf-8'))
+
+        self.archive.close()
+        self.source.close()
+        if _is_path(self.file):
+            self.temporary.close()
+            os.replace(self.temporary.name, self.file)
+        else:
+            self.temporary.seek(0)
+            self.file.seek(0)
+            shutil.copyfileobj(self.temporary, self.file)
+            self.file.truncate()
+            self.temporary.close()
+
+
+def _last_row_from_rows(stream) -> int:
+    """
+    Dernière ligne contenant des cellules, en lisant les balises <row> au fil de l'eau.
+    Les lignes sont libérées au fur et à mesure, aucune cellule n'est conservée.
+    """
+    last, sheet_data = 0, None
+    for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = element.tag.rpartition('}')[2]
+        if event == 'start':
+            if tag == 'sheetData':
+                sheet_data = element
+        elif tag == 'row':
+            # The row index is optional, a row without it follows the previous one
+            number = int(element.get('r', last + 1))
+            if len(element):
+                last = number
+            sheet_data.clear()
+        elif tag == 'sheetData':
+            break
+    return last
+
+
+def last_used_row(file: Union[str, io.IOBase], sheet_name: str) -> int:
+    """
+    Numéro de la dernière ligne utilisée d'une feuille, sans charger le classeur ni créer de cellules.
+    
+    La plage utilisée est lue dans l'élément <dimension> écrit au début du XML de la feuille : seuls les premiers octets
+    de la feuille sont décompressés, quelle que soit sa taille.
+    Si la feuille n'a pas de <dimension> (ou s'il ne couvre qu'une cellule, comme pour une feuille vide), ses lignes sont lues
+    au fil de l'eau.
+    
+    Parameters
+    ----------
+    file : str, path or file-like object
+        Le classeur Excel
+        
+    sheet_name : str
+        Le nom de la feuille
+    
+    Returns
+    -------
+    int
+        Le numéro de la dernière ligne, 0 si le fichier ou la feuille n'existe pas, ou si la feuille est vide
+    
+    Example
+    -------
+    >>> last_used_row('Ventes.xlsx', 'Feuil1') -> 1254
+    """
+    if not _target_exists(file):
+        return 0
+    
+    position = None if _is_path(file) else file.tell()
+    try:
+        with zipfile.ZipFile(file) as archive:
+            part, _ = _read_workbook_part(archive)['sheets'].get(sheet_name, (None, None))
+            if part is None:
+                return 0
+            
+            # The dimension comes before the sheet data, only the head of the part is read
+            head = b''
+            with archive.open(part) as stream:
+                while b'sheetData' not in head:
+                    block = stream.read(1 << 14)
+                    if not block:
+                        break
+                    head += block
+            dimension = _DIMENSION_PATTERN.search(head.decode('utf-8', errors='ignore'))
+            if dimension and ':' in dimension.group(2):
+                return parse_range(dimension.group(2))[3]
+            
+            with archive.open(part) as stream:
+                return _last_row_from_rows(stream)
+    finally:
+        if position is not None:
+            file.seek(position)
+
+
+def _append_point(file, sheet_name: str, point, mode: str, ise: str) -> tuple:
+    """
+    Résout point='append' (ou (colonne, 'append')) en coordonnées de la première ligne sous les données de la feuille.
+    Seule une feuille superposée (mode='a', ise='overlay') garde ses lignes, sinon l'écriture commence à la ligne 1.
+    
+    Returns
+    -------
+    tuple
+        (point, True si des lignes existent déjà au-dessus du point)
+    """
+    column = point[0] if isinstance(point, tuple) else 'A'
+    last = last_used_row(file, sheet_name) if mode == 'a' and ise == 'overlay' else 0
+    return (column, last + 1), last > 0
+
+
+def _is_append_point(point) -> bool:
+    return (isinstance(point, str) and point == 'append') or (isinstance(point, tuple) and len(point) == 2 and point[1] == 'append')
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------ Préparation vectorisée des valeurs -----------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Strings XlsxWriter converts itself in worksheet.write: blanks, formulas, array formulas and URLs
+_XLSXWRITER_SPECIAL_STRINGS = r'$|=|\{=|(?:ftp|http)s?://|mailto:|(?:in|ex)ternal:'
+
+
+def _special_strings(strings: pd.Series, xlsxwriter: bool = False) -> np.ndarray:
+    """
+    Masque des chaînes que le moteur ne stocke pas telles quelles (formules, codes d'erreur, URL, caractères illégaux, chaînes trop longues).
+    Elles sont converties une à une, comme le ferait df.to_excel.
+    """
+    if xlsxwriter:
+        special = strings.str.match(_XLSXWRITER_SPECIAL_STRINGS)
+    else:
+        special = strings.str.match(r'=[\s\S]') | strings.isin(ERROR_CODES) | strings.str.contains(ILLEGAL_CHARACTERS_RE.pattern)
+    return (special | (strings.str.len() > 32767)).to_numpy(dtype=bool)
+
+
+def _excel_value(writer: pd.ExcelWriter, value, na_rep: str = 'NaN', float_format: str = None) -> tuple:
+    """
+    Conversion d'une valeur isolée, identique à celle de df.to_excel.
+    
+    Returns
+    -------
+    tuple
+        (valeur, format de nombre ou None)
+    """
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        value = na_rep
+    elif pd.api.types.is_float(value):
+        if np.isinf(value):
+            value = 'inf' if value > 0 else '-inf'
+        elif float_format is not None:
+            value = float(float_format % value)
+    if getattr(value, 'tzinfo', None) is not None:
+        raise ValueError("Excel does not support datetimes with timezones. Please ensure that datetimes are timezone unaware before writing to Excel.")
+    
+    # NumPy scalars become Python values, dates and durations get their number format
+    if pd.api.types.is_bool(value):
+        return bool(value), None
+    if pd.api.types.is_integer(value):
+        return int(value), None
+    if pd.api.types.is_float(value):
+        return float(value), None
+    if isinstance(value, Decimal):
+        return value, None
+    if isinstance(value, datetime.datetime):
+        return value, writer.datetime_format
+    if isinstance(value, datetime.date):
+        return value, writer.date_format
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds() / 86_400, '0'
+    value = str(value)
+    if len(value) > 32767:
+        warnings.warn(f"Cell contents too long ({len(value)}), truncated to 32767 characters", UserWarning, stacklevel=2)
+    return value, None
+
+
+def _prepare_column(writer: pd.ExcelWriter, column: pd.Series, na_rep: str = 'NaN', float_format: str = None) -> tuple:
+    """
+    Convertit une colonne entière, en une fois et selon son type, en valeurs Excel finales.
+    
+    Returns
+    -------
+    tuple
+        (values, data_type, number_format, generic)
+        
+        - values : liste des valeurs Python à écrire
+        - data_type : type des cellules ('n' nombre, 's' chaîne, 'b' booléen), None si la colonne est convertie valeur par valeur
+        - number_format : format de nombre de la colonne, ou None
+        - generic : masque des valeurs (manquantes, infinies, formules, ...) laissées brutes et converties une à une par "_excel_value"
+    """
+    dtype = column.dtype
+    generic = column.isna().to_numpy()
+    number_format = None
+    kind = getattr(dtype, 'numpy_dtype', dtype).kind if not isinstance(dtype, pd.CategoricalDtype) else None
+    
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Categories are prepared once, then spread with the codes (-1, a missing value, takes the last entry)
+        values, data_type, number_format, category_generic = _prepare_column(writer, pd.Series(dtype.categories), na_rep, float_format)
+        codes = column.cat.codes.to_numpy()
+        table = np.empty(len(values) + 1, dtype=object)
+        table[:-1] = values
+        table[-1] = np.nan
+        return table[codes].tolist(), data_type, number_format, np.append(category_generic, True)[codes]
+    
+    if pd.api.types.is_bool_dtype(dtype):
+        values, data_type = column.to_numpy(dtype=bool, na_value=False).tolist(), 'b'
+    
+    elif kind in ('i', 'u'):
+        values, data_type = column.to_numpy(dtype=getattr(dtype, 'numpy_dtype', dtype), na_value=0).tolist(), 'n'
+    
+    elif kind == 'f':
+        numbers = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        precision = re.fullmatch(r'%\.(\d+)f', float_format) if float_format else None
+        # '%.2f' is a plain rounding, done by NumPy on the whole column
+        if precision:
+            numbers = numbers.round(int(precision.group(1)))
+        elif float_format:
+            numbers = np.array([float(float_format % number) for number in numbers.tolist()])
+        values, data_type = numbers.tolist(), 'n'
+        generic = generic | np.isinf(numbers)
+    
+    elif kind == 'M':
+        if getattr(dtype, 'tz', None) is not None:
+            raise ValueError("Excel does not support datetimes with timezones. Please ensure that datetimes are timezone unaware before writing to Excel.")
+        days, rest = np.divmod((column.to_numpy(dtype='datetime64[ns]') - _EXCEL_EPOCH).astype(np.int64), _NS_PER_DAY)
+        # Like openpyxl: the serials skip the fictitious 1900-02-29, microseconds are kept
+        days = np.where((days > 0) & (days <= 60), days - 1, days)
+        values, data_type, number_format = (days + (rest // 1000) / 86_400_000_000).tolist(), 'n', writer.datetime_format
+    
+    elif kind == 'm':
+        values, data_type, number_format = (column.dt.total_seconds().to_numpy() / 86_400).tolist(), 'n', '0'
+    
+    elif pd.api.types.infer_dtype(column, skipna=True) == 'string':
+        values, data_type = column.tolist(), 's'
+        generic = generic | _special_strings(column.where(~generic, ''), _is_xlsxwriter(writer))
+    
+    else:
+        # Mixed objects, Decimal, Period, ...: converted one by one
+        return column.tolist(), None, None, np.ones(len(column), dtype=bool)
+    
+    if generic.any():
+        # The raw value is kept for the values converted one by one
+        raw = column.tolist()
+        for position in np.flatnonzero(generic).tolist():
+            values[position] = raw[position]
+    
+    return values, data_type, number_format, generic
+
+
+def _write_prepared_openpyxl(writer: pd.ExcelWriter, worksheet, prepared: list, startrow: int, startcol: int, na_rep: str, float_format: str):
+    """
+    Écrit des colonnes préparées par "_prepare_column" dans une feuille openpyxl, à partir de la cellule (startrow, startcol) (indices 0).
+    Les valeurs sont déjà des valeurs Python finales, le format de nombre de chaque cellule est celui de sa colonne.
+    Les cellules existantes (ise='overlay') gardent leur style, seul le format de nombre change.
+    """
+    for position, (values, data_type, number_format, generic) in enumerate(prepared):
+        column = startcol + position + 1
+        
+        direct = np.flatnonzero(~generic).tolist() if data_type is not None else []
+        for index in direct:
+            cell = worksheet.cell(row=startrow + index + 1, column=column, value=values[index])
+            if number_format is not None:
+                cell.number_format = number_format
+        
+        for index in np.flatnonzero(generic).tolist():
+            value, value_format = _excel_value(writer, values[index], na_rep, float_format)
+            cell = worksheet.cell(row=startrow + index + 1, column=column, value=value)
+            if value_format:
+                cell.number_format = value_format
+
+
+def _write_prepared_xlsxwriter(writer: pd.ExcelWriter, worksheet, prepared: list, startrow: int, startcol: int, na_rep: str, float_format: str):
+    """
+    Écrit des colonnes préparées par "_prepare_column" dans une feuille XlsxWriter, avec la méthode typée de chaque colonne
+    (write_number, write_string, write_boolean) au lieu de worksheet.write.
+    """
+    registry = style_registry(writer)
+    
+    def number_format(value_format):
+        if not value_format:
+            return None
+        patch = (('number_format', value_format),)
+        return registry.lookup(('xlsxwriter_format', None, patch), lambda: _xlsxwriter_format(writer.book, None, patch))
+    
+    for position, (values, data_type, column_format, generic) in enumerate(prepared):
+        column = startcol + position
+        if data_type is not None:
+            write = {'n': worksheet.write_number, 's': worksheet.write_string, 'b': worksheet.write_boolean}[data_type]
+            cell_format = number_format(column_format)
+            for index in np.flatnonzero(~generic).tolist():
+                write(startrow + index, column, values[index], cell_format)
+        
+        for index in np.flatnonzero(generic).tolist():
+            value, value_format = _excel_value(writer, values[index], na_rep, float_format)
+            worksheet.write(startrow + index, column, value, number_format(value_format))
+
+
+def _to_excel(writer: pd.ExcelWriter, df: pd.DataFrame, sheet_name: str = 'Feuil1', na_rep: str = 'NaN', columns: Union[str, list] = None,
+              header: bool = True, index: bool = True, startcol: int = 0, startrow: int = 0, float_format: str = None):
+    """
+    Équivalent de df.to_excel, sans conversion ni choix du type cellule par cellule.
+    
+    pandas crée la feuille (selon if_sheet_exists) et écrit les en-têtes, à partir d'un DataFrame vide.
+    Chaque colonne est ensuite convertie en une fois par "_prepare_column" (dates en numéros de série avec le format de la colonne,
+    catégories par leurs codes, valeurs manquantes masquées une seule fois, arrondi de float_format par NumPy), puis écrite.
+    Les colonnes MultiIndex et les alias d'en-têtes sont laissés à df.to_excel.
+    """
+    if columns is not None:
+        df = df[[columns] if isinstance(columns, str) else columns]
+    
+    if df.columns.nlevels > 1 or (index and df.index.nlevels > 1) or not isinstance(header, bool) or len(df.columns) == 0:
+        df.to_excel(excel_writer=writer, sheet_name=sheet_name, na_rep=na_rep, header=header, index=index, startcol=startcol, startrow=startrow,
+                    float_format=float_format)
+        return
+    
+    # With if_sheet_exists='new', pandas writes to a sheet of another name
+    existing = set(writer.sheets)
+    df.iloc[:0].to_excel(excel_writer=writer, sheet_name=sheet_name, na_rep=na_rep, header=header, index=index, startcol=startcol, startrow=startrow)
+    created = [name for name in writer.sheets if name not in existing]
+    worksheet = writer.sheets[created[0] if created else sheet_name]
+    
+    series = [df.iloc[:, position] for position in range(df.shape[1])]
+    if index:
+        series.insert(0, pd.Series(df.index.to_timestamp() if isinstance(df.index, pd.PeriodIndex) else df.index))
+    prepared = [_prepare_column(writer, column, na_rep, float_format) for column in series]
+    
+    write = _write_prepared_xlsxwriter if _is_xlsxwriter(writer) else _write_prepared_openpyxl
+    write(writer, worksheet, prepared, startrow + (1 if header else 0), startcol, na_rep, float_format)
+
+
+def _write_df_on_sheet(writer: pd.ExcelWriter, df: pd.DataFrame, sheet_name: str = 'Feuil1', na_rep: str = 'NaN', columns: Union[str, list] = None,
+                       header: bool = True, index: bool = True, point: tuple = ('A', 1), float_format: str = '%.2f', date_format: bool = False,
+                       date_cols: list = None, header_format: bool = False, headers_list: list = None, plan: StylePlan = None,
+                       auto_width: bool = False, table: Union[bool, str, dict] = None):
+    """
+    Écrit et met en forme un DataFrame sur une feuille d'un ExcelWriter déjà ouvert, sans sauvegarder le fichier.
+    La mise en forme est enregistrée dans plan (un nouveau plan par défaut), puis appliquée en une seule passe.
+    Voir "save_df_on_excel" pour le détail des paramètres.
+    """
+    
+    plan = StylePlan() if plan is None else plan
+    
+    col, row = get_coord(point[0], point[1])
+    
+    frame = df if columns is None else df[[columns] if isinstance(columns, str) else columns]
+    levels = frame.index.nlevels if index else 0
+    labels = (list(frame.index.names) if index else []) + list(frame.columns)
+    # Excel rows of the header and of the data, the written range starts at point
+    header_row = row + 1
+    first_row = row + (2 if header else 1)
+    
+    # Saves the dataframe on the Excel file, values being prepared column by column
+    with _phase('write', sheet_name=sheet_name, rows=len(df)):
+        _to_excel(writer, df, sheet_name, na_rep, columns, header, index, col, row, float_format)
+    
+    # Transforms columns to date format if specified
+    if date_format:
+        save_as_date(writer=writer, sheet_name=sheet_name, date_cols=date_cols, min_row=first_row, max_row=first_row + len(df) - 1, plan=plan,
+                     sparse=True)
+    
+    # Formats headers
+    if header_format and header:
+        # First, previous style has to be deleted
+        clear_existing_style(writer, sheet_name, min_row=header_row, max_row=header_row, min_col=col + 1, max_col=col + len(labels), plan=plan,
+                             sparse=True)
+        # Then applies current header style, after the index columns
+        apply_style_to_headers(writer, sheet_name, headers_list, frame, plan=plan, startcol=col + levels, startrow=header_row)
+    
+    # Every recorded style is applied in one sweep
+    plan.apply(writer)
+    
+    # The written range becomes an Excel table, formatted by its style
+    if table:
+        with _phase('table', sheet_name=sheet_name):
+            apply_table(writer, sheet_name, f'{column_letter(col + 1)}{row + 1}:{column_letter(col + len(labels))}{row + len(frame) + (1 if header else 0)}',
+                        labels, header, table)
+    
+    # Widths are computed from the DataFrame, the cells are not read back
+    if auto_width:
+        with _phase('auto_width', sheet_name=sheet_name):
+            apply_column_widths(writer, sheet_name, column_widths(df, columns, header, index, point, na_rep, float_format, date_format, date_cols,
+                                                                  header_format, headers_list))
+
+
+@_bytes_target
+@_instrumented
+def save_df_on_excel(df: pd.DataFrame, file: Union[str, io.IOBase], sheet_name = 'Feuil1', na_rep = 'NaN', columns: Union[str, list] = None, header: bool = True, index: bool = True, 
+                     point: tuple = ('A', 1), mode = 'a', engine = 'openpyxl', ise = 'overlay', float_format = '%.2f', date_format: bool = False,
+                     date_cols: list = None, header_format: bool = False, headers_list: list = None, streaming: bool = False, chunksize: int = None,
+                     plan: StylePlan = None, auto_width: bool = False, table: Union[bool, str, dict] = None, compression: int = None,
+                     shard: Union[bool, dict] = None, cache: 'SheetCache' = None):
+    """
+    Sauvegarde un dataframe, ou une colonne du df, dans la colonne et à partir de la ligne spécifiée, du fichier spécifié.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame, iterable of pd.DataFrame, Arrow table or Polars DataFrame
+        Le DataFrame à sauvegarder.
+        Un itérateur de DataFrames (blocs de lignes) est écrit en mode streaming.
+        Une table Arrow (pyarrow.Table, RecordBatch), un DataFrame Polars, ou un objet exposant l'interface Arrow C
+        ou le protocole __dataframe__, est lu sans copie lorsque c'est possible (voir "_arrow_to_pandas", nécessite pyarrow).
+        Un pyarrow.RecordBatchReader est écrit lot par lot.
+        
+    file : str, path, file-like object or None
+        Le fichier Excel dans lequel on veut sauvegarder, ou un objet fichier binaire (io.BytesIO, ...).
+        None : le classeur est écrit en mémoire et la fonction retourne son contenu (bytes).
         
-    date_cols : str
-         Colonne sur laquelle appliquer le format date.
+    sheet_name : str, default="Feuil1"
+        Le nom de la feuille au sein de ce dit fichier
         
-    min_row : default=2
-        Ligne à partir de laquelle on applique la mise en forme.
-        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 1 = ligne 1)
+    na_rep : str, default='NaN'
+        Façon dont sont représentées les valeurs manquantes dans le fichier Excel
         
-    max_row : default=1000
-        Ligne jusqu'à laquelle on applique la mise en forme
-        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 100 = ligne 100)
+        - '' : Si l'on souhaite laisser les cellules vides
+        
+    columns : str or list
+        Colonne du DataFrame à écrire dans le fichier Excel
+        
+    header : bool, default=True
+        Booleen qui renseigne ou non le nom des colonnes dans le fichier Excel
+    
+    index : bool, default=True
+        Booleen qui renseigne ou non l'index dans le fichier Excel
+        
+    point : tuple or 'append', default=('A', 1)
+        Coordonnées à partir duquel on sauvegarde le DataFrame
+        
+        - 'append' : écrit les lignes sous la dernière ligne utilisée de la feuille (voir "last_used_row"), sans en-têtes
+          si la feuille contient déjà des lignes. (colonne, 'append') écrit à partir d'une autre colonne que A.
+          La feuille n'est pas chargée pour trouver cette ligne. Avec le moteur natif, les lignes existantes ne sont pas analysées :
+          le coût de l'écriture dépend des lignes ajoutées.
+        
+    mode : {'w', 'a'}, default='a'
+        Mode d'écriture dans le fichier 
+         
+        - 'w' : écriture 
+        - 'a' : append
+        
+    engine : str, default='openpyxl'
+        openpyxl ou XlsxWriter
+        
+        - 'openpyxl' : permet d'ajouter des feuilles à un fichier existant (mode='a')
+        - 'xlsxwriter' : plus rapide et moins gourmand en mémoire, uniquement pour créer un fichier.
+          Le format date, le style des en-têtes et les polices sont convertis en Formats XlsxWriter.
+        - 'native' : le XML de la feuille est construit colonne par colonne par des opérations vectorisées et écrit directement
+          dans l'archive zip, sans openpyxl ni XlsxWriter. Le plus rapide.
+          En mode='a', seule la feuille écrite est réécrite (avec les chaînes partagées, les styles et le classeur),
+          les autres membres du fichier sont recopiés sans être chargés.
+        
+    ise : {'error', 'new', 'replace', 'overlay'}, default='overlay'
+        Action à faire si mode=appending et que la feuille existe déjà
+        
+        - error: raise a ValueError.
+        - new: Create a new sheet, with a name determined by the engine.
+        - replace: Delete the contents of the sheet before writing to it.
+        - overlay: Write contents to the existing sheet without removing
+        
+    date_format : bool, default=False
+        Si l'on souhaite le format Date sur certaines colonnes du fichier Excel
+        
+    date_cols : list
+        Liste des colonnes à transformer en format Date.
+        Cette liste doit contenir la lettre de la colonne Excel (A, B, ...)
+        
+    header_format : bool, default=False
+        Si l'on souhaite appliquer un style personnalisé ou non aux en-têtes de lignes
+        
+    headers_list : list
+        Il s'agit d'une liste, contenant une liste, qui contient elle même une liste de colonne et un dictionnaire de mise en forme style CSS
+        
+    streaming : bool, default=False
+        Écrit les lignes au fil de l'eau (voir "stream_df_on_excel"), la mémoire utilisée est bornée par chunksize.
+        Uniquement pour la création d'un fichier (mode='w', ou mode='a' sur un fichier inexistant).
+        
+    chunksize : int, default=None
+        Nombre de lignes converties à la fois en mode streaming, STREAM_CHUNKSIZE par défaut
+        
+    plan : StylePlan, default=None
+        Plan de mise en forme complété par le format date et le style des en-têtes, puis appliqué en une seule passe avant la sauvegarde.
+        Permet d'ajouter d'autres mises en forme (polices, remplissages, ...) sans parcourir une nouvelle fois les cellules.
+        
+    auto_width : bool, default=False
+        Ajuste la largeur des colonnes à leur contenu (voir "column_widths"), calculée à partir du DataFrame.
+        Pour un itérateur de DataFrames, seul le premier bloc est mesuré.
+        Avec le moteur natif et ise='overlay' sur une feuille existante, les largeurs de la feuille sont conservées.
+        
+    table : bool, str or dict, default=None
+        Écrit la plage du DataFrame comme un tableau Excel (voir "apply_table") : True pour le style par défaut, le nom d'un style
+        de tableau, ou un dictionnaire d'options (name, style, autofilter, banded_rows, ...).
+        L'en-tête, les lignes à bandes et les filtres sont dessinés par Excel, sans style sur chaque cellule.
+        Les libellés des colonnes sont rendus uniques et non vides. Non disponible avec XlsxWriter en mode streaming,
+        ni avec le moteur natif sur une feuille superposée (ise='overlay').
+        
+    compression : int, default=None
+        Niveau de compression zip du fichier, de 0 (ZIP_STORED, aucune compression, l'écriture la plus rapide) à 9.
+        None : compression par défaut du moteur. Non réglable avec le moteur xlsxwriter.
+        
+    shard : bool or dict, default=None
+        Découpe un DataFrame trop grand pour une feuille Excel (1 048 576 lignes, 16 384 colonnes) sur plusieurs feuilles,
+        la première nommée sheet_name, les suivantes sheet_name_2, sheet_name_3, ... Chaque feuille est écrite en streaming
+        et répète l'en-tête, son style et l'index.
+        Sans découpage, un DataFrame qui dépasse la feuille est refusé avant toute écriture.
+        
+        - True : chaque feuille est remplie jusqu'aux limites d'Excel
+        - dict : limites choisies, {'rows': lignes de données par feuille, 'columns': colonnes de données par feuille (groupes de colonnes),
+          'file_size': taille en octets à partir de laquelle les feuilles suivantes sont écrites dans file_part_2.xlsx, file_part_3.xlsx, ...}
+          file_size est mesuré sur les feuilles déjà compressées, la table des chaînes partagées s'y ajoute. Moteur natif uniquement.
+        
+        Ajouter les feuilles à un fichier existant nécessite le moteur natif. plan n'est pas pris en charge.
+        
+    cache : SheetCache, default=None
+        Cache des feuilles (voir "SheetCache") : une feuille dont le DataFrame et les paramètres n'ont pas changé depuis
+        l'export précédent est recopiée du cache sans être convertie. Moteur natif uniquement, les chaînes sont alors
+        écrites dans les cellules.
+    
+    Returns
+    -------
+    None or bytes
+        Le contenu du classeur si file=None
+    
+    Example
+    -------
+    >>> 
+    """
+    
+    file = _xlsx_target(file)
+    df = _as_frame(df)
+    
+    # Rows go below the used range of the sheet, which already has its header
+    if _is_append_point(point):
+        point, below = _append_point(file, sheet_name, point, mode, ise)
+        header = header and not below
+    
+    # XlsxWriter only creates files, appending is possible only while the file does not exist yet
+    if engine == 'xlsxwriter' and mode == 'a':
+        if _target_exists(file):
+            _report(f"Erreur : le moteur xlsxwriter ne permet pas de modifier le fichier existant {file}")
+            return
+        mode = 'w'
+    
+    if shard:
+        if mode not in ('w', 'a'):
+            _report(f"Erreur dans le mode spécifié : {mode} n'existe pas")
+            return
+        appending = mode == 'a' and _target_exists(file)
+        if appending and engine != 'native':
+            _report(f"Erreur : le découpage écrit les feuilles en streaming, seul le moteur natif permet de les ajouter au fichier existant {file}")
+            return
+        if plan is not None:
+            _report("Le plan de mise en forme n'est pas pris en charge avec le découpage, il est ignoré", error=False)
+        
+        _save_shards(df, file, sheet_name, shard, na_rep, columns, header, index, point, engine, ise, float_format, chunksize, date_format,
+                     date_cols, header_format, headers_list, auto_width, table, compression, appending)
+        return
+    
+    if cache is not None and engine != 'native':
+        _report("Le cache des feuilles n'est disponible qu'avec le moteur natif, il est ignoré", error=False)
+    
+    # A DataFrame larger than a sheet is refused before anything is written
+    overflow = _sheet_overflow(df, columns, header, index, point) if isinstance(df, pd.DataFrame) else None
+    if overflow is not None:
+        _report(f"Erreur : le DataFrame ne tient pas sur la feuille {sheet_name} ({overflow}), shard=True le découpe sur plusieurs feuilles")
+        return
+    
+    if engine == 'native':
+        if mode not in ('w', 'a'):
+            _report(f"Erreur dans le mode spécifié : {mode} n'existe pas")
+            return
+        if plan is not None:
+            _report("Le plan de mise en forme n'est pas pris en charge par le moteur natif, il est ignoré", error=False)
+        
+        # Appending rewrites only the target sheet, the other parts of the file are copied as they are
+        appending = mode == 'a' and _target_exists(file)
+        with (_NativeWorkbookAppender(file, compression) if appending else _NativeWorkbookWriter(file, compression)) as workbook:
+            # DataFrames and iterators of DataFrames are both converted block by block
+            with _phase('write', sheet_name=sheet_name, rows=len(df) if isinstance(df, pd.DataFrame) else None) as event:
+                if cache is None:
+                    workbook.write_sheet(sheet_name, _native_sheet(df, workbook.strings, workbook.styles, na_rep, columns, header, index, point,
+                                                                   float_format, date_format, date_cols, header_format, headers_list, auto_width,
+                                                                   table, workbook.tables), ise)
+                else:
+                    event['cache_hit'] = cache.write_sheet(workbook, sheet_name, df, {
+                        'na_rep': na_rep, 'columns': columns, 'header': header, 'index': index, 'point': point, 'float_format': float_format,
+                        'date_format': date_format, 'date_cols': date_cols, 'header_format': header_format, 'headers_list': headers_list,
+                        'auto_width': auto_width, 'table': table}, ise)
+        print('Appended' if appending else 'Written')
+    
+    elif streaming or not isinstance(df, pd.DataFrame):
+        # Write-only sheets cannot be added to an existing workbook
+        if mode == 'a' and _target_exists(file):
+            _report(f"Erreur : le mode streaming ne permet pas d'ajouter une feuille au fichier existant {file}")
+            return
+        
+        stream_df_on_excel(df, file, sheet_name, na_rep, columns, header, index, point, engine, float_format, chunksize,
+                           date_format, date_cols, header_format, headers_list, auto_width, table, compression)
+        print('Written')
+    
+    elif mode == 'w':
+        with _open_writer(file, compression, mode=mode, engine=engine) as writer:
+            _write_df_on_sheet(writer, df, sheet_name, na_rep, columns, header, index, point, float_format,
+                               date_format, date_cols, header_format, headers_list, plan, auto_width, table)
+            
+            print('Written')
+
+    elif mode == 'a' and not _is_path(file) and not _target_exists(file):
+        # An empty file-like object receives a new workbook
+        save_df_on_excel(df, file, sheet_name, na_rep, columns, header, index, point, mode='w', engine=engine, float_format=float_format,
+                         date_format=date_format, date_cols=date_cols, header_format=header_format, headers_list=headers_list, plan=plan,
+                         auto_width=auto_width, table=table, compression=compression)
+
+    elif mode == 'a':
+        try:
+            with _open_writer(file, compression, mode=mode, engine=engine, if_sheet_exists=ise) as writer:
+                _write_df_on_sheet(writer, df, sheet_name, na_rep, columns, header, index, point, float_format,
+                                   date_format, date_cols, header_format, headers_list, plan, auto_width, table)
+                            
+                print('Appended')
+                
+        # If the file doesn't exists, then runs the function in writting mode
+        except FileNotFoundError:
+            save_df_on_excel(df, file, sheet_name, na_rep, columns, header, index, point, mode='w', engine=engine, float_format=float_format,
+                             date_format=date_format, date_cols=date_cols,
+                             header_format=header_format, headers_list=headers_list, plan=plan, auto_width=auto_width, table=table,
+                             compression=compression)
+
+    else:
+        _report(f"Erreur dans le mode spécifié : {mode} n'existe pas")
+
+@_bytes_target
+@_instrumented
+def save_dfs_on_excel(file: Union[str, io.IOBase], sheets: dict, mode: str = 'a', engine: str = 'openpyxl', ise: str = 'overlay', na_rep: str = 'NaN',
+                      header: bool = True, index: bool = True, float_format: str = '%.2f', auto_width: bool = False,
+                      table: Union[bool, str, dict] = None, compression: int = None, cache: 'SheetCache' = None):
+    """
+    Sauvegarde plusieurs DataFrames, chacun sur sa feuille, en ouvrant et en sauvegardant le fichier Excel une seule fois.
+    
+    Appeler "save_df_on_excel" en mode='a' pour chaque feuille recharge puis réécrit tout le classeur à chaque appel.
+    Ici toutes les feuilles sont écrites et mises en forme au sein d'un seul ExcelWriter.
+    
+    Parameters
+    ----------
+    file : str, path, file-like object or None
+        Le fichier Excel dans lequel on veut sauvegarder, ou un objet fichier binaire.
+        None : le classeur est écrit en mémoire et la fonction retourne son contenu (bytes).
+        
+    sheets : dict
+        Dictionnaire {nom_feuille: (df, point, date_cols, headers_list)}
+        
+        - df : DataFrame à sauvegarder sur la feuille
+        - point : coordonnées à partir desquelles on sauvegarde le DataFrame, default=('A', 1), ou 'append' (voir "save_df_on_excel")
+        - date_cols : liste des colonnes Excel (A, B, ...) à mettre au format Date, None si aucune
+        - headers_list : styles des en-têtes (voir "save_df_on_excel"), None si aucun
+        
+        Les éléments de fin de tuple peuvent être omis : {'Feuil1': (df,)} ou {'Feuil1': (df, ('A', 1))}
+        
+    mode : {'w', 'a'}, default='a'
+        Mode d'écriture dans le fichier
+        
+    Les autres paramètres sont identiques à ceux de "save_df_on_excel" et s'appliquent à toutes les feuilles.
+    
+    Returns
+    -------
+    None or bytes
+        Le contenu du classeur si file=None
+    
+    Example
+    -------
+    >>> save_dfs_on_excel('rapport.xlsx', {'Ventes': (df_ventes, ('A', 1), ['C']),
+    ...                                    'Stocks': (df_stocks, ('A', 1), None, [[['Produit'], header_params]])})
+    """
+    
+    file = _xlsx_target(file)
+    
+    if mode == 'a' and not _target_exists(file):
+        mode = 'w'
+    
+    # XlsxWriter only creates files
+    if engine == 'xlsxwriter' and mode == 'a':
+        _report(f"Erreur : le moteur xlsxwriter ne permet pas de modifier le fichier existant {file}")
+        return
+        
+    if mode not in ('w', 'a'):
+        _report(f"Erreur dans le mode spécifié : {mode} n'existe pas")
+        return
+    
+    # Pads the tuples with the default values of the missing trailing elements, 'append' points are resolved before the file is opened
+    jobs = []
+    for sheet_name, sheet_args in sheets.items():
+        df, point, date_cols, headers_list = tuple(sheet_args) + (None, ('A', 1), None, None)[len(sheet_args):]
+        df = _as_frame(df)
+        sheet_header = header
+        if _is_append_point(point):
+            point, below = _append_point(file, sheet_name, point, mode, ise)
+            sheet_header = header and not below
+        overflow = _sheet_overflow(df, None, sheet_header, index, point) if isinstance(df, pd.DataFrame) else None
+        if overflow is not None:
+            _report(f"Erreur : le DataFrame ne tient pas sur la feuille {sheet_name} ({overflow})")
+            return
+        jobs.append((sheet_name, df, point, date_cols, headers_list, sheet_header))
+    
+    if cache is not None and engine != 'native':
+        _report("Le cache des feuilles n'est disponible qu'avec le moteur natif, il est ignoré", error=False)
+    
+    if engine == 'native':
+        # Every sheet shares the same strings and styles tables
+        with (_NativeWorkbookAppender(file, compression) if mode == 'a' else _NativeWorkbookWriter(file, compression)) as workbook:
+            for sheet_name, df, point, date_cols, headers_list, sheet_header in jobs:
+                with _phase('write', sheet_name=sheet_name, rows=len(df) if isinstance(df, pd.DataFrame) else None) as event:
+                    if cache is None:
+                        workbook.write_sheet(sheet_name, _native_sheet(df, workbook.strings, workbook.styles, na_rep, None, sheet_header, index, point,
+                                                                       float_format, date_cols is not None, date_cols,
+                                                                       headers_list is not None, headers_list, auto_width,
+                                                                       table, workbook.tables), ise)
+                    else:
+                        event['cache_hit'] = cache.write_sheet(workbook, sheet_name, df, {
+                            'na_rep': na_rep, 'columns': None, 'header': sheet_header, 'index': index, 'point': point, 'float_format': float_format,
+                            'date_format': date_cols is not None, 'date_cols': date_cols, 'header_format': headers_list is not None,
+                            'headers_list': headers_list, 'auto_width': auto_width, 'table': table}, ise)
+        print('Written' if mode == 'w' else 'Appended')
+        return
+    
+    writer_kwargs = {'if_sheet_exists': ise} if mode == 'a' else {}
+    with _open_writer(file, compression, mode=mode, engine=engine, **writer_kwargs) as writer:
+        for sheet_name, df, point, date_cols, headers_list, sheet_header in jobs:
+            _write_df_on_sheet(writer, df, sheet_name, na_rep, None, sheet_header, index, point, float_format,
+                               date_format=date_cols is not None, date_cols=date_cols,
+                               header_format=headers_list is not None, headers_list=headers_list, auto_width=auto_width, table=table)
+            
+        print('Written' if mode == 'w' else 'Appended')
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------ Découpage des DataFrames trop grands ---------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Rows converted at a time when a DataFrame is split across sheets
+SHARD_CHUNKSIZE = 100_000
+
+
+def _sheet_overflow(df: pd.DataFrame, columns: Union[str, list] = None, header: bool = True, index: bool = True, point: tuple = ('A', 1)) -> str:
+    """
+    Message d'erreur si le DataFrame, écrit à partir de point, dépasse les limites d'une feuille Excel (None s'il tient dans la feuille).
+    """
+    startcol, startrow = get_coord(point[0], point[1])
+    width = 1 if isinstance(columns, str) else len(columns) if columns is not None else df.shape[1]
+    last_row = startrow + (1 if header else 0) + len(df)
+    last_col = startcol + (df.index.nlevels if index else 0) + width
+    if last_row > EXCEL_MAX_ROWS:
+        return f"{last_row:,} lignes pour une limite de {EXCEL_MAX_ROWS:,} par feuille"
+    if last_col > EXCEL_MAX_COLUMNS:
+        return f"{last_col:,} colonnes pour une limite de {EXCEL_MAX_COLUMNS:,} par feuille"
+    return None
+
+
+def _row_shards(chunks: Iterator[pd.DataFrame], rows: int) -> Iterator[Iterator[pd.DataFrame]]:
+    """
+    Découpe un flux de blocs de lignes en flux successifs d'au plus rows lignes, un par feuille.
+    Un bloc à cheval sur deux feuilles est coupé par iloc (des vues), chaque flux doit être consommé avant de passer au suivant.
+    Il y a toujours au moins un flux, éventuellement vide, pour que l'en-tête soit écrit.
+    """
+    carry = []
+
+    def shard():
+        remaining = rows
+        while remaining:
+            chunk = carry.pop() if carry else next(chunks, None)
+            if chunk is None:
+                return
+            if len(chunk) > remaining:
+                carry.append(chunk.iloc[remaining:])
+                chunk = chunk.iloc[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+
+    first = next(chunks, None)
+    if first is None:
+        return
+    carry.append(first)
+    yield shard()
+    while True:
+        # Empty blocks do not open a new sheet
+        while not carry or not len(carry[0]):
+            carry.clear()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            carry.append(chunk)
+        yield shard()
+
+
+def _shard_date_cols(date_cols: list, startcol: int, levels: int, group_start: int, group_size: int) -> list:
+    """
+    Lettres des colonnes Date d'un groupe de colonnes : l'index est répété sur chaque feuille, les colonnes de données sont décalées.
+    """
+    letters = []
+    for letter in date_cols or []:
+        position = get_index(letter) - startcol
+        if position < levels:
+            letters.append(letter)
+        elif group_start <= position - levels < group_start + group_size:
+            letters.append(column_letter(startcol + position - group_start + 1))
+    return letters
+
+
+def _part_file(file: str, number: int) -> str:
+    stem, extension = os.path.splitext(file)
+    return f'{stem}_part_{number}{extension}'
+
+
+def _save_shards(df: Union[pd.DataFrame, Iterable[pd.DataFrame]], file: Union[str, io.IOBase], sheet_name: str, shard: Union[bool, dict],
+                 na_rep: str, columns: Union[str, list], header: bool, index: bool, point: tuple, engine: str, ise: str, float_format: str,
+                 chunksize: int, date_format: bool, date_cols: list, header_format: bool, headers_list: list, auto_width: bool,
+                 table: Union[bool, str, dict], compression: int, appending: bool):
+    """
+    Écrit df sur autant de feuilles (et de fichiers) que nécessaire, voir le paramètre shard de "save_df_on_excel".
+
+    Chaque feuille reçoit les lignes au fil de l'eau, par blocs, avec l'en-tête, son style et les formats date.
+    Les lignes d'un DataFrame sont découpées par des vues, aucune feuille ne copie le DataFrame entier.
+    """
+    options = shard if isinstance(shard, dict) else {}
+    unknown = set(options) - {'rows', 'columns', 'file_size'}
+    if unknown:
+        _report(f"Erreur dans les options de découpage : {', '.join(sorted(unknown))} n'existe pas")
+        return
+
+    file_size = options.get('file_size')
+    if file_size and (engine != 'native' or not _is_path(file)):
+        _report("Le découpage en plusieurs fichiers (file_size) nécessite le moteur natif et un chemin de fichier, il est ignoré", error=False)
+        file_size = None
+
+    startcol, startrow = get_coord(point[0], point[1])
+    chunks = _iter_chunks(df, chunksize or SHARD_CHUNKSIZE)
+    first = next(chunks, None)
+    if first is None:
+        _report("Erreur : aucun bloc de lignes à écrire")
+        return
+    chunks = itertools.chain([first], chunks)
+
+    # Each sheet is filled up to the Excel limits, given the starting cell, the header and the index repeated on every sheet
+    labels = list(first.columns) if columns is None else [columns] if isinstance(columns, str) else list(columns)
+    levels = first.index.nlevels if index else 0
+    rows = min(options.get('rows') or EXCEL_MAX_ROWS, EXCEL_MAX_ROWS - startrow - (1 if header else 0))
+    width = min(options.get('columns') or EXCEL_MAX_COLUMNS, EXCEL_MAX_COLUMNS - startcol - levels)
+    if rows < 1 or width < 1:
+        _report(f"Erreur : aucune ligne ou colonne de données ne peut être écrite à partir de {point[0]}{point[1]}")
+        return
+    groups = [labels[start:start + width] for start in range(0, max(len(labels), 1), width)]
+
+    written, workbook, part = [], None, None
+    try:
+        for row_shard in _row_shards(chunks, rows):
+            # A stream of blocks is read once, the blocks of the sheet are kept to write each of its column groups
+            sources = [row_shard] if len(groups) == 1 else itertools.repeat(list(row_shard), len(groups))
+            for (group_number, group), source in zip(enumerate(groups), sources):
+                # The first sheet keeps its name, only the overflow sheets are numbered
+                suffix = f'_{len(written) + 1}' if written else ''
+                name = f'{sheet_name[:31 - len(suffix)]}{suffix}'
+                group_columns = columns if len(groups) == 1 else group
+                group_date_cols = _shard_date_cols(date_cols, startcol, levels, group_number * width, len(group))
+                group_table = {**table, 'name': f"{table['name']}{suffix}"} if isinstance(table, dict) and table.get('name') else table
+
+                # The next file starts once the sheets already compressed reach the size budget
+                if workbook is not None and file_size and sum(info.compress_size for info in workbook.archive.infolist()) >= file_size:
+                    workbook.__exit__(None, None, None)
+                    workbook = None
+
+                if workbook is None:
+                    part = file if part is None else _part_file(file, len({path for path, _ in written}) + 1)
+                    if engine == 'native':
+                        workbook = _NativeWorkbookAppender(part, compression) if appending and part == file else _NativeWorkbookWriter(part, compression)
+                    elif engine == 'openpyxl':
+                        workbook = _OpenpyxlRowSink(part, name, compression)
+                    else:
+                        workbook = _XlsxWriterRowSink(part, name)
+                elif engine != 'native':
+                    workbook.add_sheet(name)
+
+                if engine == 'native':
+                    with _phase('write', sheet_name=name):
+                        workbook.write_sheet(name, _native_sheet(source, workbook.strings, workbook.styles, na_rep, group_columns, header, index, point,
+                                                                 float_format, date_format, group_date_cols, header_format, headers_list,
+                                                                 auto_width, group_table, workbook.tables), ise)
+                else:
+                    _stream_sheet(workbook, source, name, na_rep, group_columns, header, index, point, float_format, None, date_format,
+                                  group_date_cols, header_format, headers_list, auto_width, group_table)
+                written.append((part, name))
+    except BaseException as error:
+        if workbook is not None:
+            if engine == 'native':
+                workbook.__exit__(type(error), error, error.__traceback__)
+            else:
+                workbook.abort()
+        raise
+
+    if engine == 'native':
+        workbook.__exit__(None, None, None)
+    else:
+        with _phase('save', file=part) as event:
+            workbook.close()
+            event['bytes'] = _file_size(part)
+    print('Appended' if appending else 'Written')
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#--------------------------------------------------------- Cache des feuilles ------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Changed whenever the XML generated for the same inputs changes, so that older entries are no longer reused
+_SHEET_CACHE_VERSION = 1
+
+_CELL_STYLE_PATTERN = re.compile(r'(<(?:\w+:)?c\b[^>]*?\bs=")(\d+)(")')
+
+
+def _json_tuples(value):
+    # JSON turns the tuples of the style specs and of the tables into lists
+    return tuple(_json_tuples(item) for item in value) if isinstance(value, list) else value
+
+
+class SheetCache:
+    """
+    Cache des feuilles du moteur natif : une feuille dont les entrées n'ont pas changé depuis l'export précédent n'est ni convertie
+    ni recompressée, son XML compressé est recopié dans le classeur.
+    
+    L'empreinte d'une feuille combine un hachage du DataFrame (pd.util.hash_pandas_object, index compris), ses libellés et ses types,
+    le nom de la feuille et les paramètres d'écriture (point, date_cols, headers_list, na_rep, ...).
+    Le XML de chaque feuille est conservé dans directory, compressé, avec les chaînes écrites dans les cellules (pas de table
+    de chaînes partagées). Le manifeste manifest.json, à côté, décrit les entrées : taille, dernière utilisation, styles et tableaux.
+    Les entrées les moins récemment utilisées sont supprimées au-delà de max_bytes ou de max_entries.
+    
+    Chaque recherche est enregistrée (voir "report") et transmise aux hooks d'instrumentation (champ cache_hit de la phase 'write').
+    
+    Parameters
+    ----------
+    directory : str
+        Répertoire du cache, créé s'il n'existe pas
+        
+    max_bytes : int, default=512 Mio
+        Taille totale maximale des feuilles conservées
+        
+    max_entries : int, default=None
+        Nombre maximal de feuilles conservées, sans limite par défaut
+    
+    Example
+    -------
+    >>> cache = SheetCache('.cache_rapports')
+    >>> save_dfs_on_excel('rapport.xlsx', {'Ventes': (df_ventes,), 'Stocks': (df_stocks,)}, mode='w', engine='native', cache=cache)
+    >>> cache.report()
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, max_entries: int = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.lookups = []
+        os.makedirs(directory, exist_ok=True)
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        try:
+            with open(self.manifest_path, encoding='utf-8') as manifest:
+                self.entries = json.load(manifest)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+    
+    def key(self, df: pd.DataFrame, sheet_name: str, arguments: dict) -> str:
+        """
+        Empreinte des entrées d'une feuille, None si le DataFrame ne peut pas être haché (listes dans les cellules, ...).
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        except TypeError:
+            return None
+        digest.update(repr((_SHEET_CACHE_VERSION, sheet_name, list(df.columns), [str(dtype) for dtype in df.dtypes], list(df.index.names),
+                            sorted(arguments.items()))).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def write_sheet(self, package: '_NativePackage', sheet_name: str, df: Union[pd.DataFrame, Iterable[pd.DataFrame]], arguments: dict,
+                    if_sheet_exists: str = 'error') -> bool:
+        """
+        Écrit la feuille dans package à partir du cache, ou la génère et la conserve.
+        arguments : paramètres de "_native_sheet" (na_rep, columns, header, index, point, ..., table)
+        
+        Returns
+        -------
+        bool
+            True si la feuille a été reprise du cache
+        """
+        key = self.key(df, sheet_name, arguments) if isinstance(df, pd.DataFrame) else None
+        path = os.path.join(self.directory, f'{key}.zip')
+        hit = key in self.entries and os.path.exists(path)
+        
+        if hit:
+            self._restore(package, sheet_name, self.entries[key], path, if_sheet_exists)
+            self.entries[key]['last_used'] = time.time()
+        elif key is not None:
+            # The sheet is generated into its cache entry, then copied into the workbook without being recompressed
+            tables = []
+            method, level = _zip_settings(package.compression)
+            with zipfile.ZipFile(path, 'w', method, compresslevel=level) as archive:
+                with archive.open('sheet.xml', 'w', force_zip64=True) as stream:
+                    for block in _native_sheet(df, _InlineStrings(), package.styles, **arguments, tables=tables):
+                        stream.write(block)
+            self.entries[key] = {'sheet_name': sheet_name, 'bytes': os.path.getsize(path), 'last_used': time.time(),
+                                 'styles': [[spec, xf] for spec, xf in package.styles._xfs.items()], 'tables': tables}
+            package.tables.extend(tables)
+            with zipfile.ZipFile(path) as source:
+                package.write_sheet_member(sheet_name, source, source.getinfo('sheet.xml'), if_sheet_exists)
+            self._evict()
+        else:
+            # Blocks of rows cannot be hashed before they are read, the sheet is written without the cache
+            package.write_sheet(sheet_name, _native_sheet(df, package.strings, package.styles, **arguments, tables=package.tables), if_sheet_exists)
+        
+        self._save_manifest()
+        self.lookups.append({'file': package.file, 'sheet_name': sheet_name, 'key': key, 'hit': hit,
+                             'bytes': self.entries[key]['bytes'] if key in self.entries else None})
+        return hit
+    
+    def _restore(self, package: '_NativePackage', sheet_name: str, entry: dict, path: str, if_sheet_exists: str):
+        # The styles are declared in the order of the workbook that generated the sheet, the ids usually match
+        mapping = {xf: package.styles.add(*_json_tuples(spec)) for spec, xf in entry['styles']}
+        package.tables.extend(tuple(table) for table in entry['tables'])
+        with zipfile.ZipFile(path) as source:
+            info = source.getinfo('sheet.xml')
+            if all(xf == new for xf, new in mapping.items()):
+                package.write_sheet_member(sheet_name, source, info, if_sheet_exists)
+            else:
+                xml = _CELL_STYLE_PATTERN.sub(lambda match: f'{match.group(1)}{mapping.get(int(match.group(2)), match.group(2))}{match.group(3)}',
+                                              source.read(info).decode('utf-8'))
+                package.write_sheet(sheet_name, [xml.encode('utf-8')], if_sheet_exists)
+    
+    def _evict(self):
+        # Least recently used entries first
+        total = sum(entry['bytes'] for entry in self.entries.values())
+        for key in sorted(self.entries, key=lambda key: self.entries[key]['last_used']):
+            if total <= self.max_bytes and (self.max_entries is None or len(self.entries) <= self.max_entries):
+                break
+            total -= self.entries.pop(key)['bytes']
+            try:
+                os.remove(os.path.join(self.directory, f'{key}.zip'))
+            except FileNotFoundError:
+                pass
+    
+    def _save_manifest(self):
+        temporary = f'{self.manifest_path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as manifest:
+            json.dump(self.entries, manifest)
+        os.replace(temporary, self.manifest_path)
+    
+    def report(self) -> pd.DataFrame:
+        """
+        Une ligne par feuille écrite avec le cache : file, sheet_name, key (None si la feuille n'a pas pu être mise en cache),
+        hit (feuille reprise du cache), bytes (taille de l'entrée)
+        """
+        return pd.DataFrame(self.lookups, columns=['file', 'sheet_name', 'key', 'hit', 'bytes'])
+    
+    def clear(self):
+        """
+        Supprime toutes les entrées du cache.
+        """
+        for key in self.entries:
+            try:
+                os.remove(os.path.join(self.directory, f'{key}.zip'))
+            except FileNotFoundError:
+                pass
+        self.entries = {}
+        self._save_manifest()
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#--------------------------------------------------------- Modèles de classeur -----------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+_DEFINED_NAME_PATTERN = re.compile(r'<(?:\w+:)?definedName\b([^>]*)>([^<]*)</(?:\w+:)?definedName>')
+# 'Feuil 1'!$B$4 or Feuil1!$B$4:$D$10, the top left cell is the point
+_NAME_REFERENCE_PATTERN = re.compile(r"(?:'((?:[^']|'')+)'|([^'!]+))!\$?([A-Z]{1,3})\$?(\d+)(?::\$?[A-Z]{1,3}\$?\d+)?")
+
+
+class ExcelTemplate:
+    """
+    Modèle de classeur Excel lu une seule fois, à partir duquel sont écrits de nombreux classeurs (un rapport par client, ...).
+    
+    Le contenu du fichier est gardé en mémoire, avec ses parties déjà analysées (classeur, relations, styles, chaînes partagées, tableaux).
+    Chaque classeur écrit par "save" en repart : les feuilles du modèle qui ne reçoivent pas de DataFrame, les images, les styles
+    nommés, ... sont recopiés octet pour octet sans être décompressés, seules les feuilles remplies sont réécrites (moteur natif).
+    Le coût de la lecture du modèle est donc payé une fois par processus, et non une fois par fichier écrit.
+    
+    Parameters
+    ----------
+    file : str, path or file-like object
+        Le classeur modèle
+    
+    Attributes
+    ----------
+    names : dict
+        Noms définis du modèle qui désignent une cellule ou une plage : {nom: (nom_feuille, point)}
+    
+    Example
+    -------
+    >>> template = ExcelTemplate('modele_rapport.xlsx')
+    >>> for client, df in ventes.groupby('client'):
+    ...     template.save(f'rapport_{client}.xlsx', {'Ventes': (df,)}, header=False, index=False)
+    """
+    
+    def __init__(self, file: Union[str, io.IOBase]):
+        if _is_path(file):
+            with open(file, 'rb') as handle:
+                self.content = handle.read()
+        else:
+            self.content = file.read()
+        self.package = _NativeWorkbookAppender._read_template(self.content)
+        
+        self.names = {}
+        for match in _DEFINED_NAME_PATTERN.finditer(self.package['workbook_xml']):
+            name = re.search(r'\bname="([^"]*)"', match.group(1))
+            reference = _NAME_REFERENCE_PATTERN.fullmatch(unescape(match.group(2).strip(), {'&quot;': '"', '&apos;': "'"}))
+            if name and reference:
+                sheet_name = reference.group(1).replace("''", "'") if reference.group(1) else reference.group(2)
+                self.names[unescape(name.group(1), {'&quot;': '"', '&apos;': "'"})] = (sheet_name, (reference.group(3), int(reference.group(4))))
+    
+    @property
+    def sheet_names(self) -> list:
+        return list(self.package['sheets'])
+    
+    @_bytes_target
+    def save(self, file: Union[str, io.IOBase], sheets: dict, na_rep: str = 'NaN', header: bool = True, index: bool = True,
+             float_format: str = '%.2f', auto_width: bool = False, compression: int = None):
+        """
+        Écrit un classeur : le modèle, complété par les DataFrames de sheets.
+        
+        Parameters
+        ----------
+        file : str, path, file-like object or None
+            Le fichier Excel à écrire (un fichier existant est écrasé), ou un objet fichier binaire.
+            None : le classeur est écrit en mémoire et la fonction retourne son contenu (bytes).
+            
+        sheets : dict
+            Dictionnaire {nom défini ou nom_feuille: (df, point, date_cols, headers_list)}, comme pour "save_dfs_on_excel"
+            
+            - nom défini du modèle (voir names) : le DataFrame est écrit sur sa feuille à partir de sa première cellule, point est ignoré
+            - nom de feuille : le DataFrame est écrit à partir de point sur cette feuille du modèle, ou sur une nouvelle feuille
+            
+            Les cellules du modèle qui ne sont pas écrites sont conservées (if_sheet_exists='overlay').
+            Plusieurs DataFrames peuvent être écrits sur une même feuille, à des points différents.
+            
+        Les autres paramètres sont identiques à ceux de "save_df_on_excel" et s'appliquent à toutes les feuilles.
+        
+        Returns
+        -------
+        None or bytes
+            Le contenu du classeur si file=None
+        """
+        file = _xlsx_target(file)
         
+        # Pads the tuples with the default values of the missing trailing elements, the frames are grouped by sheet
+        frames = {}
+        for target, sheet_args in sheets.items():
+            df, point, date_cols, headers_list = tuple(sheet_args) + (None, ('A', 1), None, None)[len(sheet_args):]
+            sheet_name, point = self.names.get(target, (target, point))
+            frames.setdefault(sheet_name, []).append((_as_frame(df), point, date_cols, headers_list))
+        
+        with _NativeWorkbookAppender(file, compression, template=self) as workbook:
+            for sheet_name, sheet_frames in frames.items():
+                with _phase('write', sheet_name=sheet_name):
+                    blocks = [_native_sheet(df, workbook.strings, workbook.styles, na_rep, None, header, index, point, float_format,
+                                            date_cols is not None, date_cols, headers_list is not None, headers_list, auto_width)
+                              for df, point, date_cols, headers_list in sheet_frames]
+                    if len(blocks) > 1:
+                        # The frames of a sheet are merged together first, then into the sheet of the template
+                        xml = b''.join(blocks[0]).decode('utf-8')
+                        for other in blocks[1:]:
+                            xml = _overlay_sheet(xml, b''.join(other).decode('utf-8'))
+                        blocks = [[xml.encode('utf-8')]]
+                    workbook.write_sheet(sheet_name, blocks[0], 'overlay')
+        print('Written')
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#--------------------------------------------------------- Export parallèle --------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+class _SharedFrame:
+    """
+    DataFrame transmis à un autre processus par la mémoire partagée, pour l'essentiel sans pickle.
+
+    Les colonnes NumPy (nombres, booléens, dates, durées) sont copiées dans un seul segment de mémoire partagée.
+    Les colonnes texte et catégorielles y sont copiées sous forme de codes, seules leurs valeurs distinctes sont sérialisées.
+    Les autres colonnes (types d'extension, dates avec fuseau horaire, ...) sont sérialisées telles quelles.
+    Le processus qui crée l'objet libère le segment avec release, une fois le DataFrame reconstruit par to_frame.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns = df.columns
+        self.index_names = list(df.index.names)
+        # A RangeIndex is only three integers
+        self.range_index = df.index if isinstance(df.index, pd.RangeIndex) else None
+        levels = [] if self.range_index is not None else [df.index.get_level_values(level) for level in range(df.index.nlevels)]
+
+        arrays, self.specs = [], []
+        for values in levels + [df.iloc[:, position] for position in range(df.shape[1])]:
+            dtype = values.dtype
+            if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+                self.specs.append(('array', len(arrays)))
+                arrays.append(np.ascontiguousarray(values.to_numpy()))
+            elif isinstance(dtype, pd.CategoricalDtype):
+                self.specs.append(('category', len(arrays), dtype))
+                arrays.append(np.ascontiguousarray(pd.Categorical(values).codes))
+            elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+                codes, uniques = pd.factorize(values)
+                self.specs.append(('codes', len(arrays), uniques))
+                arrays.append(codes)
+            else:
+                self.specs.append(('values', values.array))
+
+        # Every array starts on an 8 bytes boundary of the segment
+        self.layout, size = [], 0
+        for array in arrays:
+            self.layout.append((size, array.dtype, len(array)))
+            size += -(-array.nbytes // 8) * 8
+
+        self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.name = self.memory.name
+        for (offset, dtype, length), array in zip(self.layout, arrays):
+            np.frombuffer(self.memory.buf, dtype=dtype, count=length, offset=offset)[:] = array
+
+    def __getstate__(self):
+        # Only the description of the segment is sent, not the segment itself
+        state = self.__dict__.copy()
+        state.pop('memory', None)
+        return state
+
+    def to_frame(self) -> pd.DataFrame:
+        memory = shared_memory.SharedMemory(name=self.name)
+        try:
+            arrays = [np.frombuffer(memory.buf, dtype=dtype, count=length, offset=offset).copy() for offset, dtype, length in self.layout]
+        finally:
+            memory.close()
+
+        values = []
+        for spec in self.specs:
+            if spec[0] == 'array':
+                values.append(arrays[spec[1]])
+            elif spec[0] == 'category':
+                values.append(pd.Categorical.from_codes(arrays[spec[1]], dtype=spec[2]))
+            elif spec[0] == 'codes':
+                # Missing values have the code -1
+                values.append(spec[2].take(arrays[spec[1]], allow_fill=True, fill_value=np.nan))
+            else:
+                values.append(spec[1])
+
+        if self.range_index is not None:
+            index, values = self.range_index, values
+        else:
+            levels, values = values[:len(self.index_names)], values[len(self.index_names):]
+            index = pd.MultiIndex.from_arrays(levels, names=self.index_names) if len(levels) > 1 else pd.Index(levels[0], name=self.index_names[0])
+
+        df = pd.DataFrame(dict(enumerate(values)), index=index)
+        df.columns = self.columns
+        return df
+
+    def release(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+def _export_jobs_task(jobs: list) -> list:
+    """
+    Exécute, dans un processus du pool, les exports vers un même fichier les uns après les autres.
+
     Returns
     -------
-    None
-    
-    Example
+    list
+        [(durée en secondes, erreur ou None), ...] dans l'ordre de jobs
+    """
+    results = []
+    for frame, arguments in jobs:
+        start = time.perf_counter()
+        try:
+            # Errors and ignored options of save_df_on_excel are printed, not raised: they are collected instead
+            with redirect_stdout(io.StringIO()), _reported_problems() as problems:
+                save_df_on_excel(frame.to_frame() if isinstance(frame, _SharedFrame) else frame, **arguments)
+            error = '\n'.join(message for message, _ in problems) or None
+        except Exception as exception:
+            error = f'{type(exception).__name__}: {exception}'
+        results.append((time.perf_counter() - start, error))
+    return results
+
+
+def _native_sheet_task(frame: '_SharedFrame', styles: _NativeStyles, arguments: dict, directory: str, compression: int = None) -> tuple:
+    """
+    Génère, dans un processus du pool, le XML compressé d'une feuille du moteur natif, dans une archive zip temporaire.
+    Les chaînes sont écrites dans les cellules : la table des chaînes partagées du classeur n'est pas accessible depuis ce processus.
+
+    Returns
     -------
-    >>> apply_date_style(writer, "Feuille1", "D", min_row=2, max_row=25)
+    tuple
+        (chemin de l'archive temporaire, durée en secondes)
     """
-    date_style = NamedStyle(name='date_style', number_format='DD/MM/YYYY')
-                    
-    workbook = writer.book
-    worksheet = writer.sheets[sheet_name]
-    
-    col_index = get_index(date_cols, add_one=True)
+    start = time.perf_counter()
+    declared = len(styles._xfs)
+    handle, path = tempfile.mkstemp(suffix='.zip', dir=directory)
+    os.close(handle)
 
-    # applique le format Date aux cellules excel d'une colonne (avec openpyxl impossible de faire la colonne entière sans selectionner toutes les cellules non vides)
-    for row in worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=col_index, max_col=col_index):
-        for cell in row:
-            try:
-                cell.style = 'date_style'
-            except ValueError:
-                cell.style = date_style
+    method, level = _zip_settings(compression)
+    with zipfile.ZipFile(path, 'w', method, compresslevel=level) as archive:
+        with archive.open('sheet.xml', 'w', force_zip64=True) as stream:
+            for block in _native_sheet(frame.to_frame(), _InlineStrings(), styles, **arguments):
+                stream.write(block)
 
+    # Style ids are only valid if every style was declared beforehand by the parent process
+    if len(styles._xfs) != declared:
+        raise RuntimeError("Un style n'a pas été déclaré avant l'envoi de la feuille")
+    return path, time.perf_counter() - start
 
-def save_as_date(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1', date_cols: Union[str, tuple, list] = None, min_row: int=2, max_row: int=1000):
+
+_NATIVE_SHEET_ARGUMENTS = ('na_rep', 'columns', 'header', 'index', 'point', 'float_format', 'date_format', 'date_cols', 'header_format', 'headers_list',
+                           'auto_width')
+
+
+def save_dfs_in_parallel(jobs: List[dict], max_workers: int = None) -> pd.DataFrame:
     """
-    Fonction qui permet d'appliquer le format date Excel (DD/MM/YYYY) à une colonne.
+    Exécute plusieurs exports "save_df_on_excel" en parallèle, dans un pool de processus.
+    
+    Les DataFrames sont transmis aux processus par la mémoire partagée (colonnes NumPy et codes des colonnes texte) : seules
+    les valeurs distinctes des colonnes texte et les colonnes d'autres types sont sérialisées par pickle.
+    Les exports vers un même fichier sont les feuilles d'un même classeur :
+    
+    - moteur 'native' : chaque feuille est générée et compressée dans son propre processus, puis les feuilles sont assemblées
+      dans le classeur sans être recompressées. Les chaînes sont écrites dans les cellules (pas de table de chaînes partagées).
+    - autres moteurs : les exports du fichier sont exécutés dans l'ordre par un même processus, les suivants en mode='a'.
+    
+    Le mode (et if_sheet_exists) du premier export d'un fichier s'applique au classeur. Si aucune feuille d'un fichier
+    n'a pu être générée, le classeur n'est pas écrit : un fichier complété (mode='a') reste inchangé, un fichier créé (mode='w')
+    n'est pas laissé sur le disque.
     
     Parameters
     ----------
-    writer : pd.ExcelWriter
-        Objet qui permet d'écrire sur un fichier excel
-        
-    sheet_name : str, default='Feuil1'
-        Nom de la feuille concernée
-        
-    date_cols : str, tuple or list
-         Colonne ou collection de nom de colonnes (A, B, C, ...)
-        
-    min_row : int, default=2
-        Ligne à partir de laquelle on applique la mise en forme.
-        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 1 = ligne 1)
-        
-    max_row : int, default=1000
-        Ligne jusqu'à laquelle on applique la mise en forme
-        Le numéro de ligne correspond à celui d'Excel (il ne s'agit pas d'un index -> 100 = ligne 100)
+    jobs : list of dict
+        Paramètres de chaque export, identiques à ceux de "save_df_on_excel" : [{'df': df, 'file': 'rapport.xlsx', ...}, ...]
         
+    max_workers : int, default=None
+        Nombre de processus du pool, le nombre de processeurs par défaut
+    
     Returns
     -------
-    None
+    pd.DataFrame
+        Une ligne par export, dans l'ordre de jobs : file, sheet_name, engine, seconds (durée de l'export dans son processus),
+        error (erreurs et options ignorées de l'export, vide si l'export a été fait comme demandé)
     
     Example
     -------
-    >>> save_as_date(writer, 'Feuil1', "D", min_row=2, max_row=25)
-    >>> save_as_date(writer, 'Feuil1', ('B', 'E'), min_row=2, max_row=50)
-    >>> save_as_date(writer, 'Feuil1', ['A', 'C'], min_row=2, max_row=42)
+    >>> report = save_dfs_in_parallel([{'df': df_ventes, 'file': 'ventes.xlsx', 'engine': 'native'},
+    ...                                {'df': df_stocks, 'file': 'stocks.xlsx', 'date_format': True, 'date_cols': ['C']}])
+    >>> report[report['error'].notna()]
     """
     
-    if isinstance(col, str):
-        apply_date_style(writer, sheet_name, date_cols, min_row, max_row)
+    signature = inspect.signature(save_df_on_excel)
+    report = []
+    arguments = []
+    for job in jobs:
+        try:
+            bound = signature.bind(**job)
+            bound.apply_defaults()
+            job_arguments = bound.arguments
+            # Each process writes its own file, a file-like object cannot be shared between processes
+            if not _is_path(job_arguments['file']):
+                raise TypeError("file must be a path")
+            job_arguments['file'] = _xlsx_target(job_arguments['file'])
+            job_arguments['df'] = _as_frame(job_arguments['df'])
+            error = None
+        except TypeError as exception:
+            job_arguments, error = None, f'TypeError: {exception}'
+        arguments.append(job_arguments)
+        report.append({'file': job_arguments['file'] if job_arguments else job.get('file'), 'sheet_name': job.get('sheet_name', signature.parameters['sheet_name'].default),
+                       'engine': job.get('engine', signature.parameters['engine'].default), 'seconds': None, 'error': error})
+    
+    # Jobs are grouped by file, in the order of their first job
+    groups = {}
+    for position, job_arguments in enumerate(arguments):
+        if job_arguments is not None:
+            groups.setdefault(job_arguments['file'], []).append(position)
+    
+    frames = {}
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor, tempfile.TemporaryDirectory() as directory:
+            submitted = []
+            for file, positions in groups.items():
+                for position in positions:
+                    if isinstance(arguments[position]['df'], pd.DataFrame):
+                        # A frame that cannot be shared (unhashable cells, ...) only fails its own job
+                        try:
+                            frames[position] = _SharedFrame(arguments[position]['df'])
+                        except Exception as exception:
+                            report[position]['error'] = f'{type(exception).__name__}: {exception}'
+                positions = [position for position in positions if report[position]['error'] is None]
+                if not positions:
+                    continue
+                first = arguments[positions[0]]
+                
+                # Tables are written by the package, the sheets generated in other processes would lose them
+                native = first['mode'] in ('w', 'a') and all(arguments[position]['engine'] == 'native' and position in frames and not arguments[position]['table']
+                                                             for position in positions)
+                if native:
+                    package = (_NativeWorkbookAppender(file, first['compression']) if first['mode'] == 'a' and os.path.exists(file)
+                               else _NativeWorkbookWriter(file, first['compression']))
+                    # Every style of the workbook is declared before the sheets are sent, so that all processes share the same ids
+                    for position in positions:
+                        _register_native_styles(package.styles, arguments[position]['header_format'], arguments[position]['headers_list'])
+                    futures = []
+                    for position in positions:
+                        sheet_arguments = {name: arguments[position][name] for name in _NATIVE_SHEET_ARGUMENTS}
+                        # point='append' is resolved here, the other processes cannot read the existing sheet
+                        if _is_append_point(sheet_arguments['point']):
+                            mode = 'a' if isinstance(package, _NativeWorkbookAppender) else 'w'
+                            sheet_arguments['point'], below = _append_point(file, arguments[position]['sheet_name'], sheet_arguments['point'],
+                                                                            mode, arguments[position]['ise'])
+                            sheet_arguments['header'] = sheet_arguments['header'] and not below
+                        futures.append(executor.submit(_native_sheet_task, frames[position], package.styles, sheet_arguments, directory,
+                                                       first['compression']))
+                    submitted.append((positions, package, futures))
+                else:
+                    tasks = []
+                    for rank, position in enumerate(positions):
+                        job_arguments = {name: value for name, value in arguments[position].items() if name != 'df'}
+                        if rank:
+                            job_arguments['mode'] = 'a'
+                        tasks.append((frames.get(position, arguments[position]['df']), job_arguments))
+                    submitted.append((positions, None, executor.submit(_export_jobs_task, tasks)))
+            
+            for positions, package, futures in submitted:
+                if package is None:
+                    try:
+                        for position, (seconds, error) in zip(positions, futures.result()):
+                            report[position].update(seconds=seconds, error=error)
+                    except Exception as exception:
+                        for position in positions:
+                            report[position]['error'] = f'{type(exception).__name__}: {exception}'
+                    continue
+                
+                # Sheets are assembled in the order of the jobs, without being recompressed
+                try:
+                    with package:
+                        for position, future in zip(positions, futures):
+                            try:
+                                path, seconds = future.result()
+                                with zipfile.ZipFile(path) as source:
+                                    package.write_sheet_member(arguments[position]['sheet_name'], source, source.infolist()[0], arguments[position]['ise'])
+                                os.remove(path)
+                                report[position]['seconds'] = seconds
+                            except Exception as exception:
+                                report[position]['error'] = f'{type(exception).__name__}: {exception}'
+                        # A workbook without any of its sheets is not written
+                        if all(report[position]['error'] is not None for position in positions):
+                            raise RuntimeError(f"Aucune feuille n'a pu être écrite dans {file}")
+                except Exception as exception:
+                    # The workbook itself could not be written, none of its sheets is saved
+                    for position in positions:
+                        report[position]['error'] = report[position]['error'] or f'{type(exception).__name__}: {exception}'
+    finally:
+        for frame in frames.values():
+            frame.release()
+    
+    return pd.DataFrame(report, columns=['file', 'sheet_name', 'engine', 'seconds', 'error'])
 
-    elif isinstance(date_cols, (tuple, list)):
-        for col in date_cols:
-            apply_date_style(writer, sheet_name, col, min_row, max_row)
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#--------------------------------------------------------- Export asynchrone -------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Exports running at the same time, beyond which the coroutines wait for a free slot
+ASYNC_MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Size up to which the workbook streamed by "iter_excel_bytes_async" stays in memory, beyond it is spooled to a temporary file
+ASYNC_SPOOL_SIZE = 8 * 1024 * 1024
+# Content type of an HTTP response holding a workbook
+XLSX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+_ASYNC_EXECUTOR = None
+# event loop -> asyncio.Semaphore limiting the exports running at the same time
+_ASYNC_SLOTS = weakref.WeakKeyDictionary()
+
+
+def _async_executor() -> ThreadPoolExecutor:
+    global _ASYNC_EXECUTOR
+    if _ASYNC_EXECUTOR is None:
+        _ASYNC_EXECUTOR = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS, thread_name_prefix='excel_utils')
+    return _ASYNC_EXECUTOR
+
+
+async def _run_export(function, *args, executor: Executor = None, **kwargs):
+    """
+    Exécute function(*args, **kwargs) dans executor sans bloquer la boucle d'évènements, dans la limite de ASYNC_MAX_WORKERS exports simultanés.
+    
+    Si la coroutine est annulée, un export pas encore démarré n'est jamais exécuté, un export en cours s'arrête au début
+    de sa phase ou de son bloc de lignes suivant (ExportCancelled) et la place n'est libérée qu'une fois l'export arrêté.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _ASYNC_SLOTS.get(loop)
+    if slots is None:
+        slots = _ASYNC_SLOTS[loop] = asyncio.Semaphore(ASYNC_MAX_WORKERS)
+    
+    # Backpressure: the export is only submitted once a slot is free
+    async with slots:
+        if isinstance(executor, ProcessPoolExecutor):
+            # The context does not cross processes: a running export is not interrupted
+            future = loop.run_in_executor(executor, partial(function, *args, **kwargs))
+            return await future
         
+        # The export runs in a copy of the current context, holding its cancellation flag and the hooks of "instrument"
+        cancellation = threading.Event()
+        context = contextvars.copy_context()
+        context.run(_CANCELLATION.set, cancellation)
+        submitted = (executor or _async_executor()).submit(context.run, partial(function, *args, **kwargs))
+        future = asyncio.wrap_future(submitted)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancellation.set()
+            submitted.cancel()
+            await asyncio.wait([future])
+            # ExportCancelled (or any error of the interrupted export) is expected here
+            if not future.cancelled():
+                future.exception()
+            raise
 
-def clear_existing_style(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1',
-                         min_row: int = 1, max_row: int = 1000, min_col: int = 1, max_col: int = 1000):
+
+async def save_df_on_excel_async(df: pd.DataFrame, file: Union[str, io.IOBase] = None, executor: Executor = None, **kwargs):
     """
-    Fonction qui supprime un potentiel style de cellule préalablement existant sur des cellules spécifiées.
+    Version asynchrone de "save_df_on_excel", pour un serveur web (aiohttp, FastAPI, ...) : l'export est exécuté hors de la boucle
+    d'évènements, qui continue de traiter les autres requêtes.
+    
+    Au plus ASYNC_MAX_WORKERS exports s'exécutent en même temps, les suivants attendent qu'une place se libère.
+    Annuler la tâche (timeout, client déconnecté, ...) arrête l'export au début de sa phase ou de son bloc de lignes suivant :
+    le fichier n'est pas sauvegardé, un fichier en cours de création est supprimé.
     
     Parameters
     ----------
-    writer : pd.ExcelWrtier
-        Objet qui permet d'écrire dans un fichier Excel.
-        
-    sheet_name : str, default='Feuil1'
-        nom de la feuille que l'on veut modifier
-        
-    min_row : int, default=1
-        ligne de début de modification
-        
-    max_row : int, default=1000
-        ligne de fin de modification
+    df : pd.DataFrame or iterable of pd.DataFrame
+        Le DataFrame à sauvegarder
         
-    min_col : int, default=1
-        colonne de début de modfication
+    file : str, path, file-like object or None, default=None
+        Cible de l'export (voir "save_df_on_excel"), None pour obtenir le contenu du classeur (bytes)
         
-    min_col : int, default=1000
-        colonne de fin de modfication
+    executor : concurrent.futures.Executor, default=None
+        Executor qui exécute l'export, un pool de ASYNC_MAX_WORKERS threads partagé par défaut.
+        Un ProcessPoolExecutor évite que les exports se partagent le GIL avec la boucle d'évènements, mais df est alors sérialisé,
+        file doit être un chemin ou None, et un export en cours n'est pas interrompu par l'annulation.
         
+    **kwargs
+        Autres paramètres de "save_df_on_excel"
+    
     Returns
     -------
-    None
+    None or bytes
+        Le contenu du classeur si file=None
     
     Example
     -------
-    clear_existing_style(writer, "Feuille1", 1, 100, 1, 10)
+    >>> content = await save_df_on_excel_async(df, None, engine='native', compression=1)
+    >>> content = await asyncio.wait_for(save_df_on_excel_async(df, None), timeout=30)
     """
-    
-    workbook = writer.book
-    worksheet = writer.sheets[sheet_name]
-    
-    for row in worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
-        for cell in row:
-            cell.style = 'Normal'
-            
-            
-def apply_style_to_headers(writer: pd.ExcelWriter, sheet_name: str = 'Feuil1',
-                           list_of_headers: List[list[list, dict]] = None, df: pd.DataFrame = None):
+    return await _run_export(save_df_on_excel, df, file, executor=executor, **kwargs)
+
+
+async def iter_excel_bytes_async(df: pd.DataFrame, chunk_size: int = 64 * 1024, **kwargs) -> AsyncIterator[bytes]:
     """
-    Fonction qui permet d'appliquer un style personnalisé a la premiere cellule de chaque colonne, pour personnaliser l'en-tête.
+    Exporte df (voir "save_df_on_excel_async") puis retourne le classeur par blocs de chunk_size octets, pour une réponse HTTP en flux.
+    
+    Le classeur est écrit dans un fichier temporaire gardé en mémoire jusqu'à ASYNC_SPOOL_SIZE octets : un gros classeur
+    n'est jamais chargé en mémoire d'un seul tenant. Le fichier temporaire est supprimé à la fin de l'itération.
     
     Parameters
     ----------
-    writer : pd.ExcelWriter
-        Objet qui permet d'écrire dans un fichier Excel.
-        
-    sheet_name : str, default='Feuil1'
-        nom de la feuille que l'on veut modifier
-        
-    list_of_headers: list or tuple
-        Liste (ou tuple) de liste du style : [[colonnes, header_style]]
-        colonnes : Liste des colonnes contenant les headers à modifier.
-        header_style : Dictionnaire contenant les paramètres du style de headers à appliquer.
+    df : pd.DataFrame or iterable of pd.DataFrame
+        Le DataFrame à sauvegarder
         
-    df : pd.DataFrame
-        DataFrame contenant les colonnes, dont le nom sera le headers avec le style spécifié.
+    chunk_size : int, default=65536
+        Taille des blocs retournés, en octets
         
-    Returns
-    -------
-    None
+    **kwargs
+        Autres paramètres de "save_df_on_excel" (engine, sheet_name, compression, ...)
     
     Example
     -------
-    >>> apply_style_to_headers(writer, 'Feuil1', [liste_colonne, header_params], df)
-    
-    **Multiple headers styles**
-    
-    >>> df = pd.DataFrame({'Type': ['Voiture', 'Voiture'],
-    ...                    'Marque': ['Peugeot', 'Audi'],
-    ...                    'Modèle': ['208', 'A3'],
-    ...                    'Motorisation': ['Essence', 'Essence']})
-    >>> df
-       Type      Marque  Modèle  Motorisation
-    0  Voiture  Peugeot     208       Essence
-    1  Voiture     Audi      A3       Essence
-    >>> first_style_columns = ['Type', 'Marque']
-    >>> second_style_columns = ['Modèle', 'Motorisation']
-    >>> header_params = {'name': 'existing', 'font_name':'Arial', 'font_size':9,
-    ...                  'bold': True, 'font_color': 'FFFFFF', 'h_align':'center',
-    ...                  'v_align':'center', 'wrap':True, 'start_color': '0b64a0',
-    ...                  'end_color': '0b64a0', 'fill_type':'solid', 'column_height': 34.7}
-    >>> apply_style_to_headers(writer, 'Feuil1',
-    ...                        [[first_style_columns, header_params],
-    ...                         [second_style_columns, header_params]],
-    ...                        df)
+    >>> return StreamingResponse(iter_excel_bytes_async(df, engine='native'), media_type=XLSX_MEDIA_TYPE)
     """
+    loop = asyncio.get_running_loop()
+    with tempfile.SpooledTemporaryFile(max_size=ASYNC_SPOOL_SIZE) as buffer:
+        await _run_export(save_df_on_excel, df, buffer, **kwargs)
+        buffer.seek(0)
+        while True:
+            # Past ASYNC_SPOOL_SIZE the buffer is a file on disk: blocks are read in a thread, not in the event loop
+            block = await loop.run_in_executor(None, buffer.read, chunk_size)
+            if not block:
+                break
+            yield block
 
-    workbook = writer.book
-    worksheet = writer.sheets[sheet_name]
-    
-    # Iterates on the list containing: the list of columns + the dictionary of header parameters
-    for list_cols_params in list_of_headers:
-        # Columns list
-        list_cols = list_cols_params[0]
-        # Parameters of the headers associated with this list of columns, style dictionary parameter:value
-        header_params = list_cols_params[1]
-        # Header style names
-        header_style_name = header_params['name']
-        
-        # For some reasons, when the named style already exists, it must be deleted before
-        if header_style_name in workbook.named_styles:
-            del workbook._named_styles[workbook.named_styles.index(header_style_name)]
 
-        # Creates the header style for the list of columns
-        header_style = NamedStyle(
-            name=header_params['name'],
-            font=Font(name=header_params['font_name'], size=header_params['font_size'], bold=header_params['bold'], color=header_params['font_color']),
-            fill=PatternFill(start_color=header_params['start_color'], end_color=header_params['end_color'], fill_type=header_params['fill_type']),
-            alignment=Alignment(horizontal=header_params['h_align'], vertical=header_params['v_align'], wrap_text=header_params['wrap'])
-        )
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#-------------------------------------------------------- Ligne de commande --------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
 
-        # Applies the header to specified cells
-        for col in list_cols:
-            # Finds the column index and adds 1 because Excel starts counting at 1 and not 0
-            col_index = df.columns.get_loc(col) + 1 
-            # First cell of the column
-            header_cell = worksheet.cell(row=1, column=col_index) 
+def _read_batches(path: str, chunksize: int = 100_000, sep: str = ',', parse_dates: list = None) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier CSV (read_csv par blocs) ou Parquet (lots de pyarrow) bloc par bloc, sans le charger entièrement.
+    """
+    if path.endswith(('.parquet', '.pq')):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("La lecture par lots des fichiers Parquet nécessite pyarrow") from None
+        
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    
+    with pd.read_csv(path, sep=sep, chunksize=chunksize, parse_dates=parse_dates) as reader:
+        yield from reader
 
-            # Defines the height of the first cell of the column
-            worksheet.row_dimensions[1].height = header_params['column_height']
 
-            try:
-                # Applied header style
-                header_cell.style = header_style.name    
-                worksheet.column_dimensions[get_column_letter(col_index)].bestFit = True
-                
-            except ValueError:
-                header_cell.style = header_style
-                worksheet.column_dimensions[get_column_letter(col_index)].bestFit = True
+def _report_progress(chunks: Iterable[pd.DataFrame], start: float) -> Iterator[pd.DataFrame]:
+    """
+    Transmet les blocs au moteur d'écriture et affiche, après chacun, le nombre de lignes écrites et le débit.
+    """
+    rows = 0
+    for chunk in chunks:
+        yield chunk
+        rows += len(chunk)
+        print(f"{rows} lignes écrites, {rows / (time.perf_counter() - start):,.0f} lignes/s", flush=True)
 
 
-def save_df_on_excel(df: pd.DataFrame, file: str, sheet_name = 'Feuil1', na_rep = 'NaN', columns: Union[str, list] = None, header: bool = True, index: bool = True, 
-                     point: tuple = ('A', 1), mode = 'a', engine = 'openpyxl', ise = 'overlay', float_format = '%.2f', date_format: bool = False,
-                     date_cols: list = None, header_format: bool = False, headers_list: list = None):
+def main(argv: List[str] = None) -> int:
     """
-    Sauvegarde un dataframe, ou une colonne du df, dans la colonne et à partir de la ligne spécifiée, du fichier spécifié.
-    
-    Parameters
-    ----------
-    df : pd.DataFrame
-        Le DataFrame à sauvegarder
-        
-    file : str or path
-        Le fichier Excel dans lequel on veut sauvegarder
-        
-    sheet_name : str, default="Feuil1"
-        Le nom de la feuille au sein de ce dit fichier
-        
-    na_rep : str, default='NaN'
-        Façon dont sont représentées les valeurs manquantes dans le fichier Excel
-        
-        - '' : Si l'on souhaite laisser les cellules vides
-        
-    columns : str or list
-        Colonne du DataFrame à écrire dans le fichier Excel
-        
-    header : bool, default=True
-        Booleen qui renseigne ou non le nom des colonnes dans le fichier Excel
-    
-    index : bool, default=True
-        Booleen qui renseigne ou non l'index dans le fichier Excel
-        
-    point : tuple, default=('A', 1)
-        Coordonnées à partir duquel on sauvegarde le DataFrame
-        
-    mode : {'w', 'a'}, default='a'
-        Mode d'écriture dans le fichier 
-         
-        - 'w' : écriture 
-        - 'a' : append
-        
-    engine : str, default='openpyxl'
-        openpyxl ou XlsxWriter
-        
-    ise : {'error', 'new', 'replace', 'overlay'}, default='overlay'
-        Action à faire si mode=appending et que la feuille existe déjà
-        
-        - error: raise a ValueError.
-        - new: Create a new sheet, with a name determined by the engine.
-        - replace: Delete the contents of the sheet before writing to it.
-        - overlay: Write contents to the existing sheet without removing
-        
-    date_format : bool, default=False
-        Si l'on souhaite le format Date sur certaines colonnes du fichier Excel
-        
-    date_cols : list
-        Liste des colonnes à transformer en format Date.
-        Cette liste doit contenir la lettre de la colonne Excel (A, B, ...)
-        
-    header_format : bool, default=False
-        Si l'on souhaite appliquer un style personnalisé ou non aux en-têtes de lignes
-        
-    headers_list : list
-        Il s'agit d'une liste, contenant une liste, qui contient elle même une liste de colonne et un dictionnaire de mise en forme style CSS
+    Point d'entrée de la ligne de commande : python -m Excel_utils convert <entrée> <sortie> [options]
     
-    Returns
-    -------
-    None
+    Le fichier CSV ou Parquet est lu par blocs de --chunksize lignes, écrits au fil de l'eau dans le classeur
+    (voir "save_df_on_excel" en mode streaming) : la mémoire utilisée est bornée par la taille d'un bloc.
     
     Example
     -------
-    >>> 
+    >>> python -m Excel_utils convert ventes.csv ventes.xlsx --engine native --parse-dates Date --date-cols A --headers headers.json
     """
+    import argparse
     
-    col, row = get_coord(point[0], point[1])
+    parser = argparse.ArgumentParser(prog='python -m Excel_utils', description="Utilitaires d'export Excel de DataFrames")
+    commands = parser.add_subparsers(dest='command', required=True)
     
-    if not file.endswith(('.xlsx', '.xlsm')):
-        print(f"The filename {file} does not provide extension, by default the extension '.xlsx' is used")
-        file += '.xlsx'
+    convert = commands.add_parser('convert', help="Convertit un fichier CSV ou Parquet en classeur Excel, bloc par bloc")
+    convert.add_argument('input', help="Fichier CSV, ou Parquet (.parquet, .pq, nécessite pyarrow)")
+    convert.add_argument('output', help="Classeur Excel à écrire")
+    convert.add_argument('--sheet', default='Feuil1', help="Nom de la feuille (défaut : Feuil1)")
+    convert.add_argument('--point', default='A1', help="Cellule à partir de laquelle écrire, ou 'append' pour écrire sous les lignes de la feuille (défaut : A1)")
+    convert.add_argument('--engine', default='openpyxl', choices=['openpyxl', 'xlsxwriter', 'native'], help="Moteur d'écriture (défaut : openpyxl)")
+    convert.add_argument('--mode', default='w', choices=['w', 'a'], help="'a' ajoute la feuille à un classeur existant (moteur native uniquement)")
+    convert.add_argument('--ise', default='overlay', choices=['error', 'new', 'replace', 'overlay'], help="Action si la feuille existe déjà")
+    convert.add_argument('--chunksize', type=int, default=100_000, help="Nombre de lignes lues et écrites à la fois (défaut : 100000)")
+    convert.add_argument('--sep', default=',', help="Séparateur du fichier CSV (défaut : ,)")
+    convert.add_argument('--parse-dates', nargs='+', default=None, metavar='COLONNE', help="Colonnes du CSV à lire comme des dates")
+    convert.add_argument('--date-cols', nargs='+', default=None, metavar='LETTRE', help="Colonnes Excel (A, B, ...) au format Date")
+    convert.add_argument('--headers', default=None, metavar='JSON', help="Fichier JSON du style des en-têtes : [[[colonnes], header_params], ...]")
+    convert.add_argument('--na-rep', default='', help="Représentation des valeurs manquantes (défaut : cellule vide)")
+    convert.add_argument('--float-format', default='%.2f', help="Format des nombres décimaux (défaut : %%.2f)")
+    convert.add_argument('--index', action='store_true', help="Écrit aussi l'index (numéros de ligne)")
+    convert.add_argument('--auto-width', action='store_true', help="Ajuste la largeur des colonnes au premier bloc")
+    convert.add_argument('--compression', type=int, default=None, choices=range(10), metavar='0-9',
+                         help="Niveau de compression zip, 0 pour aucune compression (défaut : compression par défaut du moteur)")
+    args = parser.parse_args(argv)
     
-    if mode == 'w':
-        with pd.ExcelWriter(path=file, mode=mode, engine=engine) as writer:
-            # Saves the dataframe on the Excel file
-            df.to_excel(excel_writer=writer, sheet_name=sheet_name, na_rep=na_rep, columns=columns, header=header, index=index, startcol=col, startrow=row, float_format=float_format)
-            
-            # Transforms columns to date format if specified
-            if date_format:
-                save_as_date(writer=writer, sheet_name=sheet_name, date_cols=date_cols, min_row=2, max_row=len(df)+1)
-            
-            # Formats headers
-            if header_format:
-                # First, previous style has to be deleted
-                clear_existing_style(writer, sheet_name, min_row=1, max_row=1, min_col=1, max_col=df.shape[1]+1)
-                # Then applies current header style
-                apply_style_to_headers(writer, sheet_name, headers_list, df)
-            
-            print('Written')
-
-    elif mode == 'a':
+    point = 'append' if args.point == 'append' else re.fullmatch(r'([A-Za-z]+)(\d+)', args.point)
+    if point is None:
+        print(f"Erreur dans la cellule de départ : {args.point}")
+        return 1
+    
+    if args.input.endswith(('.parquet', '.pq')):
+        import importlib.util
+        if importlib.util.find_spec('pyarrow') is None:
+            print(f"Erreur : la lecture par lots du fichier Parquet {args.input} nécessite pyarrow")
+            return 1
+    
+    headers_list = None
+    if args.headers is not None:
+        with open(args.headers, encoding='utf-8') as file:
+            headers_list = json.load(file)
+    
+    start = time.perf_counter()
+    chunks = _report_progress(_read_batches(args.input, args.chunksize, args.sep, args.parse_dates), start)
+    # Errors of save_df_on_excel are printed, not raised: they are collected to set the exit status
+    with _reported_problems() as problems:
         try:
-            with pd.ExcelWriter(path=file, mode=mode, engine=engine, if_sheet_exists=ise) as writer:
-                df.to_excel(excel_writer=writer, sheet_name=sheet_name, na_rep=na_rep, columns=columns, header=header, index=index, startcol=col, startrow=row, float_format=float_format)
+            save_df_on_excel(chunks, args.output, sheet_name=args.sheet, na_rep=args.na_rep, index=args.index,
+                             point=point if point == 'append' else (point.group(1).upper(), int(point.group(2))), mode=args.mode,
+                             engine=args.engine, ise=args.ise, float_format=args.float_format, date_format=args.date_cols is not None,
+                             date_cols=args.date_cols, header_format=headers_list is not None, headers_list=headers_list,
+                             auto_width=args.auto_width, compression=args.compression)
+        except Exception as exception:
+            print(f"Erreur : {type(exception).__name__}: {exception}")
+            return 1
+    
+    if any(error for _, error in problems):
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"{args.input} -> {args.output} en {elapsed:.2f} s")
+    return 0
 
-                # Transforms columns to date format if specified
-                if date_format:
-                    save_as_date(writer=writer, sheet_name=sheet_name, date_cols=date_cols, min_row=2, max_row=len(df)+1)
-                
-                # Formats headers
-                if header_format:
-                    # First, previous style has to be deleted
-                    clear_existing_style(writer, sheet_name, min_row=1, max_row=1, min_col=1, max_col=df.shape[1]+1)
-                    # Then applies current header style
-                    apply_style_to_headers(writer, sheet_name, headers_list, df)
-                            
-                print('Appended')
-                
-        # If the file doesn't exists, then runs the function in writting mode
-        except FileNotFoundError:
-            save_df_on_excel(df, file, sheet_name, na_rep, columns, header, index, point, mode='w', float_format=float_format,
-                             date_format=date_format, date_cols=date_cols,
-                             header_format=header_format, headers_list=headers_list)
 
-    else:
-        print(f"Erreur dans le mode spécifié : {mode} n'existe pas")
\ No newline at end of file
+if __name__ == '__main__':
+    sys.exit(main())
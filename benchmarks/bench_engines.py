@@ -0,0 +1,60 @@
+"""
+Compare openpyxl, XlsxWriter et le moteur natif sur save_df_on_excel, avec format date et style des en-têtes.
+
+Usage
+-----
+python benchmarks/bench_engines.py --rows 200000 --cols 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Excel_utils  # noqa: E402
+
+
+HEADER_PARAMS = {'name': 'bench_header', 'font_name': 'Arial', 'font_size': 9, 'bold': True, 'font_color': 'FFFFFF',
+                 'h_align': 'center', 'v_align': 'center', 'wrap': True, 'start_color': '0b64a0', 'end_color': '0b64a0',
+                 'fill_type': 'solid', 'column_height': 34.7}
+
+
+def make_frame(rows: int, cols: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((rows, cols - 2)), columns=[f'Num_{i}' for i in range(cols - 2)])
+    df.insert(0, 'Date', pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 3650, rows), unit='D'))
+    df.insert(1, 'Label', rng.choice(['Nord', 'Sud', 'Est', 'Ouest'], rows))
+    return df
+
+
+def run(df: pd.DataFrame, engine: str, directory: str) -> tuple:
+    file = os.path.join(directory, f'bench_{engine}.xlsx')
+    start = time.perf_counter()
+    Excel_utils.save_df_on_excel(df, file, mode='w', engine=engine, index=False, date_format=True, date_cols=['A'],
+                                 header_format=True, headers_list=[[list(df.columns), HEADER_PARAMS]])
+    return time.perf_counter() - start, os.path.getsize(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--cols', type=int, default=10)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.cols)
+    with tempfile.TemporaryDirectory() as directory:
+        results = {engine: run(df, engine, directory) for engine in ('openpyxl', 'xlsxwriter', 'native')}
+
+    for engine, (seconds, size) in results.items():
+        print(f"{engine:<12} {seconds:8.2f} s  {size / 1e6:8.2f} Mo")
+    for engine in ('xlsxwriter', 'native'):
+        print(f"Accélération {engine} / openpyxl : x{results['openpyxl'][0] / results[engine][0]:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Suite de benchmarks des exports et des mises en forme d'Excel_utils : temps, pic de mémoire (RSS) et taille du fichier.
+
+Chaque cas est exécuté dans un processus neuf, la préparation (DataFrame, classeur existant) n'est pas chronométrée.
+Les résultats peuvent être enregistrés comme référence puis comparés, une régression faisant échouer la commande.
+
+Usage
+-----
+python benchmarks/bench_suite.py --rows 50000 --save baseline.json
+python benchmarks/bench_suite.py --rows 50000 --compare baseline.json --tolerance 0.2
+python benchmarks/bench_suite.py --cases "save_df/*/native/*" --shapes tall wide
+"""
+
+import argparse
+import fnmatch
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Excel_utils  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    # Windows: peak RSS is not reported
+    resource = None
+
+
+HEADER_PARAMS = {'name': 'bench_header', 'font_name': 'Arial', 'font_size': 9, 'bold': True, 'font_color': 'FFFFFF',
+                 'h_align': 'center', 'v_align': 'center', 'wrap': True, 'start_color': '0b64a0', 'end_color': '0b64a0',
+                 'fill_type': 'solid', 'column_height': 34.7}
+
+SHAPES = ('tall', 'wide', 'strings', 'dates')
+
+
+def make_frame(shape: str, rows: int) -> pd.DataFrame:
+    """
+    DataFrame synthétique, toujours le même pour une forme et un nombre de lignes donnés. La première colonne est une date.
+
+    - tall : 8 colonnes, surtout numériques
+    - wide : 200 colonnes numériques, rows / 20 lignes
+    - strings : 8 colonnes de chaînes, de cardinalité faible à forte
+    - dates : 8 colonnes de dates et d'horodatages
+    """
+    rng = np.random.default_rng(0)
+    dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 3650, rows), unit='D')
+
+    if shape == 'tall':
+        df = pd.DataFrame(rng.random((rows, 5)), columns=[f'Num_{i}' for i in range(5)])
+        df.insert(1, 'Label', rng.choice(['Nord', 'Sud', 'Est', 'Ouest'], rows))
+        df.insert(2, 'Count', rng.integers(0, 1000, rows))
+    elif shape == 'wide':
+        rows = max(rows // 20, 1)
+        dates = dates[:rows]
+        df = pd.DataFrame(rng.random((rows, 199)), columns=[f'Num_{i}' for i in range(199)])
+    elif shape == 'strings':
+        df = pd.DataFrame({f'Text_{i}': rng.choice([f'valeur {j:06d}' for j in range(10 ** (i % 4 + 1))], rows) for i in range(7)})
+    elif shape == 'dates':
+        df = pd.DataFrame({f'Date_{i}': dates + pd.to_timedelta(rng.integers(0, 86_400, rows), unit='s') for i in range(7)})
+    else:
+        raise ValueError(f"Unknown shape {shape}, expected one of {SHAPES}")
+
+    df.insert(0, 'Date', dates)
+    return df
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#---------------------------------------------------------------- Cas --------------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+# Each case is (setup, run): setup(df, file, options) prepares the file and is not timed, run(df, file) is timed
+
+def _written(engine: str):
+    def setup(df: pd.DataFrame, file: str, options: dict):
+        pass
+
+    def run(df: pd.DataFrame, file: str):
+        Excel_utils.save_df_on_excel(df, file, mode='w', engine=engine, index=False, date_format=True, date_cols=['A'],
+                                     header_format=True, headers_list=[[list(df.columns), HEADER_PARAMS]])
+    return setup, run
+
+
+def _appended(engine: str):
+    def setup(df: pd.DataFrame, file: str, options: dict):
+        # Appending gets slower with the size of the workbook, which already holds several sheets of the same frame
+        Excel_utils.save_dfs_on_excel(file, {f'Existante_{i}': (df,) for i in range(options['existing_sheets'])}, mode='w',
+                                      engine='native', index=False)
+
+    def run(df: pd.DataFrame, file: str):
+        Excel_utils.save_df_on_excel(df, file, sheet_name='Ajout', mode='a', engine=engine, index=False, date_format=True, date_cols=['A'],
+                                     header_format=True, headers_list=[[list(df.columns), HEADER_PARAMS]])
+    return setup, run
+
+
+def _existing_sheet(df: pd.DataFrame, file: str, options: dict):
+    Excel_utils.save_df_on_excel(df, file, mode='w', engine='native', index=False)
+
+
+def _with_writer(function):
+    def run(df: pd.DataFrame, file: str):
+        with pd.ExcelWriter(file, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
+            function(writer, df)
+    return run
+
+
+def _apply_font(sheets: str, last: bool):
+    def run(df: pd.DataFrame, file: str):
+        bounds = {'max_row': 'last', 'max_col': 'last'} if last else {'max_row': len(df) + 1, 'max_col': df.shape[1]}
+        Excel_utils.apply_font(file=file, mode='a', sheets=sheets, min_row=1, min_col=1, font_name='Arial', font_size=9, **bounds)
+    return _existing_sheet, run
+
+
+CASES = {}
+for _shape in SHAPES:
+    for _engine in ('openpyxl', 'xlsxwriter', 'native'):
+        CASES[f'save_df/w/{_engine}/{_shape}'] = (_shape, *_written(_engine))
+    # pandas only appends with openpyxl
+    for _engine in ('openpyxl', 'native'):
+        CASES[f'save_df/a/{_engine}/{_shape}'] = (_shape, *_appended(_engine))
+
+    CASES[f'apply_font/All/{_shape}'] = (_shape, *_apply_font('All', last=False))
+    CASES[f'apply_font/last/{_shape}'] = (_shape, *_apply_font('Feuil1', last=True))
+    CASES[f'save_as_date/{_shape}'] = (_shape, _existing_sheet, _with_writer(
+        lambda writer, df: Excel_utils.save_as_date(writer, 'Feuil1', date_cols='A', min_row=2, max_row=len(df) + 1)))
+    CASES[f'apply_style_to_headers/{_shape}'] = (_shape, _existing_sheet, _with_writer(
+        lambda writer, df: Excel_utils.apply_style_to_headers(writer, 'Feuil1', [[list(df.columns), HEADER_PARAMS]], df)))
+    # Default bounds: a 1000 x 1000 range, whatever the size of the frame
+    CASES[f'clear_existing_style/{_shape}'] = (_shape, _existing_sheet, _with_writer(
+        lambda writer, df: Excel_utils.clear_existing_style(writer, 'Feuil1')))
+
+
+#-----------------------------------------------------------------------------------------------------------------------------------#
+#------------------------------------------------------------ Exécution ------------------------------------------------------------#
+#-----------------------------------------------------------------------------------------------------------------------------------#
+
+def _peak_rss() -> float:
+    """
+    Pic de mémoire résidente du processus, en Mo (NaN si indisponible).
+    """
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def _run_case(name: str, rows: int, options: dict) -> dict:
+    """
+    Exécute un cas dans le processus courant (un processus neuf, voir "run_case").
+    """
+    shape, setup, run = CASES[name]
+    df = make_frame(shape, rows)
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, 'bench.xlsx')
+        # The library reports each write ('Written', 'Appended'), kept out of the results table
+        with redirect_stdout(io.StringIO()):
+            setup(df, file, options)
+
+            rss_before = _peak_rss()
+            start = time.perf_counter()
+            run(df, file)
+            seconds = time.perf_counter() - start
+            rss = _peak_rss()
+
+        return {'seconds': seconds, 'peak_rss_mb': rss, 'rss_growth_mb': rss - rss_before, 'size_mb': os.path.getsize(file) / 1e6,
+                'rows': len(df), 'columns': df.shape[1]}
+
+
+def run_case(name: str, rows: int, options: dict, repeat: int = 1) -> dict:
+    """
+    Exécute un cas repeat fois, chacune dans un processus neuf : meilleur temps, pic de mémoire le plus haut.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for _ in range(repeat):
+        with context.Pool(1) as pool:
+            results.append(pool.apply(_run_case, (name, rows, options)))
+
+    result = min(results, key=lambda item: item['seconds'])
+    result['peak_rss_mb'] = max(item['peak_rss_mb'] for item in results)
+    result['rss_growth_mb'] = max(item['rss_growth_mb'] for item in results)
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2, min_seconds: float = 0.05) -> list:
+    """
+    Compare les résultats à une référence. Une mesure est en régression si elle dépasse la référence de plus de tolerance (en part).
+    Les temps inférieurs à min_seconds dans la référence sont ignorés, trop sensibles au bruit.
+
+    Returns
+    -------
+    list
+        Régressions, sous la forme (cas, mesure, référence, valeur)
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ('seconds', 'peak_rss_mb', 'size_mb'):
+            before, after = reference.get(metric), result.get(metric)
+            if before is None or after is None or np.isnan(before) or np.isnan(after):
+                continue
+            if metric == 'seconds' and before < min_seconds:
+                continue
+            if after > before * (1 + tolerance):
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000, help="Nombre de lignes des DataFrames (divisé par 20 pour 'wide')")
+    parser.add_argument('--shapes', nargs='+', choices=SHAPES, default=list(SHAPES))
+    parser.add_argument('--cases', nargs='+', default=['*'], help="Motifs des cas à exécuter (ex : 'save_df/*/native/*')")
+    parser.add_argument('--existing-sheets', type=int, default=3, help="Feuilles déjà présentes dans le classeur des cas mode='a'")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--save', help="Fichier JSON où enregistrer les résultats (référence)")
+    parser.add_argument('--compare', help="Fichier JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Dépassement toléré par rapport à la référence (0.2 = 20 %%)")
+    parser.add_argument('--list', action='store_true', help="Liste les cas sans les exécuter")
+    args = parser.parse_args(argv)
+
+    names = [name for name, (shape, *_) in CASES.items()
+             if shape in args.shapes and any(fnmatch.fnmatch(name, pattern) for pattern in args.cases)]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+
+    options = {'existing_sheets': args.existing_sheets}
+    results = {}
+    print(f"{'cas':<36} {'temps (s)':>10} {'pic RSS (Mo)':>13} {'+RSS (Mo)':>10} {'taille (Mo)':>12}")
+    for name in names:
+        result = results[name] = run_case(name, args.rows, options, args.repeat)
+        print(f"{name:<36} {result['seconds']:10.3f} {result['peak_rss_mb']:13.1f} {result['rss_growth_mb']:10.1f} {result['size_mb']:12.2f}")
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'rows': args.rows, 'options': options, 'python': platform.python_version(), 'pandas': pd.__version__,
+                       'results': results}, file, indent=2)
+        print(f"Résultats enregistrés dans {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline.get('rows') != args.rows or baseline.get('options') != options:
+            print(f"Attention : la référence a été mesurée avec rows={baseline.get('rows')}, options={baseline.get('options')}")
+        regressions = compare(results, baseline['results'], args.tolerance)
+        for name, metric, before, after in regressions:
+            print(f"Régression {name} {metric} : {before:.3f} -> {after:.3f} (x{after / before:.2f})")
+        if regressions:
+            return 1
+        print(f"Aucune régression au-delà de {args.tolerance:.0%}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
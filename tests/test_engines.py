@@ -0,0 +1,100 @@
+"""
+Les trois moteurs (openpyxl, XlsxWriter, natif) écrivent les mêmes cellules, relues avec openpyxl.
+"""
+
+import datetime
+import io
+import zipfile
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+import Excel_utils
+
+
+ENGINES = ['openpyxl', 'xlsxwriter', 'native']
+
+HEADER_PARAMS = {'name': 'test_header', 'font_name': 'Arial', 'font_size': 9, 'bold': True, 'font_color': 'FFFFFF',
+                 'h_align': 'center', 'v_align': 'center', 'wrap': True, 'start_color': '0b64a0', 'end_color': '0b64a0',
+                 'fill_type': 'solid', 'column_height': 34.7}
+
+
+def read_cells(file, sheet_name: str = 'Feuil1') -> dict:
+    worksheet = openpyxl.load_workbook(file)[sheet_name]
+    return {cell.coordinate: (cell.value, cell.number_format, cell.font.b)
+            for row in worksheet.iter_rows() for cell in row if cell.value is not None}
+
+
+def read_values(file, sheet_name: str = 'Feuil1') -> list:
+    worksheet = openpyxl.load_workbook(file)[sheet_name]
+    return [list(row) for row in worksheet.iter_rows(values_only=True)]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_values(tmp_path, engine):
+    df = pd.DataFrame({'entier': [1, -2, 3], 'réel': [1.5, np.nan, -0.25], 'texte': ['a', None, 'été'], 'booléen': [True, False, True]})
+    file = tmp_path / 'valeurs.xlsx'
+    Excel_utils.save_df_on_excel(df, str(file), mode='w', engine=engine, index=False)
+    
+    assert read_values(file) == [['entier', 'réel', 'texte', 'booléen'],
+                                 [1, 1.5, 'a', True],
+                                 [-2, 'NaN', 'NaN', False],
+                                 [3, -0.25, 'été', True]]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_dates_around_1900_03_01(tmp_path, engine):
+    # Excel counts a fictitious 1900-02-29: the serials before 1900-03-01 are shifted by one day
+    dates = pd.to_datetime(['1900-01-02 00:00', '1900-02-28 00:00', '1900-03-01 00:00', '1900-03-02 12:00', '2021-01-01 00:00'])
+    df = pd.DataFrame({'Date': dates, 'Objet': pd.Series(dates.to_pydatetime(), dtype=object)})
+    file = tmp_path / 'dates.xlsx'
+    Excel_utils.save_df_on_excel(df, str(file), mode='w', engine=engine, index=False)
+    
+    expected = [datetime.datetime(1900, 1, 2), datetime.datetime(1900, 2, 28), datetime.datetime(1900, 3, 1),
+                datetime.datetime(1900, 3, 2, 12), datetime.datetime(2021, 1, 1)]
+    assert read_values(file)[1:] == [[date, date] for date in expected]
+
+
+def test_native_shared_strings(tmp_path):
+    df = pd.DataFrame({'ville': ['Paris', 'Lyon', 'Paris', 'Lyon'], 'pays': ['France'] * 4})
+    file = tmp_path / 'chaines.xlsx'
+    Excel_utils.save_df_on_excel(df, str(file), mode='w', engine='native', index=False)
+    
+    with zipfile.ZipFile(file) as archive:
+        strings = archive.read('xl/sharedStrings.xml').decode('utf-8')
+    # Header and values: 10 cells, each distinct string is stored once
+    assert 'count="10"' in strings
+    assert all(strings.count(f'<t>{string}</t>') == 1 for string in ('ville', 'pays', 'Paris', 'Lyon', 'France'))
+    assert read_values(file) == [['ville', 'pays'], ['Paris', 'France'], ['Lyon', 'France'], ['Paris', 'France'], ['Lyon', 'France']]
+
+
+@pytest.mark.parametrize('index', [False, True])
+def test_point_per_sheet(tmp_path, index):
+    # Headers and date formats follow the point of each sheet, after the index columns
+    df = pd.DataFrame({'Date': pd.date_range('2021-01-01', periods=3), 'Valeur': range(3)})
+    results = {}
+    for engine in ENGINES:
+        file = tmp_path / f'point_{engine}.xlsx'
+        sheets = {'Feuil1': (df, ('C', 5), ['D' if index else 'C'], [[['Date', 'Valeur'], HEADER_PARAMS]])}
+        Excel_utils.save_dfs_on_excel(str(file), sheets, mode='w', engine=engine, index=index)
+        results[engine] = read_cells(file)
+    
+    assert results['native']['D6' if index else 'C6'][1] == 'DD/MM/YYYY'
+    assert results['openpyxl'] == results['native']
+    assert results['xlsxwriter'] == results['native']
+
+
+@pytest.mark.parametrize('compression', [None, 0, 9])
+def test_bytes_target_and_compression(compression):
+    content = Excel_utils.save_df_on_excel(pd.DataFrame({'x': [1, 2]}), None, 'Feuil1', mode='w', engine='openpyxl', index=False,
+                                           compression=compression)
+    buffer = io.BytesIO(content)
+    Excel_utils.save_df_on_excel(pd.DataFrame({'y': [3]}), buffer, 'Feuil2', mode='a', engine='openpyxl', index=False, compression=compression)
+    
+    with zipfile.ZipFile(buffer) as archive:
+        methods = {info.compress_type for info in archive.infolist()}
+    assert methods == {zipfile.ZIP_STORED if compression == 0 else zipfile.ZIP_DEFLATED}
+    assert read_values(buffer, 'Feuil1') == [['x'], [1], [2]]
+    assert read_values(buffer, 'Feuil2') == [['y'], [3]]
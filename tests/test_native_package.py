@@ -0,0 +1,114 @@
+"""
+Ajout de feuilles par le moteur natif dans un classeur existant : mode='a', superposition, remplacement et copie des membres zip.
+"""
+
+import io
+import zipfile
+
+import openpyxl
+import pandas as pd
+import pytest
+from openpyxl.comments import Comment
+from openpyxl.worksheet.table import Table
+
+import Excel_utils
+
+
+def read_values(file, sheet_name: str) -> list:
+    worksheet = openpyxl.load_workbook(file)[sheet_name]
+    return [list(row) for row in worksheet.iter_rows(values_only=True)]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """
+    Classeur écrit par openpyxl : une feuille 'Garder' et une feuille 'Données' avec un tableau et un commentaire.
+    """
+    file = tmp_path / 'classeur.xlsx'
+    book = openpyxl.Workbook()
+    kept = book.active
+    kept.title = 'Garder'
+    kept['A1'] = 'inchangé'
+    data = book.create_sheet('Données')
+    for row in [['nom', 'valeur'], ['a', 1], ['b', 2], ['c', 3]]:
+        data.append(row)
+    data.add_table(Table(displayName='Table_Donnees', ref='A1:B4'))
+    data['B2'].comment = Comment('à vérifier', 'auteur')
+    book.save(file)
+    return file
+
+
+@pytest.mark.parametrize('engine', ['openpyxl', 'native'])
+def test_append_sheet(workbook, engine):
+    Excel_utils.save_df_on_excel(pd.DataFrame({'x': [1, 2]}), str(workbook), 'Nouvelle', mode='a', engine=engine, index=False)
+    
+    assert openpyxl.load_workbook(workbook).sheetnames == ['Garder', 'Données', 'Nouvelle']
+    assert read_values(workbook, 'Nouvelle') == [['x'], [1], [2]]
+    assert read_values(workbook, 'Garder') == [['inchangé']]
+
+
+@pytest.mark.parametrize('engine', ['openpyxl', 'native'])
+def test_overlay_keeps_other_cells(workbook, engine):
+    Excel_utils.save_df_on_excel(pd.DataFrame({'valeur': [10]}), str(workbook), 'Données', mode='a', engine=engine, ise='overlay',
+                                 index=False, point=('B', 2))
+    
+    assert read_values(workbook, 'Données') == [['nom', 'valeur'], ['a', 'valeur'], ['b', 10], ['c', 3]]
+
+
+def test_replace_removes_related_parts(workbook):
+    Excel_utils.save_df_on_excel(pd.DataFrame({'x': [1]}), str(workbook), 'Données', mode='a', engine='native', ise='replace',
+                                 index=False, table={'name': 'Table_Donnees'})
+    
+    with zipfile.ZipFile(workbook) as archive:
+        names = archive.namelist()
+        content_types = archive.read('[Content_Types].xml').decode('utf-8')
+    # The table of the replaced sheet and its comments are gone, the table name can be used again
+    assert len([name for name in names if name.startswith('xl/tables/')]) == 1
+    assert not [name for name in names if 'comments' in name or 'vmlDrawing' in name]
+    assert 'comments' not in content_types
+    
+    book = openpyxl.load_workbook(workbook)
+    assert list(book['Données'].tables) == ['Table_Donnees']
+    assert book['Données']['B2'].comment is None
+    assert read_values(workbook, 'Données') == [['x'], [1]]
+    assert read_values(workbook, 'Garder') == [['inchangé']]
+
+
+@pytest.mark.parametrize('raw', [True, False])
+def test_copy_zip_member(monkeypatch, raw):
+    if raw and not Excel_utils._RAW_ZIP_COPY:
+        pytest.skip("copie brute non vérifiée sur cette version de Python")
+    monkeypatch.setattr(Excel_utils, '_RAW_ZIP_COPY', raw)
+    
+    source = io.BytesIO()
+    with zipfile.ZipFile(source, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('xl/worksheets/sheet1.xml', b'<row/>' * 10_000)
+        archive.writestr('xl/media/image1.bin', bytes(range(256)) * 40, compress_type=zipfile.ZIP_STORED)
+    
+    destination = io.BytesIO()
+    with zipfile.ZipFile(source) as archive, zipfile.ZipFile(destination, 'w', zipfile.ZIP_DEFLATED) as target:
+        target.writestr('[Content_Types].xml', b'<Types/>')
+        for info in archive.infolist():
+            Excel_utils._copy_zip_member(archive, target, info, info.filename.replace('1', '2'))
+        target.writestr('xl/workbook.xml', b'<workbook/>')
+    
+    with zipfile.ZipFile(destination) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ['[Content_Types].xml', 'xl/worksheets/sheet2.xml', 'xl/media/image2.bin', 'xl/workbook.xml']
+        assert archive.read('xl/worksheets/sheet2.xml') == b'<row/>' * 10_000
+        assert archive.getinfo('xl/media/image2.bin').compress_type == zipfile.ZIP_STORED
+
+
+@pytest.mark.parametrize('engine', ['openpyxl', 'native'])
+def test_point_append(tmp_path, engine):
+    # The appended rows get the date format, without a second header
+    file = str(tmp_path / 'historique.xlsx')
+    options = dict(sheet_name='Feuil1', index=False, engine=engine, date_format=True, date_cols=['A'])
+    Excel_utils.save_df_on_excel(pd.DataFrame({'Date': pd.date_range('2021-01-01', periods=2), 'Valeur': [1, 2]}), file, mode='w', **options)
+    Excel_utils.save_df_on_excel(pd.DataFrame({'Date': pd.date_range('2021-01-03', periods=2), 'Valeur': [3, 4]}), file, mode='a',
+                                 point='append', **options)
+    
+    worksheet = openpyxl.load_workbook(file)['Feuil1']
+    assert [row[1] for row in worksheet.iter_rows(values_only=True)] == ['Valeur', 1, 2, 3, 4]
+    assert [worksheet.cell(row, 1).number_format for row in range(2, 6)] == ['DD/MM/YYYY'] * 4
+    assert Excel_utils.last_used_row(file, 'Feuil1') == 5
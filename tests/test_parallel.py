@@ -0,0 +1,44 @@
+"""
+Exports en parallèle (save_dfs_in_parallel) : une ligne du rapport par export, une erreur n'arrête que son propre export.
+"""
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import Excel_utils
+
+
+@pytest.mark.parametrize('engine', ['openpyxl', 'native'])
+def test_unshareable_frame_fails_its_job_only(tmp_path, engine):
+    file = str(tmp_path / 'rapport.xlsx')
+    report = Excel_utils.save_dfs_in_parallel([
+        {'df': pd.DataFrame({'x': [1, 2]}), 'file': file, 'sheet_name': 'Bonne', 'engine': engine, 'index': False},
+        {'df': pd.DataFrame({'x': [[1], [2]]}), 'file': file, 'sheet_name': 'Listes', 'engine': engine, 'index': False},
+    ], max_workers=2)
+    
+    assert report['error'].isna().tolist() == [True, False]
+    assert report.loc[1, 'error'].startswith('TypeError')
+    assert openpyxl.load_workbook(file).sheetnames == ['Bonne']
+
+
+def test_no_file_when_every_sheet_fails(tmp_path):
+    file = tmp_path / 'vide.xlsx'
+    report = Excel_utils.save_dfs_in_parallel([
+        {'df': pd.DataFrame({'x': [1]}), 'file': str(file), 'sheet_name': 'A', 'engine': 'native', 'point': ('ZZZZ', 1)},
+    ], max_workers=1)
+    
+    assert report.loc[0, 'error'].startswith('ValueError')
+    assert not file.exists()
+
+
+def test_native_point_append(tmp_path):
+    file = str(tmp_path / 'historique.xlsx')
+    Excel_utils.save_df_on_excel(pd.DataFrame({'x': [1, 2]}), file, 'Feuil1', mode='w', engine='native', index=False)
+    report = Excel_utils.save_dfs_in_parallel([
+        {'df': pd.DataFrame({'x': [3]}), 'file': file, 'sheet_name': 'Feuil1', 'engine': 'native', 'mode': 'a', 'point': 'append',
+         'index': False},
+    ], max_workers=1)
+    
+    assert report['error'].isna().all()
+    assert [row for row in openpyxl.load_workbook(file)['Feuil1'].iter_rows(values_only=True)] == [('x',), (1,), (2,), (3,)]